@@ -0,0 +1,46 @@
+import os
+import sys
+import timeit
+from math import sqrt
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import calc_engine
+
+EXPRESSIONS = [
+    "7+8*9",
+    "sqrt(16)+2^10",
+    "(1.5+2.25)*(3-4/5)^2",
+    "-(2^3^2)+sqrt(sqrt(256))*12.75/3",
+    "+".join(str(i) for i in range(200)),
+]
+
+
+def eval_path(expression):
+    # The previous calculate_result implementation
+    return eval(expression.replace("^", "**"), {"sqrt": sqrt, "__builtins__": None})
+
+
+def cold_path(expression):
+    calc_engine.clear_cache()
+    return calc_engine.evaluate(expression)
+
+
+def bench(func, expression, number):
+    return min(timeit.repeat(lambda: func(expression), number=number, repeat=5)) / number
+
+
+def main(number=2000):
+    print(f"{'expression':<40} {'eval':>10} {'cold':>10} {'cached':>10} {'speedup':>8}")
+    for expression in EXPRESSIONS:
+        assert calc_engine.evaluate(expression) == eval_path(expression)
+        t_eval = bench(eval_path, expression, number)
+        t_cold = bench(cold_path, expression, number)
+        t_cached = bench(calc_engine.evaluate, expression, number)
+        label = expression if len(expression) <= 40 else expression[:37] + "..."
+        print(f"{label:<40} {t_eval * 1e6:>8.2f}us {t_cold * 1e6:>8.2f}us "
+              f"{t_cached * 1e6:>8.2f}us {t_eval / t_cached:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
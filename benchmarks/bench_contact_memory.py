@@ -0,0 +1,67 @@
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_contact_search import make_contacts
+from contact_index import ContactIndex, normalize
+
+
+def contact_dicts(count):
+    # The original in-memory model: a list with one dict of strings per contact
+    return [contact for _, contact in make_contacts(count)]
+
+
+def contact_index(count):
+    index = ContactIndex()
+    for contact_id, contact in make_contacts(count):
+        index.add(contact_id, contact)
+    return index
+
+
+def text_strings(count):
+    # The index's earlier text column: one str per contact in a list
+    return [normalize(contact) for _, contact in make_contacts(count)]
+
+
+def traced_bytes(build, count):
+    # Memory still allocated once build() returns, i.e. what its result keeps
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build(count)
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+        del result
+        return size
+    finally:
+        tracemalloc.stop()
+
+
+def breakdown(index):
+    # Allocated bytes of each column of a built index
+    postings = sys.getsizeof(index.postings) + sum(
+        sys.getsizeof(gram) + sys.getsizeof(rows) for gram, rows in index.postings.items())
+    return {"postings": postings,
+            "text": sys.getsizeof(index.text) + sys.getsizeof(index.offsets),
+            "ids": sys.getsizeof(index.ids) + sys.getsizeof(index.row_of)}
+
+
+def main(sizes=(20000, 100000)):
+    # Contacts themselves now live in SQLite; the index is what the contact
+    # book keeps in memory per contact. Its fixed cost per distinct trigram
+    # is spread over fewer contacts in small books.
+    print(f"{'contacts':>10} {'dicts':>7} {'index':>7} {'postings':>9} {'text':>6} "
+          f"{'ids':>5} {'text as str':>12}   (bytes/contact)")
+    for count in sizes:
+        parts = breakdown(contact_index(count))
+        print(f"{count:>10,} {traced_bytes(contact_dicts, count) / count:>7.0f} "
+              f"{traced_bytes(contact_index, count) / count:>7.0f} "
+              f"{parts['postings'] / count:>9.0f} {parts['text'] / count:>6.0f} "
+              f"{parts['ids'] / count:>5.0f} {traced_bytes(text_strings, count) / count:>12.0f}")
+
+
+if __name__ == "__main__":
+    main(tuple(int(arg) for arg in sys.argv[1:]) or (20000, 100000))
@@ -0,0 +1,80 @@
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from contact_index import ContactIndex
+
+FIRST = ["James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda",
+         "David", "Elizabeth", "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica",
+         "Thomas", "Sarah", "Charles", "Karen", "Zakwan", "Ayesha", "Bilal", "Fatima"]
+
+
+def make_contacts(count, seed=7):
+    rnd = random.Random(seed)
+    letters = string.ascii_lowercase
+    for contact_id in range(1, count + 1):
+        last = "".join(rnd.choice(letters) for _ in range(rnd.randint(5, 9))).capitalize()
+        first = rnd.choice(FIRST)
+        yield contact_id, {
+            "name": f"{first} {last}",
+            "phone": f"{rnd.randint(200, 999)}-{rnd.randint(0, 9999999):07d}",
+            "email": f"{first.lower()}.{last.lower()}@example.com",
+            "address": "",
+        }
+
+
+def typo(text, rnd):
+    # One random substitution, insertion, deletion or transposition
+    i = rnd.randrange(len(text) - 1)
+    kind = rnd.randrange(4)
+    ch = rnd.choice(string.ascii_lowercase)
+    if kind == 0:
+        return text[:i] + ch + text[i + 1:]
+    if kind == 1:
+        return text[:i] + ch + text[i:]
+    if kind == 2:
+        return text[:i] + text[i + 1:]
+    return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+
+
+def percentile(samples, fraction):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def main(sizes=(100000, 1000000), queries=200):
+    print(f"{'contacts':>10} {'build s':>8} {'substr p50':>11} {'fuzzy p50':>10} "
+          f"{'fuzzy p95':>10} {'recall@10':>10}")
+    for size in sizes:
+        contacts = dict(make_contacts(size))
+        index = ContactIndex()
+        start = time.perf_counter()
+        for contact_id, contact in contacts.items():
+            index.add(contact_id, contact)
+        build = time.perf_counter() - start
+
+        rnd = random.Random(size)
+        targets = rnd.sample(range(1, size + 1), queries)
+        substring, fuzzy, hits = [], [], 0
+        for contact_id in targets:
+            # Search for the surname as typed, then with a typo in it
+            surname = contacts[contact_id]["name"].split()[1]
+            start = time.perf_counter()
+            index.search(surname)
+            substring.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            found = index.fuzzy(typo(surname, rnd), limit=10)
+            fuzzy.append(time.perf_counter() - start)
+            hits += contact_id in found
+        print(f"{size:>10,} {build:>8.1f} {percentile(substring, 0.5) * 1000:>9.2f}ms "
+              f"{percentile(fuzzy, 0.5) * 1000:>8.2f}ms {percentile(fuzzy, 0.95) * 1000:>8.2f}ms "
+              f"{hits / queries:>10.0%}")
+
+
+if __name__ == "__main__":
+    main(tuple(int(arg) for arg in sys.argv[1:]) or (100000, 1000000))
@@ -0,0 +1,51 @@
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from password_check import BreachIndex, build_index
+
+
+def lookup_us(index, digests):
+    start = time.perf_counter()
+    for digest in digests:
+        index.contains_digest(digest)
+    return (time.perf_counter() - start) / len(digests) * 1e6
+
+
+def main(count=5000000, lookups=100000):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "breached.idx")
+        start = time.perf_counter()
+        build_index((os.urandom(20) for _ in range(count)), path, bloom_bits_per_item=10)
+        print(f"built {count:,} hashes in {time.perf_counter() - start:.1f}s")
+
+        with open(path, "rb") as f:
+            hits = [_record(f, random.randrange(count)) for _ in range(lookups)]
+        misses = [os.urandom(20) for _ in range(lookups)]
+
+        index = BreachIndex(path)
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        print(f"{'lookup':<28} {'hit us':>8} {'miss us':>8}")
+        print(f"{'binary search + Bloom':<28} {lookup_us(index, hits):>8.2f} "
+              f"{lookup_us(index, misses):>8.2f}")
+        index.bloom.close()
+        index.bloom = None
+        print(f"{'binary search':<28} {lookup_us(index, hits):>8.2f} "
+              f"{lookup_us(index, misses):>8.2f}")
+        growth = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss
+        print(f"peak RSS growth during lookups: {growth} KiB")
+        index.close()
+
+
+def _record(f, row):
+    f.seek(20 * row)
+    return f.read(20)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,55 @@
+import io
+import os
+import random
+import secrets
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from password_engine import PasswordEngine, PasswordPolicy, build_pool, generate_to
+
+POOL = build_pool()
+LENGTH = 16
+
+
+def random_choices(count):
+    # The previous GUI implementation (not cryptographically secure)
+    return ["".join(random.choices(POOL, k=LENGTH)) for _ in range(count)]
+
+
+def secrets_choice(count):
+    # The straightforward secure version: one CSPRNG call per character
+    return ["".join(secrets.choice(POOL) for _ in range(LENGTH)) for _ in range(count)]
+
+
+def engine(count):
+    return PasswordEngine(POOL, LENGTH).generate_bytes(count)
+
+
+def policy(count):
+    # At least two of every class, no character used twice
+    return PasswordPolicy(LENGTH, min_upper=2, min_lower=2, min_digits=2, min_symbols=2,
+                          no_repeats=True).compile().generate_bytes(count)
+
+
+def rate(func, count):
+    start = time.perf_counter()
+    func(count)
+    return count / (time.perf_counter() - start)
+
+
+def main(count=1000000):
+    print(f"{LENGTH}-character passwords from a {len(POOL)}-character pool")
+    print(f"{'random.choices':<28} {rate(random_choices, count // 10):>14,.0f} /s")
+    print(f"{'secrets.choice':<28} {rate(secrets_choice, count // 10):>14,.0f} /s")
+    print(f"{'PasswordEngine':<28} {rate(engine, count):>14,.0f} /s")
+    print(f"{'PolicySampler':<28} {rate(policy, count // 10):>14,.0f} /s")
+    for processes in sorted({2, os.cpu_count() or 1}):
+        label = f"generate_to, {processes} processes"
+        print(f"{label:<28} "
+              f"{rate(lambda n: generate_to(io.BytesIO(), PasswordPolicy(LENGTH), n, processes), count):>14,.0f} /s")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,78 @@
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from rps_ai import MarkovPredictor
+from rps_engine import BEATS, OUTCOMES, WIN
+
+
+def player(rng, moves):
+    # A human-like synthetic player: favours rock, tends to repeat a winning
+    # move and to switch after a loss, with habits that change every
+    # 10k moves
+    last, won = rng.randrange(3), False
+    for i in range(moves):
+        habit = (i // 10000) % 3
+        roll = rng.random()
+        if roll < 0.3:
+            move = habit
+        elif roll < 0.6:
+            move = last if won else (last + 1) % 3
+        else:
+            move = rng.randrange(3)
+        computer = yield move
+        won = OUTCOMES[move][computer] == WIN
+        last = move
+
+
+def session(moves, timed=True, seed=1):
+    # Plays a session and returns (sorted latencies in seconds, computer
+    # win rate, predictor). Latencies are only recorded when timed.
+    rng = random.Random(seed)
+    predictor = MarkovPredictor()
+    latencies = []
+    wins = 0
+    moves_of = player(rng, moves)
+    move = next(moves_of)
+    try:
+        while True:
+            start = time.perf_counter()
+            guess = predictor.predict()
+            computer = rng.randrange(3) if guess is None else BEATS[guess]
+            predictor.update(move, computer)
+            if timed:
+                latencies.append(time.perf_counter() - start)
+            wins += OUTCOMES[computer][move] == WIN
+            move = moves_of.send(computer)
+    except StopIteration:
+        pass
+    latencies.sort()
+    return latencies, wins / moves, predictor
+
+
+def predictor_bytes(moves):
+    # Memory the predictor holds after moves (the history itself is not kept)
+    tracemalloc.start()
+    try:
+        predictor = session(moves, timed=False)[2]
+        return tracemalloc.get_traced_memory()[0]
+    finally:
+        del predictor
+        tracemalloc.stop()
+
+
+def main(moves=500000):
+    print(f"{'moves':>8} {'p50 us':>8} {'p99 us':>8} {'max us':>8} {'win rate':>9} {'KiB':>8}")
+    for count in (1000, moves // 10, moves):
+        latencies, win_rate, _ = session(count)
+        p50, p99, worst = (latencies[int(q * (len(latencies) - 1))] * 1e6 for q in (0.5, 0.99, 1.0))
+        print(f"{count:>8} {p50:>8.2f} {p99:>8.2f} {worst:>8.1f} {win_rate:>9.3f} "
+              f"{predictor_bytes(count) / 1024:>8.0f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,52 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import rps_engine
+
+CHOICES = ["rock", "paper", "scissors"]
+
+
+def if_chain(rounds):
+    # The previous play_round logic, without the widget updates
+    user = comp = 0
+    for _ in range(rounds):
+        user_choice, comp_choice = random.choice(CHOICES), random.choice(CHOICES)
+        if user_choice == comp_choice:
+            pass
+        elif (user_choice == "rock" and comp_choice == "scissors") or \
+             (user_choice == "paper" and comp_choice == "rock") or \
+             (user_choice == "scissors" and comp_choice == "paper"):
+            user += 1
+        else:
+            comp += 1
+    return user, comp
+
+
+def table(rounds):
+    return rps_engine.play_match("cycle", "frequency", rounds)
+
+
+def vectorized(rounds):
+    return rps_engine.simulate(rounds)
+
+
+def rate(func, rounds):
+    start = time.perf_counter()
+    func(rounds)
+    return rounds / (time.perf_counter() - start)
+
+
+def main(rounds=1000000):
+    print(f"{'round loop':<28} {'rounds/s':>14}")
+    print(f"{'if/elif chain':<28} {rate(if_chain, rounds):>14,.0f}")
+    print(f"{'outcome table, two bots':<28} {rate(table, rounds):>14,.0f}")
+    if rps_engine.load_numpy() is not None:
+        print(f"{'NumPy simulate':<28} {rate(vectorized, rounds * 20):>14,.0f}")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,156 @@
+import argparse
+import csv
+import itertools
+import sys
+import time
+
+import calc_engine
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for batch evaluation
+    np = None
+
+DEFAULT_CHUNK_SIZE = 65536
+
+if np is not None:
+    calc_engine.register_backend("numpy", {
+        "+": np.add,
+        "-": np.subtract,
+        "*": np.multiply,
+        "/": np.true_divide,
+        "//": np.floor_divide,
+        "^": np.power,
+        "neg": np.negative,
+        "pos": np.positive,
+        "sqrt": np.sqrt,
+        # Literals as float64: int64 would wrap (10^20) or reject
+        # negative powers (2^-1) inside the ufuncs
+        "num": np.float64,
+    })
+
+
+def require_numpy():
+    if np is None:
+        raise RuntimeError("NumPy is required for batch evaluation (pip install numpy)")
+
+
+def to_array(values):
+    # Fast path parses the whole column in C; blanks and junk become NaN
+    try:
+        return np.array(values, dtype=np.float64)
+    except ValueError:
+        return np.array([_to_float(v) for v in values], dtype=np.float64)
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except ValueError:
+        return float("nan")
+
+
+def evaluate_columns(expression, columns, length=None):
+    # Evaluate one expression over whole columns at once; columns maps
+    # variable names to equally sized arrays
+    require_numpy()
+    if isinstance(expression, str):
+        expression = calc_engine.compile_expression(expression, backend="numpy")
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        result = expression.evaluate(columns)
+    if np.ndim(result) == 0:
+        # Expression without variables: broadcast to the column length
+        if length is None:
+            length = len(next(iter(columns.values()))) if columns else 1
+        result = np.full(length, result, dtype=np.float64)
+    return result
+
+
+def process_csv(source, target, expression, column="result", bindings=None,
+                chunk_size=DEFAULT_CHUNK_SIZE):
+    # Stream source CSV to target with an extra computed column, holding at
+    # most chunk_size rows in memory. Returns (rows, seconds).
+    require_numpy()
+    compiled = calc_engine.compile_expression(expression, backend="numpy")
+    bindings = dict(bindings or {})
+    reader = csv.reader(source)
+    writer = csv.writer(target)
+
+    header = next(reader, None)
+    if header is None:
+        return 0, 0.0
+    positions = {}
+    for name in compiled.variables:
+        source_column = bindings.get(name, name)
+        if source_column not in header:
+            raise ValueError(f"Column {source_column!r} not found for variable {name!r}")
+        positions[name] = header.index(source_column)
+    writer.writerow(header + [column])
+    width = len(header)
+
+    rows = 0
+    start = time.perf_counter()
+    while True:
+        chunk = list(itertools.islice(reader, chunk_size))
+        if not chunk:
+            break
+        for row in chunk:
+            if len(row) < width:
+                # Ragged row: missing cells read as blanks (NaN), and the
+                # result still lands in its own column
+                row.extend([""] * (width - len(row)))
+        columns = {name: to_array([row[i] for row in chunk]) for name, i in positions.items()}
+        results = evaluate_columns(compiled, columns, len(chunk)).tolist()
+        for row, value in zip(chunk, results):
+            row.append(value)
+        writer.writerows(chunk)
+        rows += len(chunk)
+    return rows, time.perf_counter() - start
+
+
+def parse_bindings(pairs):
+    bindings = {}
+    for pair in pairs:
+        name, sep, column = pair.partition("=")
+        if not sep:
+            raise ValueError(f"Expected NAME=COLUMN, got {pair!r}")
+        bindings[name] = column
+    return bindings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Evaluate a calculator expression over CSV columns.")
+    parser.add_argument("expression", help='e.g. "price * qty ^ 2 + sqrt(tax)"')
+    parser.add_argument("input", nargs="?", default="-", help="CSV file (default: stdin)")
+    parser.add_argument("-o", "--output", default="-", help="CSV file (default: stdout)")
+    parser.add_argument("-c", "--column", default="result", help="name of the new column")
+    parser.add_argument("-b", "--bind", action="append", default=[], metavar="NAME=COLUMN",
+                        help="map a variable to a column whose header is not a valid name")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="rows held in memory at a time")
+    args = parser.parse_intermixed_args(argv)
+    try:
+        bindings = parse_bindings(args.bind)
+    except ValueError as e:
+        parser.error(str(e))
+
+    source = sys.stdin if args.input == "-" else open(args.input, newline="")
+    target = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    try:
+        rows, seconds = process_csv(source, target, args.expression, args.column,
+                                    bindings, args.chunk_size)
+    except (RuntimeError, ValueError, SyntaxError, NameError) as e:
+        parser.exit(1, f"error: {e}\n")
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+    rate = rows / seconds if seconds else 0.0
+    print(f"{rows} rows in {seconds:.2f}s ({rate:,.0f} rows/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
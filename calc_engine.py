@@ -0,0 +1,660 @@
+import math
+import multiprocessing
+import operator
+import re
+import time
+from functools import lru_cache
+
+# Maximum number of compiled expressions kept in the LRU cache
+CACHE_SIZE = 512
+
+# Cost tiers, in estimated bits of the largest exact integer produced.
+# Cheaper expressions run inline, dearer ones in the worker process, and
+# anything beyond WORKER_BITS is downgraded to float arithmetic.
+INLINE_BITS = 1 << 17
+WORKER_BITS = 1 << 26
+
+# Seconds a worker evaluation may run before it is killed
+WORKER_TIMEOUT = 10.0
+
+# Token patterns (order matters: "**" and "//" before their single-char forms)
+TOKEN_RE = re.compile(r"""
+    (?P<num>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<name>[A-Za-z_][A-Za-z_0-9]*)
+  | (?P<op>\*\*|//|[-+*/^])
+  | (?P<lparen>\()
+  | (?P<rparen>\))
+""", re.VERBOSE)
+
+# Binary operator precedence (higher binds tighter)
+PRECEDENCE = {"+": 1, "-": 1, "*": 2, "/": 2, "//": 2, "^": 4}
+
+# Plain Python arithmetic, same results as the old eval() path
+PYTHON_OPS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+    "//": operator.floordiv,
+    "^": operator.pow,
+    "neg": operator.neg,
+    "pos": operator.pos,
+    "sqrt": math.sqrt,
+    "num": lambda value: value,  # converts literals once, when building
+}
+
+# Names that may be called as functions, e.g. "sqrt(9)"
+FUNCTIONS = {"sqrt"}
+
+# Float-only arithmetic: overflows raise immediately instead of growing ints
+FLOAT_OPS = dict(
+    PYTHON_OPS,
+    **{"^": math.pow, "/": lambda a, b: float(a) / b, "//": lambda a, b: float(a) // b},
+)
+
+BACKENDS = {"python": PYTHON_OPS, "float": FLOAT_OPS}
+
+
+class ExpressionError(SyntaxError):
+    pass
+
+
+def register_backend(name, ops):
+    # Backends override arithmetic, e.g. NumPy ufuncs for column evaluation
+    BACKENDS[name] = dict(PYTHON_OPS, **ops)
+
+
+def normalize(text):
+    # Canonical form used as the cache key: single spaces, "^" for powers
+    return " ".join(text.split()).replace("**", "^")
+
+
+def _number(text):
+    # "1e-05" is a float, as str() writes small and large floats
+    return float(text) if "." in text or "e" in text or "E" in text else int(text)
+
+
+def tokenize(text):
+    tokens = []
+    pos = 0
+    while pos < len(text):
+        if text[pos].isspace():
+            pos += 1
+            continue
+        match = TOKEN_RE.match(text, pos)
+        if not match:
+            raise ExpressionError(f"Unexpected character {text[pos]!r}")
+        kind = match.lastgroup
+        value = match.group()
+        if kind == "num":
+            value = _number(value)
+        elif kind == "op" and value == "**":
+            value = "^"
+        tokens.append((kind, value))
+        pos = match.end()
+    return tokens
+
+
+class Parser:
+    # Recursive-descent parser producing a tuple-based AST:
+    #   ("num", value) | ("var", name) | ("unary", op, node)
+    #   ("bin", op, left, right) | ("call", name, node)
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos]
+        return (None, None)
+
+    def advance(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def expect(self, kind):
+        token = self.advance()
+        if token[0] != kind:
+            raise ExpressionError(f"Expected {kind}, got {token[1]!r}")
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            raise ExpressionError("Empty expression")
+        node = self.parse_binary(1)
+        if self.pos != len(self.tokens):
+            raise ExpressionError(f"Unexpected {self.peek()[1]!r}")
+        return node
+
+    def parse_binary(self, min_prec):
+        left = self.parse_unary()
+        while True:
+            kind, value = self.peek()
+            if kind != "op" or value == "^" or PRECEDENCE[value] < min_prec:
+                return left
+            self.advance()
+            right = self.parse_binary(PRECEDENCE[value] + 1)
+            left = ("bin", value, left, right)
+
+    def parse_unary(self):
+        kind, value = self.peek()
+        if kind == "op" and value in "+-":
+            self.advance()
+            return ("unary", "neg" if value == "-" else "pos", self.parse_unary())
+        return self.parse_power()
+
+    def parse_power(self):
+        # Right-associative and tighter than a leading sign: -2^2 == -(2^2)
+        base = self.parse_atom()
+        if self.peek() == ("op", "^"):
+            self.advance()
+            return ("bin", "^", base, self.parse_unary())
+        return base
+
+    def parse_atom(self):
+        kind, value = self.advance()
+        if kind == "num":
+            return ("num", value)
+        if kind == "name":
+            if self.peek()[0] == "lparen":
+                self.advance()
+                arg = self.parse_binary(1)
+                self.expect("rparen")
+                return ("call", value, arg)
+            return ("var", value)
+        if kind == "lparen":
+            node = self.parse_binary(1)
+            self.expect("rparen")
+            return node
+        raise ExpressionError("Unexpected end of input" if kind is None
+                              else f"Unexpected {value!r}")
+
+
+def parse(text):
+    return Parser(tokenize(normalize(text))).parse()
+
+
+def variables(node):
+    # Names referenced by an AST (function names excluded); iterative, so
+    # a long "1+1+...+1" chain cannot hit the recursion limit
+    names = set()
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        kind = node[0]
+        if kind == "var":
+            names.add(node[1])
+        elif kind == "unary" or kind == "call":
+            stack.append(node[2])
+        elif kind == "bin":
+            stack.append(node[2])
+            stack.append(node[3])
+    return names
+
+
+def _left_chain(node):
+    # A left-nested run of binary operators, ((a op b) op c) op d, as
+    # (a, [(op, b), (op, c), (op, d)]). The parser builds chains like
+    # "1+1+...+1" this way, so walking them in a loop keeps recursion depth
+    # independent of their length.
+    steps = []
+    while node[0] == "bin":
+        steps.append((node[1], node[3]))
+        node = node[2]
+    steps.reverse()
+    return node, steps
+
+
+def build(node, ops):
+    # Turn an AST into nested closures so evaluation never re-walks the tree
+    kind = node[0]
+    if kind == "num":
+        value = ops["num"](node[1])
+        return lambda env: value
+    if kind == "var":
+        name = node[1]
+
+        def load(env):
+            try:
+                return env[name]
+            except (KeyError, TypeError):
+                raise NameError(f"name {name!r} is not defined") from None
+        return load
+    if kind == "unary":
+        func, operand = ops[node[1]], build(node[2], ops)
+        return lambda env: func(operand(env))
+    if kind == "call":
+        if node[1] not in FUNCTIONS:
+            raise NameError(f"name {node[1]!r} is not defined")
+        func, arg = ops[node[1]], build(node[2], ops)
+        return lambda env: func(arg(env))
+    first, steps = _left_chain(node)
+    if len(steps) == 1:
+        func, left, right = ops[node[1]], build(node[2], ops), build(node[3], ops)
+        return lambda env: func(left(env), right(env))
+    first = build(first, ops)
+    steps = [(ops[op], build(right, ops)) for op, right in steps]
+
+    def chain(env):
+        value = first(env)
+        for func, right in steps:
+            value = func(value, right(env))
+        return value
+    return chain
+
+
+class CompiledExpression:
+    def __init__(self, text, tree, func):
+        self.text = text
+        self.tree = tree
+        self.func = func
+        self.variables = variables(tree)
+
+    def evaluate(self, env=None, **kwargs):
+        if kwargs:
+            env = dict(env or {}, **kwargs)
+        return self.func(env)
+
+    __call__ = evaluate
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _compile_normalized(text, backend):
+    tree = Parser(tokenize(text)).parse()
+    return CompiledExpression(text, tree, build(tree, BACKENDS[backend]))
+
+
+def compile_expression(text, backend="python"):
+    return _compile_normalized(normalize(text), backend)
+
+
+def evaluate(text, env=None, **kwargs):
+    return compile_expression(text).evaluate(env, **kwargs)
+
+
+def cache_info():
+    return _compile_normalized.cache_info()
+
+
+def clear_cache():
+    _compile_normalized.cache_clear()
+
+
+def _estimate(node):
+    # Returns (log2 of the result magnitude, result is an exact int,
+    # bits of the largest exact int built along the way)
+    kind = node[0]
+    if kind == "num":
+        value = node[1]
+        magnitude = math.log2(abs(value)) if abs(value) > 1 else 0.0
+        return magnitude, isinstance(value, int), 0.0
+    if kind == "var":
+        return 64.0, False, 0.0
+    if kind == "unary":
+        return _estimate(node[2])
+    if kind == "call":
+        magnitude, _, cost = _estimate(node[2])
+        return magnitude / 2, False, cost
+    first, steps = _left_chain(node)
+    result = _estimate(first)
+    for op, right in steps:
+        result = _estimate_binary(op, result, _estimate(right))
+    return result
+
+
+def _estimate_binary(op, left, right):
+    (left, left_int, left_cost), (right, right_int, right_cost) = left, right
+    exact = left_int and right_int
+    cost = max(left_cost, right_cost)
+    if op in "+-":
+        magnitude = max(left, right) + 1
+    elif op == "*":
+        magnitude = left + right
+    elif op == "^":
+        exponent = 2.0 ** right if right < 1024 else math.inf
+        magnitude = left * exponent if left > 0 else 0.0
+    else:
+        magnitude = left
+        exact = exact and op == "//"
+    if exact:
+        cost = max(cost, magnitude)
+    return magnitude, exact, cost
+
+
+def estimate_cost(expression):
+    return _estimate(expression.tree)[2]
+
+
+def plan(expression):
+    # Pick where to evaluate: "inline", "worker" or "float"
+    cost = estimate_cost(expression)
+    if cost <= INLINE_BITS:
+        return "inline"
+    if cost <= WORKER_BITS:
+        return "worker"
+    return "float"
+
+
+# Significant digits shown for integers past the int -> str conversion
+# limit; math.log10 of a WORKER_BITS integer is exact to about 1e-9
+SCIENTIFIC_DIGITS = 8
+
+
+def format_result(value):
+    try:
+        return str(value)
+    except ValueError:
+        # int -> str conversion limit hit (about 14k bits): show the
+        # magnitude in scientific notation, like a float would
+        return _scientific(value)
+
+
+def _scientific(value):
+    sign = "-" if value < 0 else ""
+    exponent, fraction = divmod(math.log10(abs(value)), 1)
+    mantissa = f"{10 ** fraction:.{SCIENTIFIC_DIGITS - 1}f}"
+    if mantissa.startswith("10"):
+        # fraction rounded up to the next power of ten
+        exponent += 1
+        mantissa = f"{1:.{SCIENTIFIC_DIGITS - 1}f}"
+    return f"{sign}{mantissa}e+{int(exponent)}"
+
+
+def _serve(conn):
+    # Worker process loop: receive expression text, send back the result
+    while True:
+        try:
+            text = conn.recv()
+        except EOFError:
+            return
+        if text is None:
+            return
+        try:
+            conn.send((True, format_result(evaluate(text))))
+        except Exception as e:
+            try:
+                conn.send((False, e))
+            except Exception:
+                conn.send((False, RuntimeError(str(e))))
+
+
+class EvaluationWorker:
+    # Evaluates expressions in a child process so the caller can poll for
+    # the result, enforce a timeout and cancel runaway computations.
+    def __init__(self, timeout=WORKER_TIMEOUT):
+        self.timeout = timeout
+        self.process = None
+        self.conn = None
+        self.started = None
+
+    @property
+    def busy(self):
+        return self.started is not None
+
+    def _ensure_process(self):
+        if self.process is None or not self.process.is_alive():
+            self.conn, child_conn = multiprocessing.Pipe()
+            self.process = multiprocessing.Process(target=_serve, args=(child_conn,), daemon=True)
+            self.process.start()
+            child_conn.close()
+
+    def submit(self, text):
+        if self.busy:
+            raise RuntimeError("worker is busy")
+        self._ensure_process()
+        self.conn.send(text)
+        self.started = time.monotonic()
+
+    def poll(self):
+        # Returns the formatted result, None while still running, or raises
+        # the evaluation error (TimeoutError once the time limit passes)
+        if not self.busy:
+            return None
+        if self.conn.poll():
+            self.started = None
+            try:
+                ok, value = self.conn.recv()
+            except EOFError:
+                self.cancel()
+                raise RuntimeError("worker exited unexpectedly") from None
+            if ok:
+                return value
+            raise value
+        if time.monotonic() - self.started > self.timeout:
+            self.cancel()
+            raise TimeoutError("calculation timed out")
+        return None
+
+    def cancel(self):
+        # Killing the process is the only way to interrupt a big-int operation
+        self.started = None
+        if self.process is not None:
+            self.process.terminate()
+            self.process.join()
+            self.conn.close()
+            self.process = None
+            self.conn = None
+
+    def close(self):
+        if self.process is not None and not self.busy:
+            self.conn.send(None)
+            self.process.join(1)
+        self.cancel()
+
+
+# ---------------------------------------------------------------------------
+# Incremental evaluation for live previews
+#
+# The evaluator keeps one immutable parser state per consumed character. The
+# operand and operator stacks are persistent linked lists, so each state
+# shares everything but its newest frame with its predecessor. Appending a
+# character builds one new state from the last one and backspace just drops
+# the last state, so edits at the end of a long expression cost O(change).
+
+# Largest power the preview will compute; anything bigger is left blank
+PREVIEW_BITS = 1 << 13
+
+# Unary operators sit between * / and ^: -2^2 == -(2^2), -2*3 == (-2)*3
+UNARY_PRECEDENCE = 3
+
+_INVALID = object()  # expression can never become valid by appending
+_NO_VALUE = object()  # valid so far but too costly or failing to preview
+
+
+class _State:
+    __slots__ = ("values", "ops", "pending", "expect_operand", "op_text", "invalid")
+
+    def __init__(self, values=None, ops=None, pending="", expect_operand=True,
+                 op_text="", invalid=False):
+        self.values = values  # (value, rest) cons list
+        self.ops = ops  # (op, rest) cons list; op is ("bin", sym), ("unary", name),
+        # ("paren",) or ("call", name)
+        self.pending = pending  # characters of the number or name being typed
+        self.expect_operand = expect_operand
+        self.op_text = op_text  # text of a binary operator just consumed
+        self.invalid = invalid
+
+    def replace(self, **changes):
+        state = _State(self.values, self.ops, self.pending, self.expect_operand,
+                       self.op_text, self.invalid)
+        for name, value in changes.items():
+            setattr(state, name, value)
+        return state
+
+
+_INVALID_STATE = _State(invalid=True)
+
+
+def _preview_apply(op, *args):
+    if any(arg is _NO_VALUE for arg in args):
+        return _NO_VALUE
+    if op == "^":
+        base, exponent = args
+        if isinstance(base, int) and isinstance(exponent, int) and abs(base) > 1:
+            if exponent > PREVIEW_BITS or exponent * math.log2(abs(base)) > PREVIEW_BITS:
+                return _NO_VALUE
+    try:
+        return PYTHON_OPS[op](*args)
+    except Exception:
+        return _NO_VALUE
+
+
+def _reduce_once(values, ops):
+    # Apply the operator on top of the stack to its operands
+    op, ops = ops
+    if op[0] == "unary":
+        value, values = values
+        return (_preview_apply(op[1], value), values), ops
+    right, values = values
+    left, values = values
+    return (_preview_apply(op[1], left, right), values), ops
+
+
+def _op_precedence(op):
+    if op[0] == "bin":
+        return PRECEDENCE[op[1]]
+    if op[0] == "unary":
+        return UNARY_PRECEDENCE
+    return 0  # parentheses and calls stop reductions
+
+
+def _finish_pending(state):
+    # Turn the number being typed into an operand
+    if not state.pending:
+        return state
+    if not state.pending[0].isdigit() and state.pending[0] != ".":
+        return _INVALID_STATE  # bare name: only sqrt( is allowed
+    try:
+        value = _number(state.pending)
+    except ValueError:
+        return _INVALID_STATE
+    return state.replace(values=(value, state.values), pending="", expect_operand=False)
+
+
+def _push_binary(state, symbol, op_text):
+    state = _finish_pending(state)
+    if state.invalid or state.expect_operand:
+        return _INVALID_STATE
+    values, ops = state.values, state.ops
+    precedence = PRECEDENCE[symbol]
+    # "^" is right-associative so it only reduces strictly tighter operators
+    while ops is not None and (_op_precedence(ops[0]) > precedence or (
+            symbol != "^" and _op_precedence(ops[0]) == precedence)):
+        values, ops = _reduce_once(values, ops)
+    return _State(values, (("bin", symbol), ops), expect_operand=True, op_text=op_text)
+
+
+def _step(state, previous, char):
+    # Consume one character; previous is the state before `state`, needed to
+    # reinterpret "*" "*" as "^" and "/" "/" as "//"
+    if state.invalid:
+        return state
+    pending = state.pending
+    if pending and (pending[0].isdigit() or pending[0] == ".") and (
+            (char in "eE" and "e" not in pending.lower())
+            or (char in "+-" and pending[-1] in "eE")):
+        return state.replace(pending=pending + char, op_text="")  # exponent, as in 1e-05
+    if char.isdigit() or char == "." or char.isalpha() or char == "_":
+        if state.pending:
+            if not (state.pending[0].isalpha() or state.pending[0] == "_") and (
+                    char.isalpha() or char == "_"):
+                return _INVALID_STATE
+            return state.replace(pending=state.pending + char, op_text="")
+        if not state.expect_operand:
+            return _INVALID_STATE
+        return state.replace(pending=char, op_text="")
+    if char.isspace():
+        return _finish_pending(state).replace(op_text="")
+    if char in "*/" and state.op_text == char:
+        return _push_binary(previous, "^" if char == "*" else "//", char * 2)
+    if char in "+-" and state.expect_operand and not state.pending:
+        op = ("unary", "neg" if char == "-" else "pos")
+        return state.replace(ops=(op, state.ops), op_text="")
+    if char in "+-*/^":
+        return _push_binary(state, char, char)
+    if char == "(":
+        if state.pending:
+            if state.pending not in FUNCTIONS:
+                return _INVALID_STATE
+            op = ("call", state.pending)
+        elif state.expect_operand:
+            op = ("paren",)
+        else:
+            return _INVALID_STATE
+        return state.replace(ops=(op, state.ops), pending="", op_text="")
+    if char == ")":
+        state = _finish_pending(state)
+        if state.invalid or state.expect_operand:
+            return _INVALID_STATE
+        values, ops = state.values, state.ops
+        while ops is not None and ops[0][0] in ("bin", "unary"):
+            values, ops = _reduce_once(values, ops)
+        if ops is None:
+            return _INVALID_STATE
+        op, ops = ops
+        if op[0] == "call":
+            value, values = values
+            values = (_preview_apply(op[1], value), values)
+        return _State(values, ops, expect_operand=False)
+    return _INVALID_STATE
+
+
+class IncrementalEvaluator:
+    def __init__(self, text=""):
+        self.text = ""
+        self.states = [_State()]
+        self.append(text)
+
+    def append(self, text):
+        for char in text:
+            previous = self.states[-2] if len(self.states) > 1 else self.states[-1]
+            self.states.append(_step(self.states[-1], previous, char))
+        self.text += text
+
+    def backspace(self, count=1):
+        count = min(count, len(self.text))
+        if count:
+            del self.states[-count:]
+            self.text = self.text[:-count]
+
+    def clear(self):
+        self.text = ""
+        del self.states[1:]
+
+    def set_text(self, text):
+        # Keep the shared prefix and only redo the edited tail
+        common = 0
+        limit = min(len(text), len(self.text))
+        while common < limit and text[common] == self.text[common]:
+            common += 1
+        self.backspace(len(self.text) - common)
+        self.append(text[common:])
+
+    @staticmethod
+    def _incomplete(state):
+        # Ends in an operator or open parenthesis, waiting for an operand
+        return state.expect_operand and not state.pending and not state.invalid
+
+    def preview(self):
+        # Value of the expression so far, auto-closing open parentheses and
+        # ignoring a trailing operator; None when there is nothing to show
+        index = len(self.states) - 1
+        while index > 0 and self._incomplete(self.states[index]):
+            index -= 1
+        state = _finish_pending(self.states[index])
+        if index == 0 or state.invalid:
+            return None
+        values, ops = state.values, state.ops
+        while ops is not None:
+            if ops[0][0] in ("bin", "unary"):
+                values, ops = _reduce_once(values, ops)
+            else:
+                op, ops = ops
+                if op[0] == "call":
+                    value, values = values
+                    values = (_preview_apply(op[1], value), values)
+        value = values[0]
+        if value is _NO_VALUE or (isinstance(value, int) and value.bit_length() > PREVIEW_BITS):
+            return None
+        return value
@@ -1,18 +1,21 @@
 import tkinter as tk
-from tkinter import font as tkfont
-from math import sqrt
+import calc_engine
+from tk_shared import font
+import tk_instrument
 
 class ErrorFreeCalculator:
     def __init__(self, root):
         self.root = root
         self.root.title("🔢 Error-Free Calculator")
-        self.root.geometry("320x500")
+        self.root.geometry("320x540")
         self.root.configure(bg="#121212")
         self.root.resizable(False, False)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # Custom font
-        self.display_font = tkfont.Font(size=24, weight="bold")
-        self.button_font = tkfont.Font(size=16)
+        self.display_font = font(24, "bold")
+        self.button_font = font(16)
+        self.preview_font = font(14)
         
         # Display - using grid instead of pack
         self.display_var = tk.StringVar()
@@ -21,15 +24,22 @@ class ErrorFreeCalculator:
             borderwidth=0, relief="flat", justify="right", bg="#1e1e1e", fg="white",
             insertbackground="white", highlightthickness=0
         )
-        self.display.grid(row=0, column=0, columnspan=4, sticky="nsew", padx=20, pady=(30, 20), ipady=10)
+        self.display.grid(row=0, column=0, columnspan=4, sticky="nsew", padx=20, pady=(30, 0), ipady=10)
+        
+        # Live result preview, updated as the expression is typed
+        self.preview_var = tk.StringVar()
+        tk.Label(
+            root, textvariable=self.preview_var, font=self.preview_font,
+            anchor="e", bg="#121212", fg="#9e9e9e"
+        ).grid(row=1, column=0, columnspan=4, sticky="nsew", padx=20, pady=(0, 10))
         
         # Button layout
         buttons = [
-            ("7", 1, 0), ("8", 1, 1), ("9", 1, 2), ("/", 1, 3),
-            ("4", 2, 0), ("5", 2, 1), ("6", 2, 2), ("*", 2, 3),
-            ("1", 3, 0), ("2", 3, 1), ("3", 3, 2), ("-", 3, 3),
-            ("0", 4, 0), (".", 4, 1), ("=", 4, 2), ("+", 4, 3),
-            ("C", 5, 0), ("⌫", 5, 1), ("√", 5, 2), ("^", 5, 3)
+            ("7", 2, 0), ("8", 2, 1), ("9", 2, 2), ("/", 2, 3),
+            ("4", 3, 0), ("5", 3, 1), ("6", 3, 2), ("*", 3, 3),
+            ("1", 4, 0), ("2", 4, 1), ("3", 4, 2), ("-", 4, 3),
+            ("0", 5, 0), (".", 5, 1), ("=", 5, 2), ("+", 5, 3),
+            ("C", 6, 0), ("⌫", 6, 1), ("√", 6, 2), ("^", 6, 3)
         ]
         
         # Button styling
@@ -48,16 +58,27 @@ class ErrorFreeCalculator:
             btn.grid(row=row, column=col, padx=5, pady=5, sticky="nsew")
         
         # Configure grid weights
-        for i in range(6):  # Changed from (1,6) to include row 0
+        for i in range(7):  # Includes the display and preview rows
             root.grid_rowconfigure(i, weight=1)
         for i in range(4):
             root.grid_columnconfigure(i, weight=1)
         
         # Initialize calculator state
         self.current_input = ""
+        self.live = calc_engine.IncrementalEvaluator()
+        
+        # Expensive expressions are evaluated in a worker process and polled
+        self.worker = calc_engine.EvaluationWorker()
+        self.poll_interval = 50
+        self.poll_job = None
         self.bind_keyboard_events()
     
     def on_button_click(self, button_text):
+        if self.worker.busy:
+            # Only cancelling is allowed while a calculation is running
+            if button_text == "C":
+                self.cancel_calculation()
+            return
         if button_text == "=":
             self.calculate_result()
         elif button_text == "C":
@@ -65,46 +86,113 @@ class ErrorFreeCalculator:
         elif button_text == "⌫":
             self.backspace()
         elif button_text == "√":
-            self.current_input += "sqrt("
-            self.display_var.set(self.current_input)
-        elif button_text == "^":
-            self.current_input += "**"
-            self.display_var.set(self.current_input)
+            self.append_input("sqrt(")
         else:
-            self.current_input += button_text
-            self.display_var.set(self.current_input)
+            self.append_input(button_text)
+    
+    def append_input(self, text):
+        self.current_input += text
+        self.live.append(text)
+        self.display_var.set(self.current_input)
+        self.update_preview()
+    
+    def update_preview(self):
+        # Only the appended characters are parsed; see IncrementalEvaluator
+        value = self.live.preview()
+        text = "" if value is None else str(value)
+        self.preview_var.set("" if text in ("", self.current_input) else f"= {text}")
     
     def calculate_result(self):
         try:
-            # Replace ^ with ** for exponentiation
-            expression = self.current_input.replace("^", "**")
-            result = str(eval(expression, {"sqrt": sqrt, "__builtins__": None}))
-            self.display_var.set(result)
-            self.current_input = result
-        except ZeroDivisionError:
+            # Parsed once per distinct expression, then served from the cache
+            expression = calc_engine.compile_expression(self.current_input)
+            mode = calc_engine.plan(expression)
+            if mode == "worker":
+                self.start_background_calculation()
+                return
+            if mode == "float":
+                # Exponent towers too big for exact integers
+                expression = calc_engine.compile_expression(self.current_input, backend="float")
+            self.show_result(calc_engine.format_result(expression.evaluate()))
+        except Exception as e:
+            self.show_error(e)
+    
+    def start_background_calculation(self):
+        self.worker.submit(self.current_input)
+        self.display_var.set("Computing… (C or Esc to cancel)")
+        self.poll_job = self.root.after(self.poll_interval, self.poll_calculation)
+    
+    def poll_calculation(self):
+        self.poll_job = None
+        try:
+            result = self.worker.poll()
+        except Exception as e:
+            self.show_error(e)
+            return
+        if result is None:
+            self.poll_job = self.root.after(self.poll_interval, self.poll_calculation)
+        else:
+            self.show_result(result)
+    
+    def cancel_calculation(self):
+        if self.poll_job is not None:
+            self.root.after_cancel(self.poll_job)
+            self.poll_job = None
+        self.worker.cancel()
+        # Give the expression back so it can be edited
+        self.display_var.set(self.current_input)
+    
+    def show_result(self, result):
+        self.display_var.set(result)
+        self.current_input = result
+        self.live.set_text(result)
+        self.update_preview()
+    
+    def show_error(self, error):
+        if isinstance(error, ZeroDivisionError):
             self.display_var.set("Error: Division by zero")
-            self.current_input = ""
-        except (SyntaxError, NameError, TypeError):
+        elif isinstance(error, OverflowError):
+            self.display_var.set("Error: Result too large")
+        elif isinstance(error, TimeoutError):
+            self.display_var.set("Error: Calculation timed out")
+        elif isinstance(error, (SyntaxError, NameError, TypeError)):
             self.display_var.set("Error: Invalid input")
-            self.current_input = ""
-        except Exception:
+        else:
             self.display_var.set("Error: Calculation failed")
-            self.current_input = ""
+        self.current_input = ""
+        self.live.clear()
+        self.update_preview()
     
     def clear_display(self):
         self.current_input = ""
         self.display_var.set("")
+        self.live.clear()
+        self.update_preview()
     
     def backspace(self):
         self.current_input = self.current_input[:-1]
+        self.live.backspace()
         self.display_var.set(self.current_input)
+        self.update_preview()
+    
+    def on_close(self):
+        if self.poll_job is not None:
+            self.root.after_cancel(self.poll_job)
+            self.poll_job = None
+        # Stops the worker process, killing it if a calculation is running
+        self.worker.close()
+        self.root.destroy()
     
     def bind_keyboard_events(self):
         self.root.bind("<Key>", self.handle_key_press)
     
     def handle_key_press(self, event):
+        if self.worker.busy:
+            if event.keysym == "Escape":
+                self.cancel_calculation()
+            return
         key = event.char
-        if key in "0123456789+-*/.()":
+        if key in "0123456789+-*/.()^":
             self.on_button_click(key)
         elif event.keysym == "Return":
             self.calculate_result()
@@ -114,6 +202,7 @@ class ErrorFreeCalculator:
             self.clear_display()
 
 if __name__ == "__main__":
+    tk_instrument.install_from_env()  # opt-in, via TK_INSTRUMENT
     root = tk.Tk()
     app = ErrorFreeCalculator(root)
     root.mainloop()
\ No newline at end of file
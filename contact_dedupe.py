@@ -0,0 +1,100 @@
+import re
+
+from contact_store import FIELDS
+
+WORD_RE = re.compile(r"\w+")
+NON_DIGIT_RE = re.compile(r"\D+")
+
+
+def canonical_phone(phone):
+    # Digits only, compared on the last 10 so "+1 (555) 010-2030" and
+    # "555.010.2030" agree; fewer than 7 digits is not a usable key
+    digits = NON_DIGIT_RE.sub("", phone)
+    return digits[-10:] if len(digits) >= 7 else None
+
+
+def canonical_email(email):
+    email = email.strip().casefold()
+    return email if "@" in email else None
+
+
+def canonical_name(name):
+    return " ".join(WORD_RE.findall(name.casefold())) or None
+
+
+def name_key(name):
+    # Canonical words in sorted order, so "Smith, John" matches "john smith"
+    return " ".join(sorted(WORD_RE.findall(name.casefold()))) or None
+
+
+def blocking_keys(name, phone, email):
+    # Contacts sharing any key are duplicate candidates. The name only
+    # counts for contacts with neither a phone nor an email to go by.
+    # Candidates still need matching names; see find_duplicates.
+    keys = []
+    phone = canonical_phone(phone)
+    if phone:
+        keys.append("p" + phone)
+    email = canonical_email(email)
+    if email:
+        keys.append("e" + email)
+    if not keys:
+        name = canonical_name(name)
+        if name:
+            keys.append("n" + name)
+    return keys
+
+
+def find_duplicates(rows):
+    # Groups of ids (each sorted, at least two) that look like the same
+    # person: they share a blocking key and their names match. rows are
+    # (id, name, phone, email) tuples, e.g. from ContactStore.iter_fields.
+    # One pass with a union-find over row positions: near-linear time.
+    #
+    # Keys only propose candidates. Blocks are split by name_key before
+    # anything is joined, so a shared office phone or family email never
+    # joins different people, not even through a third contact: every
+    # union is between two contacts with the same name. Nameless contacts
+    # are never grouped.
+    ids = []
+    parent = []
+    first_row = {}  # blocking key + name key -> first row that had it
+
+    def find(row):
+        root = row
+        while parent[root] != root:
+            root = parent[root]
+        while parent[row] != root:
+            parent[row], row = root, parent[row]
+        return root
+
+    for row, (contact_id, name, phone, email) in enumerate(rows):
+        ids.append(contact_id)
+        parent.append(row)
+        person = name_key(name)
+        if person is None:
+            continue
+        for key in blocking_keys(name, phone, email):
+            # A str, not a tuple: millions of tuples would keep the
+            # cyclic garbage collector busy
+            other = first_row.setdefault(f"{key}\0{person}", row)
+            if other != row:
+                a, b = find(row), find(other)
+                if a != b:
+                    parent[max(a, b)] = min(a, b)
+
+    groups = {}
+    for row in range(len(ids)):
+        root = find(row)
+        if root != row:
+            groups.setdefault(root, [ids[root]]).append(ids[row])
+    return sorted(sorted(group) for group in groups.values())
+
+
+def merge_contacts(contacts):
+    # One contact from a group: for each field, the longest value (the
+    # earliest contact wins ties), so no detail is lost by merging
+    merged = {}
+    for field in FIELDS:
+        merged[field] = max((contact[field] for contact in contacts), key=len, default="")
+    return merged
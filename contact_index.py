@@ -0,0 +1,237 @@
+import time
+from array import array
+from bisect import bisect_right
+from collections import Counter
+
+
+def digits(text):
+    return "".join(ch for ch in text if ch.isdigit())
+
+
+def normalize(contact):
+    # One searchable string per contact: casefolded name, phone as typed and
+    # as bare digits (so "5551234" finds "555-1234"), and email. Fields are
+    # padded with spaces so word boundaries produce trigrams of their own.
+    phone = contact.get("phone", "").casefold()
+    fields = (contact.get("name", "").casefold(), phone, digits(phone),
+              contact.get("email", "").casefold())
+    return "\n".join(f" {field} " for field in fields)
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def substring_distance(pattern, text):
+    # Fewest edits (insertions, deletions, substitutions or swaps of two
+    # adjacent characters) turning pattern into some substring of text. This
+    # is Hyyro's bit-parallel form of Myers' algorithm: one pass over text,
+    # with each column of the edit-distance table packed into integers.
+    if not pattern:
+        return 0
+    peq = {}
+    for i, ch in enumerate(pattern):
+        peq[ch] = peq.get(ch, 0) | 1 << i
+    mask = (1 << len(pattern)) - 1
+    high = 1 << (len(pattern) - 1)
+    pv, mv, d0, previous = mask, 0, 0, 0
+    score = best = len(pattern)
+    for ch in text:
+        eq = peq.get(ch, 0)
+        swap = (((~d0) & eq) << 1) & previous
+        d0 = swap | (((eq & pv) + pv) ^ pv) | eq | mv
+        ph = mv | (~(d0 | pv) & mask)
+        mh = d0 & pv
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+            if score < best:
+                best = score
+        ph = (ph << 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(d0 | ph) & mask)
+        mv = ph & d0
+        previous = eq
+    return best
+
+
+class ContactIndex:
+    # Substring search over name, phone and email. Contacts are stored as
+    # columns: row -> contact id, and a dense id -> row array. The
+    # normalized texts are UTF-8 encoded back to back in one bytearray,
+    # with row r spanning offsets[r]:offsets[r + 1], so a contact costs a
+    # few array slots and its bytes rather than dict entries and a str
+    # object. Substrings are matched on the bytes, which for UTF-8 gives
+    # the same answers as matching the text. Rows are stable: removing a
+    # contact leaves a tombstone (id -1) until enough accumulate to compact.
+    # Posting lists keep dead rows until then too, and readers skip them,
+    # so a remove never has to search the postings of its trigrams.
+    #
+    # Every trigram maps to an array of the rows whose text contains it; a
+    # query of three or more characters is answered by verifying only the
+    # rows in the shortest posting list among its trigrams. Typing more
+    # characters narrows the previous result instead of starting over.
+    def __init__(self):
+        self.ids = array("q")
+        self.text = bytearray()
+        self.offsets = array("Q", [0])
+        self.row_of = array("i")  # indexed by contact id; -1 if absent
+        self.postings = {}
+        self.dead = 0
+        self._last_query = None
+        self._last_rows = None
+
+    def __len__(self):
+        return len(self.ids) - self.dead
+
+    def __contains__(self, contact_id):
+        return self._row(contact_id) >= 0
+
+    def _row(self, contact_id):
+        if 0 <= contact_id < len(self.row_of):
+            return self.row_of[contact_id]
+        return -1
+
+    def text_of(self, row):
+        return self.text[self.offsets[row]:self.offsets[row + 1]].decode("utf-8")
+
+    def add(self, contact_id, contact):
+        # Also used for updates: re-adding an id replaces its entry
+        self.remove(contact_id)
+        self._append(contact_id, normalize(contact))
+        self._last_query = None
+
+    update = add
+
+    def _append(self, contact_id, text):
+        row = len(self.ids)
+        self.ids.append(contact_id)
+        self.text += text.encode("utf-8")
+        self.offsets.append(len(self.text))
+        if contact_id >= len(self.row_of):
+            self.row_of.extend(array("i", [-1]) * (contact_id + 1 - len(self.row_of)))
+        self.row_of[contact_id] = row
+        for gram in trigrams(text):
+            rows = self.postings.get(gram)
+            if rows is None:
+                rows = self.postings[gram] = array("I")
+            rows.append(row)
+
+    def remove(self, contact_id):
+        row = self._row(contact_id)
+        if row < 0:
+            return
+        self.ids[row] = -1
+        self.row_of[contact_id] = -1
+        self.dead += 1
+        self._last_query = None
+        if self.dead > 1024 and self.dead * 2 > len(self.ids):
+            self.compact()
+
+    def compact(self):
+        # Renumber the live rows densely and rebuild the postings without
+        # the dead ones
+        live = [(contact_id, self.text_of(row)) for row, contact_id in enumerate(self.ids)
+                if contact_id >= 0]
+        self.ids = array("q")
+        self.text = bytearray()
+        self.offsets = array("Q", [0])
+        self.postings = {}
+        self.dead = 0
+        for contact_id, text in live:
+            self._append(contact_id, text)
+        # The narrowed result holds the old row numbers
+        self._last_query = self._last_rows = None
+
+    def candidates(self, query):
+        # Smallest set of rows that may contain query, or None if every row may
+        candidates = None
+        if self._last_query and query.startswith(self._last_query):
+            candidates = self._last_rows
+        if len(query) >= 3:
+            for gram in trigrams(query):
+                rows = self.postings.get(gram)
+                if rows is None:
+                    return []
+                if candidates is None or len(rows) < len(candidates):
+                    candidates = rows
+        return candidates
+
+    def search(self, query):
+        # Ids (ascending) whose name, phone or email contains query
+        query = query.strip().casefold()
+        if not query:
+            return None
+        candidates = self.candidates(query)
+        pattern = query.encode("utf-8")
+        find, offsets, ids = self.text.find, self.offsets, self.ids
+        if candidates is None:
+            rows = self._scan(pattern)
+        else:
+            rows = [row for row in candidates
+                    if ids[row] >= 0 and find(pattern, offsets[row], offsets[row + 1]) >= 0]
+        self._last_query, self._last_rows = query, rows
+        results = [ids[row] for row in rows]
+        results.sort()
+        return results
+
+    def _scan(self, pattern):
+        # Live rows containing pattern, found by searching the whole buffer
+        # and mapping each hit to its row
+        find, offsets, ids = self.text.find, self.offsets, self.ids
+        rows = []
+        position = find(pattern)
+        while position >= 0:
+            row = bisect_right(offsets, position) - 1
+            end = offsets[row + 1]
+            if position + len(pattern) > end:
+                position = find(pattern, position + 1)  # spans two rows
+                continue
+            if ids[row] >= 0:
+                rows.append(row)
+            position = find(pattern, end)
+        return rows
+
+    def fuzzy(self, query, limit=50, max_distance=None, budget=0.05,
+              max_postings=200000, max_candidates=500):
+        # Ids of the contacts closest to query, best first, allowing typos:
+        # ranked by edit distance to the best-matching part of their text,
+        # then by trigrams shared with the query, then id. Contacts sharing
+        # the most trigrams are checked first, and the search stops after
+        # budget seconds with the best found so far.
+        query = query.strip().casefold()
+        if len(query) < 3:
+            return self.search(query) or []
+        if max_distance is None:
+            max_distance = 1 if len(query) < 8 else 2
+        deadline = time.perf_counter() + budget
+
+        # Rarest trigrams are the most telling; very common ones are only
+        # counted while the total stays within max_postings. Padding adds
+        # the word-boundary trigrams, which survive a typo mid-word.
+        lists = sorted((self.postings.get(gram, ()) for gram in trigrams(f" {query} ")),
+                       key=len)
+        counts = Counter()
+        counted = 0
+        for rows in lists:
+            if counts and (counted + len(rows) > max_postings
+                           or time.perf_counter() > deadline):
+                break
+            counts.update(rows)
+            counted += len(rows)
+
+        ranked = []
+        ids = self.ids
+        if self.dead:
+            # Removed contacts must not take up candidate slots
+            for row in [row for row in counts if ids[row] < 0]:
+                del counts[row]
+        for n, (row, shared) in enumerate(counts.most_common(max_candidates)):
+            distance = substring_distance(query, self.text_of(row))
+            if distance <= max_distance:
+                ranked.append((distance, -shared, ids[row]))
+            if n % 64 == 63 and time.perf_counter() > deadline:
+                break
+        ranked.sort()
+        return [contact_id for _, _, contact_id in ranked[:limit]]
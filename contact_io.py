@@ -0,0 +1,235 @@
+import csv
+import os
+import queue
+import threading
+from itertools import chain
+
+from contact_dedupe import find_duplicates
+from contact_store import FIELDS, ContactStore
+
+# CSV header spellings accepted for each field, casefolded
+HEADERS = {
+    "name": "name", "full name": "name", "fn": "name",
+    "phone": "phone", "phone number": "phone", "telephone": "phone", "mobile": "phone", "tel": "phone",
+    "email": "email", "e-mail": "email", "email address": "email",
+    "address": "address", "adr": "address",
+}
+
+VCARD_EXTENSIONS = (".vcf", ".vcard")
+
+
+def is_vcard(path):
+    return path.lower().endswith(VCARD_EXTENSIONS)
+
+
+def iter_csv(f):
+    # Contacts from CSV rows, one at a time. A header row names the columns;
+    # without one, columns are name, phone, email, address. Rows without a
+    # name are skipped.
+    reader = csv.reader(f)
+    first = next(reader, None)
+    if first is None:
+        return
+    columns = [HEADERS.get(cell.strip().casefold()) for cell in first]
+    rows = reader
+    if "name" not in columns:
+        columns = list(FIELDS)
+        rows = chain([first], reader)
+    for row in rows:
+        contact = dict.fromkeys(FIELDS, "")
+        for field, value in zip(columns, row):
+            if field:
+                contact[field] = value.strip()
+        if contact["name"]:
+            yield contact
+
+
+def write_csv(f, contacts):
+    writer = csv.writer(f)
+    writer.writerow(FIELDS)
+    for contact in contacts:
+        writer.writerow([contact[field] for field in FIELDS])
+
+
+def split_escaped(value, separator):
+    # Split on separators not escaped with a backslash, then unescape
+    if "\\" not in value:
+        return value.split(separator) if separator else [value]
+    parts, current, chars = [], [], iter(value)
+    for ch in chars:
+        if ch == "\\":
+            ch = next(chars, "")
+            current.append("\n" if ch in "nN" else ch)
+        elif ch == separator:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(ch)
+    parts.append("".join(current))
+    return parts
+
+
+def unescape(value):
+    return split_escaped(value, None)[0]
+
+
+def escape(value):
+    return (value.replace("\\", "\\\\").replace(",", "\\,").replace(";", "\\;")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def iter_vcard_lines(f):
+    # Logical vCard lines: folded continuation lines (starting with a space
+    # or tab) are joined to the line before them
+    pending = None
+    for line in f:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and pending is not None:
+            pending += line[1:]
+            continue
+        if pending is not None:
+            yield pending
+        pending = line
+    if pending:
+        yield pending
+
+
+def iter_vcard(f):
+    # Contacts from a vCard file, one card at a time. The first TEL and
+    # EMAIL of each card are kept; FN is preferred over N for the name.
+    card = None
+    for line in iter_vcard_lines(f):
+        key, _, value = line.partition(":")
+        name = key.split(";", 1)[0].rsplit(".", 1)[-1].upper()
+        if name == "BEGIN" and value.upper() == "VCARD":
+            card = dict.fromkeys(FIELDS, "")
+            structured_name = ""
+        elif card is None:
+            continue
+        elif name == "END":
+            card["name"] = card["name"] or structured_name
+            if card["name"]:
+                yield card
+            card = None
+        elif name == "FN":
+            card["name"] = unescape(value).strip()
+        elif name == "N":
+            family, given = (split_escaped(value, ";") + ["", ""])[:2]
+            structured_name = " ".join(part.strip() for part in (given, family) if part.strip())
+        elif name == "TEL" and not card["phone"]:
+            card["phone"] = unescape(value).strip()
+        elif name == "EMAIL" and not card["email"]:
+            card["email"] = unescape(value).strip()
+        elif name == "ADR" and not card["address"]:
+            parts = (part.strip() for part in split_escaped(value, ";"))
+            card["address"] = ", ".join(part for part in parts if part)
+
+
+def write_vcard(f, contacts):
+    for contact in contacts:
+        name = escape(contact["name"])
+        f.write(f"BEGIN:VCARD\r\nVERSION:3.0\r\nFN:{name}\r\nN:{name};;;;\r\n")
+        if contact["phone"]:
+            f.write(f"TEL:{escape(contact['phone'])}\r\n")
+        if contact["email"]:
+            f.write(f"EMAIL:{escape(contact['email'])}\r\n")
+        if contact["address"]:
+            f.write(f"ADR:;;{escape(contact['address'])};;;;\r\n")
+        f.write("END:VCARD\r\n")
+
+
+class TransferWorker:
+    # Runs an import, export or duplicate scan on a background thread with
+    # its own SQLite connection, so the UI keeps its connection and never
+    # blocks. Progress arrives on a queue as ("progress", done, fraction),
+    # then ("done", result) or ("error", message); the UI drains it with
+    # poll() from an after() callback. Files are streamed in both
+    # directions and contacts are written to the database in batches.
+    def __init__(self, db_path, batch_size=1000):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.messages = queue.Queue()
+        self.thread = None
+
+    @property
+    def busy(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start_import(self, path):
+        self._start(self._import, path)
+
+    def start_export(self, path):
+        self._start(self._export, path)
+
+    def start_dedupe(self):
+        self._start(self._dedupe, None)
+
+    def _start(self, target, path):
+        self.thread = threading.Thread(target=self._run, args=(target, path), daemon=True)
+        self.thread.start()
+
+    def _run(self, target, path):
+        store = ContactStore(self.db_path)
+        try:
+            self.messages.put(("done", target(store, path)))
+        except Exception as e:
+            # Anything, e.g. sqlite3.Error from the store: the UI waits
+            # for either "done" or "error"
+            self.messages.put(("error", str(e) or type(e).__name__))
+        finally:
+            store.close()
+
+    def _import(self, store, path):
+        size = os.path.getsize(path) or 1
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            contacts = iter_vcard(f) if is_vcard(path) else iter_csv(f)
+            count = 0
+            batch = []
+            for contact in contacts:
+                batch.append(contact)
+                if len(batch) == self.batch_size:
+                    count += store.add_many(batch)
+                    batch = []
+                    # The buffer position is where parsing has read up to
+                    self.messages.put(("progress", count, f.buffer.tell() / size))
+            count += store.add_many(batch)
+        return count
+
+    def _export(self, store, path):
+        total = store.count() or 1
+        exported = 0
+
+        def contacts():
+            nonlocal exported
+            for _, contact in store.iter_all(self.batch_size):
+                yield contact
+                exported += 1
+                if exported % self.batch_size == 0:
+                    self.messages.put(("progress", exported, exported / total))
+
+        # Written next to the target and renamed, so a failed export never
+        # leaves a truncated file behind
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+                write = write_vcard if is_vcard(path) else write_csv
+                write(f, contacts())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return exported
+
+    def _dedupe(self, store, path):
+        # Groups of ids that look like the same person
+        return find_duplicates(store.iter_fields("name", "phone", "email"))
+
+    def poll(self):
+        # Messages received since the last poll
+        messages = []
+        while True:
+            try:
+                messages.append(self.messages.get_nowait())
+            except queue.Empty:
+                return messages
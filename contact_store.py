@@ -0,0 +1,129 @@
+import sqlite3
+
+FIELDS = ("name", "phone", "email", "address")
+
+
+class ContactStore:
+    # SQLite-backed contact storage. The database is only opened on first
+    # use, rows are read a page at a time in id order, and every add, update
+    # or delete touches a single row.
+    def __init__(self, path="contacts.db"):
+        self.path = path
+        self._conn = None
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS contacts (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    phone TEXT NOT NULL DEFAULT '',
+                    email TEXT NOT NULL DEFAULT '',
+                    address TEXT NOT NULL DEFAULT ''
+                );
+                CREATE INDEX IF NOT EXISTS idx_contacts_name ON contacts (name COLLATE NOCASE);
+                CREATE INDEX IF NOT EXISTS idx_contacts_phone ON contacts (phone);
+            """)
+        return self._conn
+
+    def _contact(self, row):
+        return dict(zip(FIELDS, row))
+
+    def get(self, contact_id):
+        row = self.conn.execute(
+            "SELECT name, phone, email, address FROM contacts WHERE id = ?",
+            (contact_id,)).fetchone()
+        return self._contact(row) if row else None
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+
+    def page(self, after_id=0, limit=200, query=""):
+        # Keyset pagination: (id, contact) pairs with id > after_id. A query
+        # keeps only names, phones or emails containing it, case-insensitively.
+        sql = "SELECT id, name, phone, email, address FROM contacts WHERE id > ?"
+        params = [after_id]
+        if query:
+            pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            sql += (" AND (name LIKE ? ESCAPE '\\' OR phone LIKE ? ESCAPE '\\'"
+                    " OR email LIKE ? ESCAPE '\\')")
+            params += [pattern, pattern, pattern]
+        sql += " ORDER BY id LIMIT ?"
+        params.append(limit)
+        return [(row[0], self._contact(row[1:])) for row in self.conn.execute(sql, params)]
+
+    def get_many(self, contact_ids):
+        # (id, contact) pairs for the given ids, in the order given. Ids are
+        # looked up 500 at a time to stay under SQLite's parameter limit.
+        contact_ids = list(contact_ids)
+        found = {}
+        for start in range(0, len(contact_ids), 500):
+            chunk = contact_ids[start:start + 500]
+            sql = ("SELECT id, name, phone, email, address FROM contacts WHERE id IN (%s)"
+                   % ",".join("?" * len(chunk)))
+            for row in self.conn.execute(sql, chunk):
+                found[row[0]] = self._contact(row[1:])
+        return [(cid, found[cid]) for cid in contact_ids if cid in found]
+
+    def iter_all(self, batch_size=2000):
+        # Every (id, contact) pair in id order, read a batch at a time
+        after_id = 0
+        while True:
+            rows = self.page(after_id, batch_size)
+            yield from rows
+            if len(rows) < batch_size:
+                return
+            after_id = rows[-1][0]
+
+    def iter_fields(self, *fields):
+        # (id, *fields) tuples for every contact in id order, streamed from
+        # one query without building a dict per row
+        assert all(field in FIELDS for field in fields)
+        return self.conn.execute(
+            "SELECT id, %s FROM contacts ORDER BY id" % ", ".join(fields))
+
+    def add(self, contact):
+        cursor = self.conn.execute(
+            "INSERT INTO contacts (name, phone, email, address) VALUES (?, ?, ?, ?)",
+            tuple(contact.get(field, "") for field in FIELDS))
+        self.conn.commit()
+        return cursor.lastrowid
+
+    def add_many(self, contacts):
+        # Insert a batch in one transaction; returns how many were added
+        rows = [tuple(contact.get(field, "") for field in FIELDS) for contact in contacts]
+        self.conn.executemany(
+            "INSERT INTO contacts (name, phone, email, address) VALUES (?, ?, ?, ?)", rows)
+        self.conn.commit()
+        return len(rows)
+
+    def update(self, contact_id, contact):
+        self.conn.execute(
+            "UPDATE contacts SET name = ?, phone = ?, email = ?, address = ? WHERE id = ?",
+            tuple(contact.get(field, "") for field in FIELDS) + (contact_id,))
+        self.conn.commit()
+
+    def delete(self, contact_id):
+        self.conn.execute("DELETE FROM contacts WHERE id = ?", (contact_id,))
+        self.conn.commit()
+
+    def merge(self, merges):
+        # Apply (keep_id, contact, duplicate_ids) merges in one transaction:
+        # the kept row takes the merged contact and the duplicates go
+        self.conn.executemany(
+            "UPDATE contacts SET name = ?, phone = ?, email = ?, address = ? WHERE id = ?",
+            [tuple(contact.get(field, "") for field in FIELDS) + (keep_id,)
+             for keep_id, contact, _ in merges])
+        self.conn.executemany(
+            "DELETE FROM contacts WHERE id = ?",
+            [(contact_id,) for _, _, duplicate_ids in merges for contact_id in duplicate_ids])
+        self.conn.commit()
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
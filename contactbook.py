@@ -1,8 +1,16 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
+import sys
+import time
+from itertools import chain
+from contact_store import ContactStore
+from contact_index import ContactIndex
+from contact_io import TransferWorker
+from contact_dedupe import merge_contacts
+import tk_instrument
 
 class ContactBook:
-    def __init__(self, root):
+    def __init__(self, root, data_file="contacts.db"):
         self.root = root
         self.root.title("📒 Contact Book")
         self.root.geometry("700x500")
@@ -12,11 +20,33 @@ class ContactBook:
         self.title_font = ("Arial", 18, "bold")
         self.text_font = ("Arial", 12)
         
-        # Contact storage (list of dictionaries)
-        self.contacts = []
+        # Contact storage: SQLite, opened on first use and paged into the list
+        self.store = ContactStore(data_file)
+        self.page_size = 200
+        self.last_id = 0  # highest id shown so far
+        self.exhausted = False  # every matching row has been paged in
+        self.list_query = ""
+        self.loading_more = False
+        
+        # Substring index over name, phone and email, built in the background;
+        # until it is ready, searches fall back to SQL LIKE
+        self.index = ContactIndex()
+        self.index_ready = False
+        self.index_last_id = 0
+        self.index_building = True
+        self.results = None  # matching ids when searching through the index
+        self.result_pos = 0
+        
+        # CSV/vCard import and export run on a background thread
+        self.transfer = TransferWorker(data_file)
         
         # UI Setup
         self.setup_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # Open the store and show the first page once the window is up
+        self.root.after_idle(self.update_contact_list)
+        self.root.after(1, self.build_index)
     
     def setup_ui(self):
         # Main Frame
@@ -58,6 +88,12 @@ class ContactBook:
             tk.Button(button_frame, text=text, width=10, font=self.text_font,
                      command=command, bg="#2a2a2a", fg="white").grid(row=0, column=i, padx=5)
         
+        for i, (text, command) in enumerate([("Import", self.import_contacts),
+                                             ("Export", self.export_contacts),
+                                             ("Duplicates", self.find_duplicates)]):
+            tk.Button(button_frame, text=text, width=10, font=self.text_font,
+                     command=command, bg="#2a2a2a", fg="white").grid(row=1, column=i, padx=5, pady=(5, 0))
+        
         # Search Frame
         search_frame = tk.Frame(main_frame, bg="#1e1e1e", padx=10, pady=10)
         search_frame.grid(row=2, column=0, sticky="ew", pady=10)
@@ -72,6 +108,13 @@ class ContactBook:
         tk.Button(search_frame, text="Clear", font=self.text_font,
                  command=self.clear_search, bg="#2a2a2a", fg="white").grid(row=0, column=2, padx=5)
         
+        # Fuzzy: rank by closeness, tolerating typos, even when exact matches exist
+        self.fuzzy_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(search_frame, text="Fuzzy", variable=self.fuzzy_var,
+                      command=lambda: self.update_contact_list(self.search_var.get()),
+                      bg="#1e1e1e", fg="white", selectcolor="#2a2a2a",
+                      font=self.text_font).grid(row=0, column=3, padx=5)
+        
         # Contacts List
         list_frame = tk.Frame(main_frame, bg="#1e1e1e")
         list_frame.grid(row=1, column=1, rowspan=2, sticky="nsew", padx=10)
@@ -79,11 +122,25 @@ class ContactBook:
         self.tree = ttk.Treeview(list_frame, columns=("Name", "Phone"), show="headings", height=15)
         self.tree.heading("Name", text="Name")
         self.tree.heading("Phone", text="Phone")
+        
+        # Scrolling near the end pages in more contacts
+        self.scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self.on_tree_scroll)
+        self.scrollbar.pack(side="right", fill="y")
         self.tree.pack(fill="both", expand=True)
         
         # Bind selection event
         self.tree.bind("<ButtonRelease-1>", self.load_selected_contact)
         
+        # Progress of imports and exports, and short status messages
+        status_frame = tk.Frame(main_frame, bg="#121212")
+        status_frame.grid(row=3, column=0, columnspan=2, sticky="ew", pady=(5, 0))
+        self.status_var = tk.StringVar()
+        tk.Label(status_frame, textvariable=self.status_var, bg="#121212", fg="#9e9e9e",
+                font=("Arial", 10), anchor="w").pack(side="left", fill="x", expand=True)
+        self.progress = ttk.Progressbar(status_frame, length=200, maximum=100)
+        self.progress.pack(side="right")
+        
         # Configure grid weights
         main_frame.grid_columnconfigure(0, weight=1)
         main_frame.grid_columnconfigure(1, weight=1)
@@ -95,10 +152,15 @@ class ContactBook:
             messagebox.showerror("Error", "Name is required!")
             return
         
-        self.contacts.append(contact)
-        self.update_contact_list()
+        contact_id = self.store.add(contact)
+        self.index.add(contact_id, contact)
+        if self.list_query:
+            self.update_contact_list(self.list_query)
+        elif self.exhausted:
+            # New ids are the highest, so the row belongs at the end
+            self.insert_row(contact_id, contact)
         self.clear_fields()
-        messagebox.showinfo("Success", "Contact added successfully!")
+        self.status_var.set(f"Added {contact['name']}")
     
     def update_contact(self):
         selected = self.tree.focus()
@@ -106,12 +168,11 @@ class ContactBook:
             messagebox.showerror("Error", "No contact selected!")
             return
         
-        index = int(self.tree.item(selected, "tags")[0])
-        for field in self.entries:
-            self.contacts[index][field] = self.entries[field].get()
-        
-        self.update_contact_list()
-        messagebox.showinfo("Success", "Contact updated successfully!")
+        contact = {field: self.entries[field].get() for field in self.entries}
+        self.store.update(int(selected), contact)
+        self.index.update(int(selected), contact)
+        self.tree.item(selected, values=(contact["name"], contact["phone"]))
+        self.status_var.set(f"Updated {contact['name']}")
     
     def delete_contact(self):
         selected = self.tree.focus()
@@ -120,24 +181,16 @@ class ContactBook:
             return
         
         if messagebox.askyesno("Confirm", "Delete this contact?"):
-            index = int(self.tree.item(selected, "tags")[0])
-            del self.contacts[index]
-            self.update_contact_list()
+            self.store.delete(int(selected))
+            self.index.remove(int(selected))
+            self.tree.delete(selected)
             self.clear_fields()
     
     def search_contact(self, event=None):
-        query = self.search_var.get().lower()
-        if not query:
-            self.update_contact_list()
-            return
-        
-        results = []
-        for i, contact in enumerate(self.contacts):
-            if (query in contact["name"].lower() or 
-                query in contact["phone"].lower()):
-                results.append((i, contact))
-        
-        self.update_contact_list(results if results else None)
+        query = self.search_var.get()
+        if query == self.list_query:
+            return  # e.g. a modifier key release
+        self.update_contact_list(query)
     
     def clear_search(self):
         self.search_var.set("")
@@ -146,8 +199,9 @@ class ContactBook:
     def load_selected_contact(self, event):
         selected = self.tree.focus()
         if selected:
-            index = int(self.tree.item(selected, "tags")[0])
-            contact = self.contacts[index]
+            contact = self.store.get(int(selected))
+            if contact is None:
+                return
             for field in self.entries:
                 self.entries[field].delete(0, tk.END)
                 self.entries[field].insert(0, contact[field])
@@ -156,16 +210,258 @@ class ContactBook:
         for entry in self.entries.values():
             entry.delete(0, tk.END)
     
-    def update_contact_list(self, contacts=None):
+    def update_contact_list(self, query=""):
+        # Restart the list from the first page; item ids are contact ids
+        if not self.root.winfo_exists():
+            return
         self.tree.delete(*self.tree.get_children())
-        display_list = contacts if contacts else enumerate(self.contacts)
+        self.list_query = query
+        self.last_id = 0
+        self.exhausted = False
+        self.results = self.search_index(query) if self.index_ready else None
+        self.result_pos = 0
+        self.load_more()
+    
+    def search_index(self, query):
+        # Substring matches, or typo-tolerant ranked matches when there are
+        # none (or fuzzy mode is on). No matches means an empty list.
+        results = None if self.fuzzy_var.get() else self.index.search(query)
+        if query.strip() and not results:
+            results = self.index.fuzzy(query)
+        return results
+    
+    def load_more(self):
+        self.loading_more = False
+        if self.exhausted or not self.root.winfo_exists():
+            return
+        if self.results is not None:
+            # Index hits are ids; fetch just the next page of rows
+            ids = self.results[self.result_pos:self.result_pos + self.page_size]
+            self.result_pos += len(ids)
+            for contact_id, contact in self.store.get_many(ids):
+                self.insert_row(contact_id, contact)
+            self.exhausted = self.result_pos >= len(self.results)
+            return
+        rows = self.store.page(self.last_id, self.page_size, self.list_query)
+        for contact_id, contact in rows:
+            self.insert_row(contact_id, contact)
+        self.exhausted = len(rows) < self.page_size
+    
+    def insert_row(self, contact_id, contact):
+        self.tree.insert("", "end", iid=str(contact_id),
+                         values=(contact["name"], contact["phone"]))
+        self.last_id = contact_id
+    
+    def on_tree_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        if float(last) > 0.9 and not self.exhausted and not self.loading_more:
+            self.loading_more = True
+            self.root.after_idle(self.load_more)
+    
+    def build_index(self):
+        # Index a few thousand contacts per tick so the window stays responsive.
+        # Contacts edited meanwhile are indexed directly; re-adding is harmless.
+        if not self.root.winfo_exists():
+            return  # closed: paging would reopen the store
+        deadline = time.perf_counter() + 0.015
+        while time.perf_counter() < deadline:
+            rows = self.store.page(self.index_last_id, 2000)
+            for contact_id, contact in rows:
+                self.index.add(contact_id, contact)
+            if rows:
+                self.index_last_id = rows[-1][0]
+            if len(rows) < 2000:
+                self.index_ready = True
+                self.index_building = False
+                return
+        self.root.after(1, self.build_index)
+    
+    def import_contacts(self):
+        if self.transfer.busy:
+            return
+        path = filedialog.askopenfilename(
+            parent=self.root, title="Import contacts",
+            filetypes=[("Contacts", "*.csv *.vcf *.vcard"), ("All files", "*.*")])
+        if path:
+            self.transfer_labels = ("Importing", "Import", self.imported)
+            self.transfer.start_import(path)
+            self.root.after(100, self.poll_transfer)
+    
+    def export_contacts(self):
+        if self.transfer.busy:
+            return
+        path = filedialog.asksaveasfilename(
+            parent=self.root, title="Export contacts", defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("vCard", "*.vcf")])
+        if path:
+            self.transfer_labels = ("Exporting", "Export", self.exported)
+            self.transfer.start_export(path)
+            self.root.after(100, self.poll_transfer)
+    
+    def find_duplicates(self):
+        if self.transfer.busy:
+            return
+        self.transfer_labels = ("Finding duplicates", "Duplicate search", self.show_duplicates)
+        self.status_var.set("Finding duplicates…")
+        self.transfer.start_dedupe()
+        self.root.after(100, self.poll_transfer)
+    
+    def poll_transfer(self):
+        if not self.root.winfo_exists():
+            return
+        # Checked first: once the thread has exited, its last message is queued
+        finished = not self.transfer.busy
+        running, action, on_done = self.transfer_labels
+        messages = self.transfer.poll()
+        progress = [message for message in messages if message[0] == "progress"]
+        if progress:
+            _, count, fraction = progress[-1]
+            self.progress["value"] = fraction * 100
+            self.status_var.set(f"{running}… {count:,} contacts")
+        for message in messages:
+            if message[0] == "done":
+                self.progress["value"] = 100
+                on_done(message[1])
+            elif message[0] == "error":
+                self.status_var.set("")
+                messagebox.showerror("Error", f"{action} failed: {message[1]}")
+        if action == "Import":
+            self.show_imported()
+        if not finished:
+            self.root.after(100, self.poll_transfer)
+    
+    def imported(self, count):
+        self.status_var.set(f"Imported {count:,} contacts")
+    
+    def exported(self, count):
+        self.status_var.set(f"Exported {count:,} contacts")
+    
+    def show_imported(self):
+        # Imported rows have the highest ids: index them in the background and,
+        # if the list had reached its end, page them in a chunk per tick
+        if not self.index_building:
+            self.index_building = True
+            self.root.after(1, self.build_index)
+        if self.exhausted and not self.list_query:
+            self.exhausted = False
+            self.load_more()
+    
+    def reindex(self):
+        # Start the search index over, e.g. after many contacts were removed
+        self.index = ContactIndex()
+        self.index_ready = False
+        self.index_last_id = 0
+        if not self.index_building:
+            self.index_building = True
+            self.root.after(1, self.build_index)
+    
+    def show_duplicates(self, groups):
+        # Review window: one expandable row per group of likely duplicates
+        if not groups:
+            self.status_var.set("No duplicates found")
+            return
+        self.status_var.set(f"Found {len(groups):,} groups of duplicates")
         
-        for i, contact in display_list:
-            self.tree.insert("", "end", 
-                            values=(contact["name"], contact["phone"]), 
-                            tags=(i,))
+        window = tk.Toplevel(self.root)
+        window.title("Review Duplicates")
+        window.geometry("650x450")
+        window.configure(bg="#121212")
+        
+        tree_frame = tk.Frame(window, bg="#1e1e1e")
+        tree_frame.pack(fill="both", expand=True, padx=10, pady=10)
+        tree = ttk.Treeview(tree_frame, columns=("Name", "Phone", "Email"), show="tree headings")
+        tree.heading("#0", text="Group")
+        tree.column("#0", width=110)
+        for column in ("Name", "Phone", "Email"):
+            tree.heading(column, text=column)
+            tree.column(column, width=160)
+        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        tree.pack(fill="both", expand=True)
+        
+        button_frame = tk.Frame(window, bg="#121212")
+        button_frame.pack(pady=(0, 10))
+        for i, (text, command) in enumerate([("Merge Selected", self.merge_selected),
+                                             ("Merge All", self.merge_all),
+                                             ("Close", window.destroy)]):
+            tk.Button(button_frame, text=text, width=14, font=self.text_font,
+                     command=command, bg="#2a2a2a", fg="white").grid(row=0, column=i, padx=5)
+        
+        # Group n has iid "n"; merged groups are dropped from dup_groups
+        self.dup_window = window
+        self.dup_tree = tree
+        self.dup_groups = dict(enumerate(groups))
+        self.dup_total = len(groups)
+        self.dup_shown = 0
+        self.root.after_idle(self.show_duplicate_chunk)
+    
+    def show_duplicate_chunk(self):
+        # Fill the review list a couple of hundred groups per tick
+        if not self.dup_window.winfo_exists():
+            return
+        stop = min(self.dup_shown + 200, self.dup_total)
+        numbers = [n for n in range(self.dup_shown, stop) if n in self.dup_groups]
+        contacts = dict(self.store.get_many(chain.from_iterable(
+            self.dup_groups[n] for n in numbers)))
+        for n in numbers:
+            group = self.dup_groups[n]
+            self.dup_tree.insert("", "end", iid=str(n), text=f"{len(group)} contacts", open=True)
+            for contact_id in group:
+                contact = contacts.get(contact_id)
+                if contact:
+                    self.dup_tree.insert(str(n), "end", values=(
+                        contact["name"], contact["phone"], contact["email"]))
+        self.dup_shown = stop
+        if stop < self.dup_total:
+            self.root.after(1, self.show_duplicate_chunk)
+    
+    def merge_selected(self):
+        numbers = set()
+        for item in self.dup_tree.selection():
+            numbers.add(int(self.dup_tree.parent(item) or item))
+        if not numbers:
+            messagebox.showerror("Error", "No group selected!", parent=self.dup_window)
+            return
+        self.merge_groups(sorted(numbers))
+        self.dup_tree.delete(*(str(n) for n in numbers if self.dup_tree.exists(str(n))))
+    
+    def merge_all(self):
+        if messagebox.askyesno("Confirm", f"Merge all {len(self.dup_groups):,} groups?",
+                               parent=self.dup_window):
+            self.merge_groups(sorted(self.dup_groups))
+            self.dup_window.destroy()
+    
+    def merge_groups(self, numbers):
+        # Each group collapses into its lowest id, keeping the fullest value
+        # of every field; all groups are written in one transaction
+        groups = [self.dup_groups.pop(n) for n in numbers]
+        contacts = dict(self.store.get_many(chain.from_iterable(groups)))
+        merges = []
+        for group in groups:
+            found = [contact_id for contact_id in group if contact_id in contacts]
+            if len(found) > 1:
+                merged = merge_contacts([contacts[contact_id] for contact_id in found])
+                merges.append((found[0], merged, found[1:]))
+        self.store.merge(merges)
+        
+        removed = sum(len(duplicate_ids) for _, _, duplicate_ids in merges)
+        if removed > 100:
+            self.reindex()  # cheaper than removing rows one at a time
+        else:
+            for keep_id, merged, duplicate_ids in merges:
+                self.index.update(keep_id, merged)
+                for contact_id in duplicate_ids:
+                    self.index.remove(contact_id)
+        self.update_contact_list(self.list_query)
+        self.status_var.set(f"Merged {len(merges):,} groups, removed {removed:,} duplicates")
+    
+    def on_close(self):
+        self.store.close()
+        self.root.destroy()
 
 if __name__ == "__main__":
+    tk_instrument.install_from_env()  # opt-in, via TK_INSTRUMENT
     root = tk.Tk()
-    app = ContactBook(root)
+    app = ContactBook(root, *sys.argv[1:2])
     root.mainloop()
\ No newline at end of file
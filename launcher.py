@@ -0,0 +1,132 @@
+import time
+
+START = time.perf_counter()  # before tkinter, so cold start includes it
+
+import argparse
+import importlib
+import sys
+import tkinter as tk
+
+import tk_instrument
+from tk_shared import font
+
+# (button label, module, app class); modules are imported on first open
+APPS = [
+    ("🔢 Calculator", "calculator", "ErrorFreeCalculator"),
+    ("📇 Contacts", "contactbook", "ContactBook"),
+    ("✅ To-Do List", "todolist", "UltimateTodoApp"),
+    ("🔒 Passwords", "passwordgenerator", "PasswordGenerator"),
+    ("🎮 Rock Paper Scissors", "rockpaperscissor", "VisualRPSGame"),
+]
+
+
+class Launcher:
+    # One Tk root for the whole suite: every app opens in its own Toplevel
+    # on demand, reusing this interpreter, its fonts and ttk styles, so the
+    # startup cost is paid once instead of once per app
+    def __init__(self, root):
+        self.root = root
+        self.root.title("App Suite")
+        self.root.configure(bg="#121212")
+        self.root.resizable(False, False)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        self.windows = {}  # module -> (Toplevel, app) of open apps
+        self.timings = {}  # module -> (import seconds, open seconds)
+        self.cold_start = 0.0  # process start to launcher laid out, seconds
+        self.status_var = tk.StringVar()
+
+        tk.Label(
+            self.root, text="APP SUITE", font=font(18, "bold"),
+            bg="#121212", fg="white"
+        ).pack(pady=(15, 10), padx=40)
+
+        for label, module, class_name in APPS:
+            tk.Button(
+                self.root, text=label, font=font(12), bg="#2a2a2a", fg="white",
+                command=lambda m=module, c=class_name: self.open_app(m, c)
+            ).pack(fill="x", padx=40, pady=4)
+
+        tk.Label(
+            self.root, textvariable=self.status_var, font=font(9),
+            bg="#121212", fg="#aaaaaa", justify="left"
+        ).pack(pady=(10, 15))
+
+    def open_app(self, module_name, class_name):
+        window, _ = self.windows.get(module_name, (None, None))
+        if window is not None and window.winfo_exists():
+            window.deiconify()
+            window.lift()
+            window.focus_force()
+            return window
+
+        start = time.perf_counter()
+        first = module_name not in sys.modules
+        module = importlib.import_module(module_name)
+        imported = time.perf_counter()
+        window = tk.Toplevel(self.root)
+        app = getattr(module, class_name)(window)
+        window.update_idletasks()  # laid out and ready to draw
+        done = time.perf_counter()
+
+        self.windows[module_name] = (window, app)
+        self.timings[module_name] = (imported - start, done - imported)
+        note = "first open" if first else "reopen"
+        self.status_var.set(f"{module_name}: import {(imported - start) * 1000:.0f} ms, "
+                            f"window {(done - imported) * 1000:.0f} ms ({note})")
+        return window
+
+    def report(self):
+        lines = [f"cold start: {self.cold_start * 1000:.0f} ms"]
+        for module_name, (imported, opened) in self.timings.items():
+            lines.append(f"{module_name:<20} import {imported * 1000:>6.1f} ms  "
+                         f"window {opened * 1000:>6.1f} ms")
+        return "\n".join(lines)
+
+    def close_apps(self):
+        # Let each app flush its stores the way its own close button would
+        for window, app in self.windows.values():
+            if window.winfo_exists():
+                if hasattr(app, "on_close"):
+                    app.on_close()
+                else:
+                    window.destroy()
+        self.windows.clear()
+
+    def on_close(self):
+        self.close_apps()
+        self.root.destroy()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Open the app suite in one window.")
+    parser.add_argument("--open", action="append", default=[], metavar="MODULE",
+                        choices=[module for _, module, _ in APPS], help="open an app at start")
+    parser.add_argument("--timings", action="store_true",
+                        help="open every app once, print start-up timings and exit")
+    args = parser.parse_args(argv)
+
+    tk_instrument.install_from_env()  # opt-in, via TK_INSTRUMENT
+    root = tk.Tk()
+    launcher = Launcher(root)
+    root.update_idletasks()
+    launcher.cold_start = time.perf_counter() - START
+
+    classes = {module: class_name for _, module, class_name in APPS}
+    for module in args.open:
+        launcher.open_app(module, classes[module])
+
+    if args.timings:
+        for module, class_name in classes.items():
+            launcher.open_app(module, class_name)
+        launcher.close_apps()
+        print(launcher.report())
+        root.destroy()
+        return
+
+    launcher.status_var.set(f"Ready in {launcher.cold_start * 1000:.0f} ms")
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
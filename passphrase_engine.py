@@ -0,0 +1,186 @@
+import argparse
+import hashlib
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from password_engine import DEFAULT_BATCH, RandomSource, generate_to, open_private
+
+MAGIC = b"WLS1"
+HEADER = struct.Struct("<4sI")  # magic, word count
+OFFSET = struct.Struct("<I")
+
+# Compiled copies of text wordlists. The lists themselves may live in
+# read-only places such as /usr/share/dict, so nothing is written there.
+CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+                         "passphrase")
+
+
+def compile_wordlist(source, target):
+    # Text wordlist -> binary file: header, (count + 1) little-endian u32
+    # offsets, then the UTF-8 words back to back. Lines may be plain words
+    # or diceware style "11111<tab>word" (the last field is the word).
+    # Duplicates are dropped so every word really is one choice in count.
+    seen = set()
+    offsets = array("I", [0])
+    data = bytearray()
+    with open(source, encoding="utf-8") as f:  # a mangled word is not a real choice
+        for line in f:
+            fields = line.split()
+            if not fields:
+                continue
+            word = fields[-1].encode("utf-8")
+            if word not in seen:
+                seen.add(word)
+                data += word
+                offsets.append(len(data))
+    if len(offsets) < 3:
+        raise ValueError(f"{source} has fewer than two distinct words")
+    if sys.byteorder != "little":
+        offsets.byteswap()
+
+    tmp_path = target + ".tmp"
+    try:
+        with open(tmp_path, "wb") as out:
+            out.write(HEADER.pack(MAGIC, len(offsets) - 1))
+            out.write(offsets.tobytes())
+            out.write(data)
+        os.replace(tmp_path, target)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return len(offsets) - 1
+
+
+def compiled_path(path, cache_dir=None):
+    # A compiled list is used as is; a text list is compiled once into
+    # cache_dir under a name keyed on its absolute path and mtime, so an
+    # edited list gets a fresh copy
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) == MAGIC:
+            return path
+    source = os.path.abspath(path)
+    key = f"{source}\0{os.stat(source).st_mtime_ns}".encode("utf-8", "surrogateescape")
+    target = os.path.join(cache_dir or CACHE_DIR, f"{os.path.basename(source)}-"
+                          f"{hashlib.sha256(key).hexdigest()[:16]}.idx")
+    if not os.path.exists(target):
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        compile_wordlist(source, target)
+    return target
+
+
+class WordList:
+    # Memory-mapped compiled wordlist: word(i) reads two offsets and slices,
+    # so opening costs nothing per word and picking any word is O(1)
+    def __init__(self, path):
+        self.path = compiled_path(path)
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count = HEADER.unpack_from(self._map)
+        self._offsets = HEADER.size
+        self._words = HEADER.size + OFFSET.size * (self.count + 1)
+
+    def __len__(self):
+        return self.count
+
+    def word_bytes(self, i):
+        start, = OFFSET.unpack_from(self._map, self._offsets + OFFSET.size * i)
+        end, = OFFSET.unpack_from(self._map, self._offsets + OFFSET.size * (i + 1))
+        return self._map[self._words + start:self._words + end]
+
+    def word(self, i):
+        return self.word_bytes(i).decode("utf-8")
+
+    def close(self):
+        self._map.close()
+
+
+class PassphraseEngine:
+    # Diceware-style passphrases: words picked uniformly with the OS CSPRNG
+    def __init__(self, wordlist, words=6, separator=" ", capitalize=False):
+        if words < 1:
+            raise ValueError("Use at least one word")
+        self.wordlist = wordlist
+        self.words = words
+        self.separator = separator.encode("utf-8")
+        self.capitalize = capitalize
+        self.random = RandomSource()
+
+    @property
+    def entropy_bits(self):
+        return self.words * math.log2(len(self.wordlist))
+
+    def generate_one_bytes(self):
+        below, pick, size = self.random.below, self.wordlist.word_bytes, len(self.wordlist)
+        words = [pick(below(size)) for _ in range(self.words)]
+        if self.capitalize:
+            words = [word.capitalize() for word in words]
+        return self.separator.join(words)
+
+    def generate(self, count=1):
+        return [self.generate_one_bytes().decode("utf-8") for _ in range(count)]
+
+    def generate_bytes(self, count):
+        # Same output format as PasswordEngine.generate_bytes
+        if count <= 0:
+            return b""
+        return b"\n".join([self.generate_one_bytes() for _ in range(count)]) + b"\n"
+
+
+class PassphrasePolicy:
+    # Counterpart of PasswordPolicy for generate_to: only the wordlist path
+    # is pickled to pool processes, each of which maps the list itself
+    def __init__(self, wordlist, words=6, separator=" ", capitalize=False):
+        self.wordlist = wordlist
+        self.words = words
+        self.separator = separator
+        self.capitalize = capitalize
+
+    def compile(self):
+        return PassphraseEngine(WordList(self.wordlist), self.words, self.separator,
+                                self.capitalize)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate diceware-style passphrases in bulk from the OS cryptographic RNG.")
+    parser.add_argument("wordlist", help="text wordlist (compiled into ~/.cache/passphrase on "
+                                         "first use) or a compiled list")
+    parser.add_argument("-n", "--count", type=int, default=1, help="passphrases to generate")
+    parser.add_argument("-w", "--words", type=int, default=6, help="words per passphrase")
+    parser.add_argument("-s", "--separator", default=" ", help="between words (default: space)")
+    parser.add_argument("--capitalize", action="store_true", help="capitalize every word")
+    parser.add_argument("-o", "--output", default="-", help="file (default: stdout)")
+    parser.add_argument("-j", "--processes", type=int, default=1,
+                        help="worker processes (0: one per CPU)")
+    parser.add_argument("--batch", type=int, default=DEFAULT_BATCH,
+                        help="passphrases per work item")
+    args = parser.parse_args(argv)
+    if args.count < 0 or args.batch < 1:
+        parser.error("count and batch must be positive")
+    policy = PassphrasePolicy(args.wordlist, args.words, args.separator, args.capitalize)
+    try:
+        engine = policy.compile()
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    print(f"{len(engine.wordlist)} words, {engine.entropy_bits:.1f} bits per passphrase",
+          file=sys.stderr)
+
+    out = sys.stdout.buffer if args.output == "-" else open_private(args.output)
+    try:
+        count, seconds = generate_to(out, policy, args.count,
+                                     args.processes or os.cpu_count(), args.batch)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+
+    rate = count / seconds if seconds else 0.0
+    print(f"{count} passphrases in {seconds:.2f}s ({rate:,.0f} passphrases/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
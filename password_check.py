@@ -0,0 +1,257 @@
+import argparse
+import hashlib
+import heapq
+import math
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import time
+
+RECORD = 20  # one raw SHA-1 digest per record
+BLOOM_HEADER = struct.Struct("<QQ")  # bit count, hash count
+DEFAULT_RUN_RECORDS = 1 << 21  # digests sorted in memory at a time (~130 MB)
+
+STRENGTH_LABELS = ((28, "Very weak"), (36, "Weak"), (60, "Fair"), (128, "Strong"))
+
+
+def sha1(password):
+    return hashlib.sha1(password.encode("utf-8")).digest()
+
+
+def estimate_entropy(password):
+    # Bits of entropy if each character were drawn from the classes the
+    # password uses; a character repeating or continuing a run from the one
+    # before it ("aaa", "abc", "321") is only counted as one bit
+    if not password:
+        return 0.0
+    pool = 0
+    if any(ch.islower() for ch in password):
+        pool += 26
+    if any(ch.isupper() for ch in password):
+        pool += 26
+    if any(ch.isdigit() for ch in password):
+        pool += 10
+    if any(not ch.isalnum() for ch in password):
+        pool += 33
+    per_char = math.log2(max(pool, 2))
+    bits = per_char
+    for previous, ch in zip(password, password[1:]):
+        bits += 1.0 if abs(ord(ch) - ord(previous)) <= 1 else per_char
+    return bits
+
+
+def strength(bits):
+    for limit, label in STRENGTH_LABELS:
+        if bits < limit:
+            return label
+    return "Very strong"
+
+
+class BreachIndex:
+    # Sorted 20-byte SHA-1 digests in a memory-mapped file. A lookup is a
+    # binary search touching about log2(n) records, so only those pages are
+    # ever read and resident memory stays near zero. If a Bloom filter
+    # sidecar (<path>.bloom) exists, it answers most misses first.
+    def __init__(self, path):
+        self.path = path
+        self.count = os.path.getsize(path) // RECORD
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.count else b""
+        self.bloom = None
+        if os.path.exists(path + ".bloom"):
+            self.bloom = BloomFilter.open(path + ".bloom")
+
+    def contains_digest(self, digest):
+        if self.bloom is not None and digest not in self.bloom:
+            return False
+        data = self._map
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            record = data[mid * RECORD:mid * RECORD + RECORD]
+            if record < digest:
+                lo = mid + 1
+            elif record > digest:
+                hi = mid
+            else:
+                return True
+        return False
+
+    def is_breached(self, password):
+        return self.contains_digest(sha1(password))
+
+    def close(self):
+        if self.bloom is not None:
+            self.bloom.close()
+        if self.count:
+            self._map.close()
+        self._file.close()
+
+
+class BloomFilter:
+    # Bit array over a memory-mapped file. SHA-1 digests are already uniform,
+    # so the k bit positions come straight from the digest (double hashing
+    # on two 8-byte slices) instead of hashing again.
+    def __init__(self, bits, hashes, data):
+        self.bits = bits
+        self.hashes = hashes
+        self.data = data
+
+    @classmethod
+    def create(cls, path, items, bits_per_item=10):
+        bits = max(64, items * bits_per_item)
+        hashes = max(1, round(bits_per_item * math.log(2)))
+        with open(path, "wb") as f:
+            f.write(BLOOM_HEADER.pack(bits, hashes))
+            f.truncate(BLOOM_HEADER.size + (bits + 7) // 8)
+        return cls.open(path, writable=True)
+
+    @classmethod
+    def open(cls, path, writable=False):
+        with open(path, "r+b" if writable else "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+        bits, hashes = BLOOM_HEADER.unpack_from(data)
+        return cls(bits, hashes, data)
+
+    def _positions(self, digest):
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:16], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.bits
+
+    def add(self, digest):
+        data = self.data
+        for bit in self._positions(digest):
+            data[BLOOM_HEADER.size + (bit >> 3)] |= 1 << (bit & 7)
+
+    def __contains__(self, digest):
+        data = self.data
+        return all(data[BLOOM_HEADER.size + (bit >> 3)] >> (bit & 7) & 1
+                   for bit in self._positions(digest))
+
+    def close(self):
+        self.data.close()
+
+
+def iter_digests(lines, plain=False):
+    # Digests from "HEX" or "HEX:count" lines (the usual breach corpus
+    # format), or from plaintext passwords with plain=True; junk is skipped
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if plain:
+            if line:
+                yield sha1(line)
+            continue
+        hex_digest = line.split(":", 1)[0].strip()
+        if len(hex_digest) == 2 * RECORD:
+            try:
+                yield bytes.fromhex(hex_digest)
+            except ValueError:
+                pass
+
+
+def _iter_run(f):
+    while record := f.read(RECORD):
+        yield record
+
+
+def build_index(digests, path, run_records=DEFAULT_RUN_RECORDS, bloom_bits_per_item=0):
+    # External sort: sort runs of run_records digests in memory, spill each
+    # to a temporary file, then merge the runs into path, dropping
+    # duplicates. Memory use is bounded by one run. Returns the record count.
+    runs = []
+    tmp_dir = os.path.dirname(os.path.abspath(path))
+    try:
+        run = []
+        for digest in digests:
+            run.append(digest)
+            if len(run) >= run_records:
+                runs.append(_spill(sorted(run), tmp_dir))
+                run = []
+        run.sort()
+        sources = [_iter_run(f) for f in runs] + [iter(run)]
+
+        count = 0
+        previous = None
+        tmp_path = path + ".tmp"
+        try:
+            with open(tmp_path, "wb", buffering=1 << 20) as out:
+                for digest in heapq.merge(*sources):
+                    if digest != previous:
+                        out.write(digest)
+                        previous = digest
+                        count += 1
+            os.replace(tmp_path, path)
+        except BaseException:
+            # Leave no half-written index behind, and keep the old one
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    finally:
+        for f in runs:
+            f.close()
+
+    if bloom_bits_per_item:
+        bloom = BloomFilter.create(path + ".bloom", count, bloom_bits_per_item)
+        with open(path, "rb") as f:
+            for digest in _iter_run(f):
+                bloom.add(digest)
+        bloom.close()
+    elif os.path.exists(path + ".bloom"):
+        os.remove(path + ".bloom")  # would describe an older index
+    return count
+
+
+def _spill(run, tmp_dir):
+    f = tempfile.TemporaryFile(dir=tmp_dir)
+    f.write(b"".join(run))
+    f.seek(0)
+    return f
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Build or query an offline breached-password index.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="build an index from a hash or password list")
+    build.add_argument("source", help='text file of SHA-1 hex digests ("HEX" or "HEX:count")')
+    build.add_argument("index", help="index file to write")
+    build.add_argument("--plain", action="store_true", help="source lists plaintext passwords")
+    build.add_argument("--bloom", type=int, default=0, metavar="BITS",
+                       help="also write a Bloom filter with BITS bits per password")
+    build.add_argument("--run-records", type=int, default=DEFAULT_RUN_RECORDS,
+                       help="digests sorted in memory at a time")
+    check = commands.add_parser("check", help="check passwords (default: one per stdin line)")
+    check.add_argument("index")
+    check.add_argument("passwords", nargs="*")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        start = time.perf_counter()
+        # Hex lists skip junk lines anyway, but a plaintext password that does
+        # not decode would be indexed as a different password
+        errors = "strict" if args.plain else "replace"
+        try:
+            with open(args.source, encoding="utf-8", errors=errors) as source:
+                count = build_index(iter_digests(source, args.plain), args.index,
+                                    args.run_records, args.bloom)
+        except UnicodeDecodeError as e:
+            parser.error(f"{args.source} is not valid UTF-8 ({e.reason}); nothing was written")
+        print(f"{count} hashes indexed in {time.perf_counter() - start:.2f}s", file=sys.stderr)
+        return
+
+    index = BreachIndex(args.index)
+    try:
+        passwords = args.passwords or (line.rstrip("\r\n") for line in sys.stdin)
+        for password in passwords:
+            bits = estimate_entropy(password)
+            status = "BREACHED" if index.is_breached(password) else "ok"
+            print(f"{status}\t{strength(bits)} ({bits:.0f} bits)\t{password}")
+    finally:
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+import argparse
+import multiprocessing
+import os
+import secrets
+import string
+import sys
+import time
+
+UPPERCASE = string.ascii_uppercase
+LOWERCASE = string.ascii_lowercase
+DIGITS = string.digits
+SYMBOLS = "!@#$%^&*()_+-=[]{}|;:,.<>?"
+AMBIGUOUS = "Il1|O0o"  # easily confused when read or typed
+
+DEFAULT_BATCH = 100000  # passwords per work item handed to a process
+
+
+def build_pool(upper=True, lower=True, digits=True, symbols=True):
+    pool = ((UPPERCASE if upper else "") + (LOWERCASE if lower else "")
+            + (DIGITS if digits else "") + (SYMBOLS if symbols else ""))
+    if not pool:
+        raise ValueError("Select at least one character type!")
+    return pool
+
+
+class PasswordEngine:
+    # Passwords drawn from the OS CSPRNG (os.urandom) a large block at a time.
+    # Random bytes are mapped onto the pool with a 256-entry translate table.
+    # Bytes at or above the largest multiple of len(pool) are deleted in the
+    # same translate call (rejection sampling), so every character is exactly
+    # equally likely: no modulo bias, and no Python-level loop per character.
+    def __init__(self, pool, length=12, block_size=1 << 16):
+        pool = "".join(dict.fromkeys(pool))  # drop repeated characters
+        if not pool:
+            raise ValueError("Character pool is empty")
+        if not pool.isascii():
+            raise ValueError("Character pool must be ASCII")
+        if length < 1:
+            raise ValueError("Length must be at least 1")
+        self.pool = pool
+        self.length = length
+        self.block_size = block_size
+
+        size = len(pool)
+        limit = 256 - 256 % size
+        encoded = pool.encode("ascii")
+        self.table = bytes(encoded[byte % size] for byte in range(256))
+        self.rejected = bytes(range(limit, 256))
+        self._buffer = b""
+
+    def random_chars(self, count):
+        # count uniformly random pool characters, as ASCII bytes
+        chunks = [self._buffer]
+        available = len(self._buffer)
+        while available < count:
+            chunk = os.urandom(max(self.block_size, count - available)).translate(
+                self.table, self.rejected)
+            chunks.append(chunk)
+            available += len(chunk)
+        data = b"".join(chunks)
+        self._buffer = data[count:]
+        return data[:count]
+
+    def generate_bytes(self, count):
+        # count passwords, one per line, as bytes ready to write out
+        if count <= 0:
+            return b""
+        length = self.length
+        chars = self.random_chars(count * length)
+        return b"\n".join([chars[i:i + length] for i in range(0, len(chars), length)]) + b"\n"
+
+    def generate(self, count=1):
+        return self.generate_bytes(count).decode("ascii").split("\n")[:count]
+
+
+class RandomSource:
+    # Uniform random integers below n from buffered os.urandom bytes, with
+    # rejection sampling (no modulo bias)
+    def __init__(self, block_size=4096):
+        self.block_size = block_size
+        self.data = b""
+        self.pos = 0
+        self.limits = {}
+
+    def below(self, n):
+        if n > 256:
+            return self._below_large(n)
+        limit = self.limits.get(n)
+        if limit is None:
+            limit = self.limits[n] = 256 - 256 % n
+        while True:
+            if self.pos >= len(self.data):
+                self.data = os.urandom(self.block_size)
+                self.pos = 0
+            byte = self.data[self.pos]
+            self.pos += 1
+            if byte < limit:
+                return byte % n
+
+    def _below_large(self, n):
+        # Same scheme on 4 bytes at a time, e.g. for wordlist indexes
+        if n > 1 << 32:
+            return secrets.randbelow(n)
+        limit = self.limits.get(n)
+        if limit is None:
+            limit = self.limits[n] = (1 << 32) - (1 << 32) % n
+        while True:
+            if self.pos + 4 > len(self.data):
+                self.data = os.urandom(self.block_size)
+                self.pos = 0
+            value = int.from_bytes(self.data[self.pos:self.pos + 4], "little")
+            self.pos += 4
+            if value < limit:
+                return value % n
+
+    def sample(self, chars, k):
+        # k distinct items of chars (a list, partially shuffled in place)
+        for i in range(k):
+            j = i + self.below(len(chars) - i)
+            chars[i], chars[j] = chars[j], chars[i]
+        return chars[:k]
+
+    def shuffle(self, items):
+        # Fisher-Yates
+        for i in range(len(items) - 1, 0, -1):
+            j = self.below(i + 1)
+            items[i], items[j] = items[j], items[i]
+
+
+class PasswordPolicy:
+    # Declarative password rules: a length or length range, which character
+    # classes may appear, how many of each must appear, characters to leave
+    # out, and whether a character may be used more than once. compile()
+    # checks the rules once and returns a sampler whose generate() output
+    # always satisfies them, without regenerating.
+    def __init__(self, length=12, max_length=None, upper=True, lower=True, digits=True,
+                 symbols=True, min_upper=0, min_lower=0, min_digits=0, min_symbols=0,
+                 exclude="", exclude_ambiguous=False, no_repeats=False):
+        self.length = length
+        self.max_length = length if max_length is None else max_length
+        self.enabled = {"upper": upper, "lower": lower, "digits": digits, "symbols": symbols}
+        self.minimums = {"upper": min_upper, "lower": min_lower, "digits": min_digits,
+                         "symbols": min_symbols}
+        self.exclude = exclude + (AMBIGUOUS if exclude_ambiguous else "")
+        self.no_repeats = no_repeats
+
+    def classes(self):
+        # (characters, minimum) for every enabled class, exclusions applied
+        sources = {"upper": UPPERCASE, "lower": LOWERCASE, "digits": DIGITS, "symbols": SYMBOLS}
+        classes = []
+        for name, chars in sources.items():
+            minimum = self.minimums[name]
+            if not self.enabled[name]:
+                if minimum:
+                    raise ValueError(f"Cannot require {name} without allowing them")
+                continue
+            chars = "".join(ch for ch in chars if ch not in self.exclude)
+            if minimum and not chars:
+                raise ValueError(f"Every {name} character is excluded")
+            if self.no_repeats and minimum > len(chars):
+                raise ValueError(f"Only {len(chars)} distinct {name} characters are available")
+            if chars:
+                classes.append((chars, minimum))
+        return classes
+
+    def compile(self):
+        classes = self.classes()
+        if not classes:
+            raise ValueError("Select at least one character type!")
+        pool = "".join(chars for chars, _ in classes)
+        required = sum(minimum for _, minimum in classes)
+        if not 1 <= self.length <= self.max_length:
+            raise ValueError("Length range is empty")
+        if required > self.max_length:
+            raise ValueError(f"The minimums need at least {required} characters")
+        if self.no_repeats and max(self.length, required) > len(pool):
+            raise ValueError(f"Only {len(pool)} distinct characters are available")
+        if not required and not self.no_repeats and self.length == self.max_length:
+            return PasswordEngine(pool, self.length)  # plain uniform passwords
+        return PolicySampler(classes, max(self.length, required),
+                             min(self.max_length, len(pool)) if self.no_repeats else self.max_length,
+                             self.no_repeats)
+
+
+class PolicySampler:
+    # Builds each password in one pass: draw the required characters of
+    # every class, fill up to the chosen length from the whole pool, then
+    # shuffle so the required characters can land anywhere. With no_repeats
+    # the draws are without replacement.
+    def __init__(self, classes, min_length, max_length, no_repeats):
+        self.classes = [(list(chars), minimum) for chars, minimum in classes]
+        self.pool = [ch for chars, _ in classes for ch in chars]
+        self.min_length = min_length
+        self.max_length = max_length
+        self.no_repeats = no_repeats
+        self.random = RandomSource()
+
+    def generate_one(self):
+        below = self.random.below
+        length = self.min_length + below(self.max_length - self.min_length + 1)
+        chars = []
+        if self.no_repeats:
+            for class_chars, minimum in self.classes:
+                chars += self.random.sample(class_chars, minimum)
+            used = set(chars)
+            rest = [ch for ch in self.pool if ch not in used]
+            chars += self.random.sample(rest, length - len(chars))
+        else:
+            for class_chars, minimum in self.classes:
+                chars += [class_chars[below(len(class_chars))] for _ in range(minimum)]
+            pool = self.pool
+            chars += [pool[below(len(pool))] for _ in range(length - len(chars))]
+        self.random.shuffle(chars)
+        return "".join(chars)
+
+    def generate(self, count=1):
+        return [self.generate_one() for _ in range(count)]
+
+    def generate_bytes(self, count):
+        # Same output format as PasswordEngine.generate_bytes
+        if count <= 0:
+            return b""
+        return ("\n".join(self.generate(count)) + "\n").encode("ascii")
+
+
+# Each pool process compiles its own sampler after it starts, so no random
+# buffer is ever shared between processes
+_worker_engine = None
+
+
+def _init_worker(policy):
+    global _worker_engine
+    _worker_engine = policy.compile()
+
+
+def _worker_block(count):
+    return _worker_engine.generate_bytes(count)
+
+
+def _batches(count, batch):
+    while count > 0:
+        yield min(batch, count)
+        count -= batch
+
+
+def generate_to(out, policy, count, processes=1, batch=DEFAULT_BATCH):
+    # Stream count passwords meeting policy to the binary file out, one per
+    # line, holding at most a batch per process in memory.
+    # Returns (count, seconds).
+    start = time.perf_counter()
+    if processes == 1:
+        engine = policy.compile()
+        for size in _batches(count, batch):
+            out.write(engine.generate_bytes(size))
+    else:
+        with multiprocessing.Pool(processes, _init_worker, (policy,)) as workers:
+            for block in workers.imap_unordered(_worker_block, _batches(count, batch)):
+                out.write(block)
+    out.flush()
+    return count, time.perf_counter() - start
+
+
+def open_private(path):
+    # Credentials file readable by the owner only
+    return os.fdopen(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate passwords in bulk from the OS cryptographic RNG.")
+    parser.add_argument("-n", "--count", type=int, default=1, help="passwords to generate")
+    parser.add_argument("-l", "--length", type=int, default=12,
+                        help="characters per password (the minimum, with --max-length)")
+    parser.add_argument("--max-length", type=int,
+                        help="pick each password's length at random up to this")
+    parser.add_argument("-o", "--output", default="-", help="file (default: stdout)")
+    parser.add_argument("-j", "--processes", type=int, default=1,
+                        help="worker processes (0: one per CPU)")
+    parser.add_argument("--batch", type=int, default=DEFAULT_BATCH,
+                        help="passwords per work item")
+    for name in ("upper", "lower", "digits", "symbols"):
+        parser.add_argument(f"--no-{name}", dest=name, action="store_false",
+                            help=f"leave out {name}")
+        parser.add_argument(f"--min-{name}", type=int, default=0, metavar="N",
+                            help=f"at least N {name} per password")
+    parser.add_argument("--exclude", default="", metavar="CHARS", help="characters to leave out")
+    parser.add_argument("--exclude-ambiguous", action="store_true",
+                        help=f"leave out {AMBIGUOUS}")
+    parser.add_argument("--no-repeats", action="store_true",
+                        help="use each character at most once per password")
+    args = parser.parse_args(argv)
+    if args.count < 0 or args.batch < 1:
+        parser.error("count and batch must be positive")
+    policy = PasswordPolicy(args.length, args.max_length, args.upper, args.lower, args.digits,
+                            args.symbols, args.min_upper, args.min_lower, args.min_digits,
+                            args.min_symbols, args.exclude, args.exclude_ambiguous,
+                            args.no_repeats)
+    try:
+        policy.compile()
+    except ValueError as e:
+        parser.error(str(e))
+
+    out = sys.stdout.buffer if args.output == "-" else open_private(args.output)
+    try:
+        count, seconds = generate_to(out, policy, args.count,
+                                     args.processes or os.cpu_count(), args.batch)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+
+    rate = count / seconds if seconds else 0.0
+    print(f"{count} passwords in {seconds:.2f}s ({rate:,.0f} passwords/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
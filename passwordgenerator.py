@@ -1,13 +1,25 @@
+import os
 import tkinter as tk
 from tkinter import messagebox
-import random
-import string
+from password_engine import PasswordPolicy
+from password_check import BreachIndex, estimate_entropy, strength
+from passphrase_engine import PassphraseEngine, WordList
+import tk_instrument
+
+# Local breached-password index built with "password_check.py build"
+BREACH_INDEX = os.environ.get(
+    "BREACH_INDEX", os.path.join(os.path.dirname(os.path.abspath(__file__)), "breached.idx"))
+
+# Wordlist for passphrase mode, compiled into passphrase_engine.CACHE_DIR on first use
+WORDLISTS = [os.environ.get("WORDLIST", ""),
+             os.path.join(os.path.dirname(os.path.abspath(__file__)), "words.txt"),
+             "/usr/share/dict/words"]
 
 class PasswordGenerator:
     def __init__(self, root):
         self.root = root
         self.root.title("🔒 Secure Password Generator")
-        self.root.geometry("400x400")
+        self.root.geometry("400x540")
         self.root.resizable(False, False)
         self.root.configure(bg="#121212")
 
@@ -22,6 +34,18 @@ class PasswordGenerator:
         self.lowercase_var = tk.BooleanVar(value=True)
         self.digits_var = tk.BooleanVar(value=True)
         self.symbols_var = tk.BooleanVar(value=True)
+        self.require_each_var = tk.BooleanVar(value=True)
+        self.no_ambiguous_var = tk.BooleanVar(value=False)
+        self.no_repeats_var = tk.BooleanVar(value=False)
+        self.mode_var = tk.StringVar(value="characters")
+        self.words_var = tk.IntVar(value=6)
+        self.check_var = tk.StringVar()
+        self.wordlist = None
+        self.generated_bits = None  # (passphrase, exact entropy) of the last one
+        self.breach_index = BreachIndex(BREACH_INDEX) if os.path.exists(BREACH_INDEX) else None
+
+        # Typed or pasted passwords are checked as well as generated ones
+        self.password_var.trace_add("write", self.check_password)
 
         # Build UI
         self.create_widgets()
@@ -38,16 +62,34 @@ class PasswordGenerator:
         length_frame.pack(fill="x", padx=20, pady=5)
 
         tk.Label(
-            length_frame, text="Length (8-32):",
+            length_frame, text="Length (4-128):",
             font=self.text_font, bg="#1e1e1e", fg="white"
         ).pack(side="left", padx=5)
 
         tk.Scale(
-            length_frame, from_=8, to=32, orient="horizontal",
+            length_frame, from_=4, to=128, orient="horizontal",
             variable=self.length_var, bg="#1e1e1e", fg="white",
             highlightthickness=0, troughcolor="#2a2a2a"
         ).pack(side="left", expand=True, fill="x", padx=5)
 
+        # Mode: random characters or diceware-style words
+        mode_frame = tk.Frame(self.root, bg="#1e1e1e")
+        mode_frame.pack(fill="x", padx=20, pady=5)
+
+        for text, value in (("Characters", "characters"), ("Passphrase", "passphrase")):
+            tk.Radiobutton(
+                mode_frame, text=text, variable=self.mode_var, value=value,
+                bg="#1e1e1e", fg="white", selectcolor="#121212"
+            ).pack(side="left", padx=5)
+
+        tk.Spinbox(
+            mode_frame, from_=3, to=20, textvariable=self.words_var, width=3
+        ).pack(side="right", padx=5)
+
+        tk.Label(
+            mode_frame, text="Words:", bg="#1e1e1e", fg="white"
+        ).pack(side="right")
+
         # Character Options
         options_frame = tk.Frame(self.root, bg="#1e1e1e", padx=10, pady=10)
         options_frame.pack(fill="x", padx=20, pady=10)
@@ -72,19 +114,42 @@ class PasswordGenerator:
             bg="#1e1e1e", fg="white", selectcolor="#121212"
         ).grid(row=1, column=1, sticky="w", pady=2)
 
+        # Policy options: guaranteed coverage, look-alikes, repeats
+        tk.Checkbutton(
+            options_frame, text="At least one of each", variable=self.require_each_var,
+            bg="#1e1e1e", fg="white", selectcolor="#121212"
+        ).grid(row=2, column=0, sticky="w", pady=2)
+
+        tk.Checkbutton(
+            options_frame, text="No repeats", variable=self.no_repeats_var,
+            bg="#1e1e1e", fg="white", selectcolor="#121212"
+        ).grid(row=2, column=1, sticky="w", pady=2)
+
+        tk.Checkbutton(
+            options_frame, text="No look-alikes (Il1|O0o)", variable=self.no_ambiguous_var,
+            bg="#1e1e1e", fg="white", selectcolor="#121212"
+        ).grid(row=3, column=0, columnspan=2, sticky="w", pady=2)
+
         # Generate Button
         tk.Button(
             self.root, text="GENERATE", command=self.generate_password,
             font=self.text_font, bg="#2a2a2a", fg="white", pady=5
         ).pack(pady=10, fill="x", padx=40)
 
-        # Password Display
+        # Password Display (editable, to check a password of your own)
         tk.Entry(
             self.root, textvariable=self.password_var, font=("Arial", 14),
-            state="readonly", readonlybackground="#1e1e1e", fg="#4CAF50",
+            bg="#1e1e1e", fg="#4CAF50", insertbackground="white",
             borderwidth=0, justify="center"
         ).pack(fill="x", padx=40, pady=5)
 
+        # Strength and breach check of the password above
+        self.check_label = tk.Label(
+            self.root, textvariable=self.check_var,
+            font=("Arial", 10), bg="#121212", fg="white"
+        )
+        self.check_label.pack()
+
         # Copy Button (using Tkinter's built-in clipboard)
         tk.Button(
             self.root, text="COPY", command=self.copy_password,
@@ -92,6 +157,9 @@ class PasswordGenerator:
         ).pack(pady=5, fill="x", padx=40)
 
     def generate_password(self):
+        if self.mode_var.get() == "passphrase":
+            self.generate_passphrase()
+            return
         try:
             # Validate selection
             if not any([
@@ -103,25 +171,66 @@ class PasswordGenerator:
                 messagebox.showerror("Error", "Select at least one character type!")
                 return
 
-            # Build character pool
-            chars = ""
-            if self.uppercase_var.get():
-                chars += string.ascii_uppercase
-            if self.lowercase_var.get():
-                chars += string.ascii_lowercase
-            if self.digits_var.get():
-                chars += string.digits
-            if self.symbols_var.get():
-                chars += "!@#$%^&*()_+-=[]{}|;:,.<>?"
-
-            # Generate password
-            length = self.length_var.get()
-            password = "".join(random.choices(chars, k=length))
+            # Compile the selected options into a policy; every password it
+            # produces satisfies them, so there is nothing to retry
+            classes = {
+                "upper": self.uppercase_var.get(),
+                "lower": self.lowercase_var.get(),
+                "digits": self.digits_var.get(),
+                "symbols": self.symbols_var.get(),
+            }
+            minimum = 1 if self.require_each_var.get() else 0
+            policy = PasswordPolicy(
+                self.length_var.get(), **classes,
+                **{f"min_{name}": minimum if enabled else 0 for name, enabled in classes.items()},
+                exclude_ambiguous=self.no_ambiguous_var.get(),
+                no_repeats=self.no_repeats_var.get())
+
+            # Generate password from the OS cryptographic RNG
+            password = policy.compile().generate()[0]
             self.password_var.set(password)
 
         except Exception as e:
             messagebox.showerror("Error", f"Failed to generate: {str(e)}")
 
+    def generate_passphrase(self):
+        try:
+            if self.wordlist is None:
+                path = next((path for path in WORDLISTS if path and os.path.exists(path)), None)
+                if path is None:
+                    messagebox.showerror("Error", "No wordlist found (set WORDLIST or add words.txt)")
+                    return
+                self.wordlist = WordList(path)
+            engine = PassphraseEngine(self.wordlist, self.words_var.get())
+            passphrase = engine.generate()[0]
+            # The exact entropy, which the per-character estimate would overstate
+            self.generated_bits = (passphrase, engine.entropy_bits)
+            self.password_var.set(passphrase)
+
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to generate: {str(e)}")
+
+    def check_password(self, *_):
+        password = self.password_var.get()
+        if not password:
+            self.check_var.set("")
+            return
+        if self.generated_bits and self.generated_bits[0] == password:
+            bits = self.generated_bits[1]
+        else:
+            bits = estimate_entropy(password)
+        text = f"{strength(bits)} ({bits:.0f} bits)"
+        color = "#4CAF50" if bits >= 60 else "#FFC107" if bits >= 36 else "#F44336"
+        if self.breach_index is None:
+            text += " · breach list not installed"
+        elif self.breach_index.is_breached(password):
+            text += " · found in breach list!"
+            color = "#F44336"
+        else:
+            text += " · not in breach list"
+        self.check_var.set(text)
+        self.check_label.config(fg=color)
+
     def copy_password(self):
         if password := self.password_var.get():
             self.root.clipboard_clear()
@@ -131,6 +240,7 @@ class PasswordGenerator:
             messagebox.showerror("Error", "No password to copy!")
 
 if __name__ == "__main__":
+    tk_instrument.install_from_env()  # opt-in, via TK_INSTRUMENT
     root = tk.Tk()
     PasswordGenerator(root)
     root.mainloop()
\ No newline at end of file
@@ -1,44 +1,70 @@
 import tkinter as tk
-from tkinter import font as tkfont
 import random
+from rps_engine import MOVES, OUTCOMES, STRATEGIES, TIE, WIN
+from rps_history import GameHistory, summary
+from tk_shared import font
+import tk_instrument
 
 class VisualRPSGame:
-    def __init__(self, root):
+    def __init__(self, root, history_file="rps_history.bin"):
         self.root = root
         self.root.title("🎮 Visual RPS Game")
-        self.root.geometry("600x500")
+        self.root.geometry("600x600")
         self.root.configure(bg="#f0f0f0")
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # Game variables
         self.user_score = 0
         self.comp_score = 0
-        self.choices = ["rock", "paper", "scissors"]
+        self.choices = list(MOVES)
         self.choice_emojis = {"rock": "🪨", "paper": "📄", "scissors": "✂️"}
         self.choice_colors = {"rock": "#3498db", "paper": "#e74c3c", "scissors": "#2ecc71"}
+
+        # Opponents: both watch every round, so the adaptive one has already
+        # learned the player's habits when it is switched on
+        self.opponent_var = tk.StringVar(value="random")
+        self.opponents = {name: STRATEGIES[name](random.Random()) for name in ("random", "markov")}
+
+        # Every round is logged; lifetime stats come from its sidecar
+        self.history = GameHistory(history_file)
         
         # Create UI
         self.setup_ui()
     
     def setup_ui(self):
         # Title
-        title_font = tkfont.Font(size=24, weight="bold")
+        title_font = font(24, "bold")
         tk.Label(self.root, text="Rock Paper Scissors", 
                 font=title_font, bg="#f0f0f0").pack(pady=20)
         
         # Score display
         self.score_label = tk.Label(self.root, 
                                   text=f"You: {self.user_score}  Computer: {self.comp_score}",
-                                  font=tkfont.Font(size=16),
+                                  font=font(16),
                                   bg="#f0f0f0")
         self.score_label.pack()
         
+        # Lifetime stats
+        self.lifetime_label = tk.Label(self.root, text=summary(self.history.stats),
+                                       bg="#f0f0f0", fg="#555555")
+        self.lifetime_label.pack()
+        
+        # Opponent mode
+        opponent_frame = tk.Frame(self.root, bg="#f0f0f0")
+        opponent_frame.pack(pady=(10, 0))
+        
+        tk.Label(opponent_frame, text="Opponent:", bg="#f0f0f0").pack(side="left")
+        for text, value in (("Random", "random"), ("Adaptive", "markov")):
+            tk.Radiobutton(opponent_frame, text=text, variable=self.opponent_var,
+                           value=value, bg="#f0f0f0").pack(side="left", padx=5)
+        
         # Choice buttons
         button_frame = tk.Frame(self.root, bg="#f0f0f0")
         button_frame.pack(pady=30)
         
         for choice in self.choices:
             btn = tk.Button(button_frame, text=f"{self.choice_emojis[choice]} {choice.capitalize()}",
-                          font=tkfont.Font(size=14),
+                          font=font(14),
                           bg=self.choice_colors[choice], fg="white",
                           command=lambda c=choice: self.play_round(c),
                           padx=20, pady=10)
@@ -51,49 +77,60 @@ class VisualRPSGame:
         
         # User choice display
         self.user_display = tk.Label(self.display_frame, text="", 
-                                   font=tkfont.Font(size=40),
+                                   font=font(40),
                                    bg="#ecf0f1")
         self.user_display.pack(side="left", padx=40)
         
         # VS label
         tk.Label(self.display_frame, text="VS", 
-                font=tkfont.Font(size=20),
+                font=font(20),
                 bg="#ecf0f1").pack(side="left")
         
         # Computer choice display
         self.comp_display = tk.Label(self.display_frame, text="", 
-                                    font=tkfont.Font(size=40),
+                                    font=font(40),
                                     bg="#ecf0f1")
         self.comp_display.pack(side="left", padx=40)
         
         # Result display
         self.result_label = tk.Label(self.root, text="", 
-                                   font=tkfont.Font(size=18, weight="bold"),
+                                   font=font(18, "bold"),
                                    bg="#f0f0f1")
         self.result_label.pack()
         
-        # Play again button
-        self.play_again_btn = tk.Button(self.root, text="Play Again", 
-                                      font=tkfont.Font(size=12),
+        # Play again and reset buttons
+        control_frame = tk.Frame(self.root, bg="#f0f0f0")
+        control_frame.pack(pady=20)
+        
+        self.play_again_btn = tk.Button(control_frame, text="Play Again", 
+                                      font=font(12),
                                       state=tk.DISABLED,
                                       command=self.reset_game)
-        self.play_again_btn.pack(pady=20)
+        self.play_again_btn.pack(side="left", padx=5)
+        
+        tk.Button(control_frame, text="Reset Scores",
+                  font=font(12),
+                  command=self.reset_scores).pack(side="left", padx=5)
     
     def play_round(self, user_choice):
-        # Computer makes random choice
-        comp_choice = random.choice(self.choices)
+        # Computer moves: at random, or to beat the player's predicted move
+        user_move = MOVES.index(user_choice)
+        comp_move = self.opponents[self.opponent_var.get()].move()
+        comp_choice = MOVES[comp_move]
+        for opponent in self.opponents.values():
+            opponent.observe(comp_move, user_move)
+        self.history.record(user_move, comp_move, list(self.opponents).index(self.opponent_var.get()))
         
         # Update visual displays
         self.user_display.config(text=self.choice_emojis[user_choice])
         self.comp_display.config(text=self.choice_emojis[comp_choice])
         
-        # Determine winner
-        if user_choice == comp_choice:
+        # Determine winner from the shared outcome table
+        outcome = OUTCOMES[user_move][comp_move]
+        if outcome == TIE:
             result = "It's a tie!"
             color = "#f39c12"  # Orange
-        elif (user_choice == "rock" and comp_choice == "scissors") or \
-             (user_choice == "paper" and comp_choice == "rock") or \
-             (user_choice == "scissors" and comp_choice == "paper"):
+        elif outcome == WIN:
             result = "You win!"
             color = "#2ecc71"  # Green
             self.user_score += 1
@@ -105,6 +142,7 @@ class VisualRPSGame:
         # Update UI
         self.result_label.config(text=result, fg=color)
         self.score_label.config(text=f"You: {self.user_score}  Computer: {self.comp_score}")
+        self.lifetime_label.config(text=summary(self.history.stats))
         self.play_again_btn.config(state=tk.NORMAL)
     
     def reset_game(self):
@@ -115,8 +153,20 @@ class VisualRPSGame:
         
         # Enable buttons
         self.play_again_btn.config(state=tk.DISABLED)
+    
+    def reset_scores(self):
+        # Session scores only; lifetime stats stay in the history
+        self.user_score = 0
+        self.comp_score = 0
+        self.score_label.config(text=f"You: {self.user_score}  Computer: {self.comp_score}")
+        self.reset_game()
+    
+    def on_close(self):
+        self.history.close()
+        self.root.destroy()
 
 if __name__ == "__main__":
+    tk_instrument.install_from_env()  # opt-in, via TK_INSTRUMENT
     root = tk.Tk()
     game = VisualRPSGame(root)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,83 @@
+from array import array
+
+from rps_engine import BEATS, Strategy
+
+
+class MarkovPredictor:
+    # Predicts the player's next move from what followed the same recent
+    # rounds before. One frequency table per context length 0..max_order,
+    # where a context is the last k (player, computer) move pairs; each
+    # order also keeps a decayed score of how often it guessed right, and
+    # the best-scoring order makes the prediction.
+    #
+    # Everything is a fixed-size flat array allocated up front (9**k contexts
+    # of order k, 3 counts each), so memory does not grow with the history,
+    # and an update touches one row per order: O(max_order) per move,
+    # independent of how many moves were played. Counts are decayed only in
+    # the row being updated, so the model keeps adapting to a player who
+    # changes habits.
+    def __init__(self, max_order=4, decay=0.9):
+        self.max_order = max_order
+        self.decay = decay
+        self.offsets = []
+        size = 0
+        for order in range(max_order + 1):
+            self.offsets.append(size)
+            size += 9 ** order
+        self.counts = array("d", bytes(24 * size))
+        self.codes = [0] * (max_order + 1)  # current context of each order
+        self.scores = [0.0] * (max_order + 1)
+        self.guesses = [None] * (max_order + 1)  # each order's next guess
+        self.moves = 0
+
+    def _row(self, order):
+        return 3 * (self.offsets[order] + self.codes[order])
+
+    def predict(self):
+        # The player's most likely next move, or None before any data
+        best = None
+        for order in range(min(self.moves, self.max_order) + 1):
+            if self.guesses[order] is not None and (
+                    best is None or self.scores[order] >= self.scores[best]):
+                best = order
+        return None if best is None else self.guesses[best]
+
+    def update(self, player, computer):
+        counts, decay = self.counts, self.decay
+        orders = min(self.moves, self.max_order) + 1
+        for order in range(orders):
+            guess = self.guesses[order]
+            if guess is not None:
+                self.scores[order] = self.scores[order] * decay + (guess == player)
+            row = self._row(order)
+            counts[row] *= decay
+            counts[row + 1] *= decay
+            counts[row + 2] *= decay
+            counts[row + player] += 1.0
+
+        pair = 3 * player + computer
+        for order in range(1, self.max_order + 1):
+            self.codes[order] = (self.codes[order] * 9 + pair) % 9 ** order
+        self.moves += 1
+
+        for order in range(min(self.moves, self.max_order) + 1):
+            row = self._row(order)
+            c0, c1, c2 = counts[row:row + 3]
+            if c0 == c1 == c2 == 0.0:
+                self.guesses[order] = None
+            else:
+                self.guesses[order] = 0 if c0 >= c1 and c0 >= c2 else 1 if c1 >= c2 else 2
+
+
+class MarkovBot(Strategy):
+    # Plays what beats the predicted move; random until it has a prediction
+    def __init__(self, rng, max_order=4, decay=0.9):
+        super().__init__(rng)
+        self.predictor = MarkovPredictor(max_order, decay)
+
+    def move(self):
+        guess = self.predictor.predict()
+        return self.rng.randrange(3) if guess is None else BEATS[guess]
+
+    def observe(self, mine, theirs):
+        self.predictor.update(theirs, mine)
@@ -0,0 +1,285 @@
+import argparse
+import itertools
+import multiprocessing
+import os
+import random
+import sys
+import time
+
+# NumPy is only needed for vectorized simulation and is imported on first
+# use, so the game window (which never simulates) opens without it
+np = None
+
+MOVES = ("rock", "paper", "scissors")
+ROCK, PAPER, SCISSORS = range(3)
+TIE, WIN, LOSS = range(3)  # from the first player's point of view
+
+# OUTCOMES[a][b]: result of move a against move b. Each move beats the
+# one before it (paper > rock, scissors > paper, rock > scissors).
+OUTCOMES = tuple(tuple((a - b) % 3 for b in range(3)) for a in range(3))
+BEATS = tuple((move + 1) % 3 for move in range(3))  # BEATS[m] wins against m
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def outcome(a, b):
+    return OUTCOMES[a][b]
+
+
+def load_numpy():
+    # The numpy module, or None if it is not installed
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            np = False
+        else:
+            np = numpy
+    return np or None
+
+
+def require_numpy():
+    if load_numpy() is None:
+        raise RuntimeError("NumPy is required for vectorized simulation (pip install numpy)")
+
+
+def simulate(rounds, p_a=None, p_b=None, seed=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    # Rounds between two fixed mixed strategies (move probabilities, uniform
+    # by default), drawn and scored chunk_size at a time with NumPy.
+    # Returns [ties, a wins, b wins].
+    require_numpy()
+    rng = np.random.default_rng(seed)
+    table = np.array(OUTCOMES, dtype=np.uint8).ravel()
+    counts = np.zeros(3, dtype=np.int64)
+    while rounds > 0:
+        size = min(rounds, chunk_size)
+        a = _draw(rng, p_a, size)
+        b = _draw(rng, p_b, size)
+        counts += np.bincount(table[a * 3 + b], minlength=3)
+        rounds -= size
+    return counts.tolist()
+
+
+def _draw(rng, probabilities, size):
+    if probabilities is None:
+        return rng.integers(0, 3, size, dtype=np.uint8)
+    edges = np.cumsum(probabilities, dtype=np.float64)
+    edges /= edges[-1]
+    return np.searchsorted(edges, rng.random(size), side="right").astype(np.uint8)
+
+
+class Strategy:
+    # A bot: move() returns 0-2, observe() is told both moves after each
+    # round. Bots playing a fixed mix set probabilities, which lets matches
+    # between two of them run vectorized.
+    probabilities = None
+
+    def __init__(self, rng):
+        self.rng = rng
+
+    def move(self):
+        raise NotImplementedError
+
+    def observe(self, mine, theirs):
+        pass
+
+
+class RandomBot(Strategy):
+    probabilities = (1 / 3, 1 / 3, 1 / 3)
+
+    def move(self):
+        return self.rng.randrange(3)
+
+
+class RockBot(Strategy):
+    probabilities = (1.0, 0.0, 0.0)
+
+    def move(self):
+        return ROCK
+
+
+class CycleBot(Strategy):
+    def __init__(self, rng):
+        super().__init__(rng)
+        self.next = rng.randrange(3)
+
+    def move(self):
+        move = self.next
+        self.next = (move + 1) % 3
+        return move
+
+
+class CopyBot(Strategy):
+    # Plays the opponent's previous move
+    def __init__(self, rng):
+        super().__init__(rng)
+        self.last = None
+
+    def move(self):
+        return self.rng.randrange(3) if self.last is None else self.last
+
+    def observe(self, mine, theirs):
+        self.last = theirs
+
+
+class BeatLastBot(CopyBot):
+    # Plays what would have beaten the opponent's previous move
+    def move(self):
+        return self.rng.randrange(3) if self.last is None else BEATS[self.last]
+
+
+class FrequencyBot(Strategy):
+    # Beats the opponent's most frequent move so far
+    def __init__(self, rng):
+        super().__init__(rng)
+        self.counts = [0, 0, 0]
+
+    def move(self):
+        counts = self.counts
+        if counts[0] == counts[1] == counts[2]:
+            return self.rng.randrange(3)
+        return BEATS[counts.index(max(counts))]
+
+    def observe(self, mine, theirs):
+        self.counts[theirs] += 1
+
+
+class WinStayBot(Strategy):
+    # Win-stay, lose-shift: keep a winning move, otherwise switch to what
+    # beats the move just played against it
+    def __init__(self, rng):
+        super().__init__(rng)
+        self.next = rng.randrange(3)
+
+    def move(self):
+        return self.next
+
+    def observe(self, mine, theirs):
+        if OUTCOMES[mine][theirs] != WIN:
+            self.next = BEATS[theirs]
+
+
+def _markov_bot(rng):
+    # The adaptive bot lives in rps_ai, which imports this module, so it is
+    # loaded on first use. Listing it here makes it a CLI choice and lets
+    # pool workers started with spawn (which only import this module)
+    # create it.
+    from rps_ai import MarkovBot
+    return MarkovBot(rng)
+
+
+STRATEGIES = {
+    "random": RandomBot,
+    "rock": RockBot,
+    "cycle": CycleBot,
+    "copy": CopyBot,
+    "beat_last": BeatLastBot,
+    "frequency": FrequencyBot,
+    "win_stay": WinStayBot,
+    "markov": _markov_bot,
+}
+
+
+def register_strategy(name, factory):
+    # factory(rng) -> Strategy; rng is a random.Random private to the bot
+    STRATEGIES[name] = factory
+
+
+def play_match(a, b, rounds, seed=None):
+    # rounds between strategies named a and b. Returns [ties, a wins, b wins].
+    rng = random.Random(seed)
+    bot_a = STRATEGIES[a](random.Random(rng.getrandbits(64)))
+    bot_b = STRATEGIES[b](random.Random(rng.getrandbits(64)))
+    if bot_a.probabilities and bot_b.probabilities and load_numpy() is not None:
+        return simulate(rounds, bot_a.probabilities, bot_b.probabilities, rng.getrandbits(64))
+
+    counts = [0, 0, 0]
+    move_a, move_b = bot_a.move, bot_b.move
+    observe_a, observe_b = bot_a.observe, bot_b.observe
+    for _ in range(rounds):
+        x, y = move_a(), move_b()
+        counts[OUTCOMES[x][y]] += 1
+        observe_a(x, y)
+        observe_b(y, x)
+    return counts
+
+
+def _play(job):
+    a, b, rounds, seed = job
+    return a, b, play_match(a, b, rounds, seed)
+
+
+def tournament(names, rounds, processes=1, seed=None):
+    # Round robin: every pair of strategies (and each against itself) plays
+    # one match of rounds, spread over processes. Returns (win_rates,
+    # seconds) where win_rates[a][b] is the share of rounds a won against b.
+    rng = random.Random(seed)
+    jobs = [(a, b, rounds, rng.getrandbits(64))
+            for a, b in itertools.combinations_with_replacement(names, 2)]
+    win_rates = {name: {} for name in names}
+
+    def record(results):
+        for a, b, (ties, a_wins, b_wins) in results:
+            win_rates[b][a] = b_wins / rounds
+            win_rates[a][b] = a_wins / rounds
+
+    start = time.perf_counter()
+    if processes == 1:
+        record(map(_play, jobs))
+    else:
+        with multiprocessing.Pool(processes) as workers:
+            record(workers.imap_unordered(_play, jobs))
+    return win_rates, time.perf_counter() - start
+
+
+def format_matrix(win_rates):
+    # Row strategy's win rate against each column strategy
+    names = list(win_rates)
+    width = max(9, *(len(name) for name in names))
+    lines = [" " * width + "".join(f"{name:>{width + 1}}" for name in names)]
+    for a in names:
+        lines.append(f"{a:<{width}}" + "".join(f"{win_rates[a][b]:>{width + 1}.3f}"
+                                               for b in names))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Play rock-paper-scissors strategy bots against each other.")
+    parser.add_argument("strategies", nargs="*", default=list(STRATEGIES),
+                        help=f"bots to enter (default: all of {', '.join(STRATEGIES)})")
+    parser.add_argument("-r", "--rounds", type=int, default=100000, help="rounds per match")
+    parser.add_argument("-j", "--processes", type=int, default=1,
+                        help="worker processes (0: one per CPU)")
+    parser.add_argument("--seed", type=int, help="for reproducible results")
+    parser.add_argument("--simulate", type=int, metavar="ROUNDS",
+                        help="only time ROUNDS vectorized random-vs-random rounds")
+    args = parser.parse_args(argv)
+
+    if args.simulate is not None:
+        start = time.perf_counter()
+        try:
+            ties, wins, losses = simulate(args.simulate, seed=args.seed)
+        except RuntimeError as e:
+            parser.exit(1, f"error: {e}\n")
+        seconds = time.perf_counter() - start
+        rate = args.simulate / seconds if seconds else 0.0
+        print(f"ties {ties}  wins {wins}  losses {losses}")
+        print(f"{args.simulate} rounds in {seconds:.2f}s ({rate:,.0f} rounds/s)", file=sys.stderr)
+        return
+
+    unknown = [name for name in args.strategies if name not in STRATEGIES]
+    if unknown:
+        parser.error(f"unknown strategies: {', '.join(unknown)}")
+    win_rates, seconds = tournament(args.strategies, args.rounds,
+                                    args.processes or os.cpu_count(), args.seed)
+    print(format_matrix(win_rates))
+    matches = len(args.strategies) * (len(args.strategies) + 1) // 2
+    total = matches * args.rounds
+    rate = total / seconds if seconds else 0.0
+    print(f"{total} rounds in {seconds:.2f}s ({rate:,.0f} rounds/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
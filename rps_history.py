@@ -0,0 +1,130 @@
+import json
+import os
+
+from rps_engine import LOSS, MOVES, OUTCOMES, TIE, WIN
+
+BLOCK_SIZE = 1 << 20
+SAVE_EVERY = 1000  # rounds between stats sidecar saves
+
+
+def encode(player, computer, opponent=0):
+    # One byte per round: the opponent mode in the high nibble, the two
+    # moves as player * 3 + computer in the low one
+    return opponent << 4 | player * 3 + computer
+
+
+class GameStats:
+    # Lifetime aggregates, updated one round at a time so they never need
+    # the history again. offset is how many log bytes they cover.
+    def __init__(self):
+        self.offset = 0
+        self.rounds = 0
+        self.results = [0, 0, 0]  # ties, player wins, player losses
+        self.streak = 0  # > 0: player wins in a row, < 0: losses in a row
+        self.best_streak = 0
+        self.worst_streak = 0
+        self.player_moves = [0, 0, 0]
+        self.computer_moves = [0, 0, 0]
+
+    def add(self, data):
+        # Fold in log bytes, in order
+        results, player_moves, computer_moves = self.results, self.player_moves, self.computer_moves
+        streak, best, worst = self.streak, self.best_streak, self.worst_streak
+        for byte in data:
+            player, computer = divmod(byte & 15, 3)
+            result = OUTCOMES[player][computer]
+            results[result] += 1
+            player_moves[player] += 1
+            computer_moves[computer] += 1
+            if result == WIN:
+                streak = streak + 1 if streak > 0 else 1
+                best = max(best, streak)
+            elif result == LOSS:
+                streak = streak - 1 if streak < 0 else -1
+                worst = min(worst, streak)
+            else:
+                streak = 0
+        self.streak, self.best_streak, self.worst_streak = streak, best, worst
+        self.rounds += len(data)
+        self.offset += len(data)
+
+    @property
+    def win_rate(self):
+        return self.results[WIN] / self.rounds if self.rounds else 0.0
+
+    def to_dict(self):
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        for name in vars(stats):
+            setattr(stats, name, data[name])
+        return stats
+
+
+class GameHistory:
+    # Append-only log of every round (see encode) plus a JSON sidecar of
+    # GameStats and the log offset it covers. Opening reads the sidecar and
+    # folds in only the log bytes written after it was last saved, so
+    # lifetime stats are ready at once however long the history is. A
+    # sidecar ahead of the log (e.g. the log was lost) is rebuilt from zero.
+    def __init__(self, path="rps_history.bin"):
+        self.path = path
+        self.stats_path = path + ".stats"
+        self.log = open(path, "ab")
+        self._unsaved = 0
+        self.stats = self._load_stats()
+        size = os.path.getsize(path)
+        if self.stats.offset > size:
+            self.stats = GameStats()
+        if self.stats.offset < size:
+            with open(path, "rb") as f:
+                f.seek(self.stats.offset)
+                while block := f.read(BLOCK_SIZE):
+                    self.stats.add(block)
+            self.save_stats()
+
+    def _load_stats(self):
+        try:
+            with open(self.stats_path) as f:
+                return GameStats.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError):
+            return GameStats()
+
+    def record(self, player, computer, opponent=0):
+        record = bytes((encode(player, computer, opponent),))
+        self.log.write(record)
+        self.log.flush()
+        self.stats.add(record)
+        self._unsaved += 1
+        if self._unsaved >= SAVE_EVERY:
+            self.save_stats()
+
+    def save_stats(self):
+        # The log is synced first, so the sidecar never covers bytes that
+        # could still be lost; same temp-file-and-replace as todo snapshots
+        self.log.flush()
+        os.fsync(self.log.fileno())
+        tmp_path = self.stats_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.stats.to_dict(), f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.stats_path)
+        self._unsaved = 0
+
+    def close(self):
+        self.save_stats()
+        self.log.close()
+        self.log = None
+
+
+def summary(stats):
+    if not stats.rounds:
+        return "Lifetime: no rounds yet"
+    moves = "  ".join(f"{name[0].upper()} {count / stats.rounds:.0%}"
+                      for name, count in zip(MOVES, stats.player_moves))
+    return (f"Lifetime: {stats.rounds:,} rounds · {stats.win_rate:.0%} won · "
+            f"{stats.results[TIE]:,} ties · best streak {stats.best_streak}\n"
+            f"Your moves: {moves}")
@@ -0,0 +1,63 @@
+import io
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import calc_batch
+from calc_engine import evaluate
+
+
+def test_columns_match_scalar_evaluation():
+    x = np.array([0.5, 1.0, 2.0, 3.0])
+    y = np.array([4.0, 3.0, 2.0, 1.0])
+    expression = "x * y ^ 2 + sqrt(x) - y / 4"
+    result = calc_batch.evaluate_columns(expression, {"x": x, "y": y})
+    expected = [evaluate(expression, x=a, y=b) for a, b in zip(x.tolist(), y.tolist())]
+    assert result.tolist() == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("expression, value", [
+    ("x + 10^20", 1e20), ("x * 2^-1", 0.5), ("x + 3^40", 3.0 ** 40 + 1)])
+def test_literals_are_float64(expression, value):
+    # int64 literals would wrap around or reject negative powers
+    result = calc_batch.evaluate_columns(expression, {"x": np.array([1.0])})
+    assert result.tolist() == pytest.approx([value])
+
+
+def test_constant_expression_is_broadcast():
+    assert calc_batch.evaluate_columns("1+2", {}, length=3).tolist() == [3.0, 3.0, 3.0]
+
+
+def test_bad_values_become_nan():
+    result = calc_batch.evaluate_columns("1/x + sqrt(y)", {
+        "x": calc_batch.to_array(["0", "2", "oops"]),
+        "y": calc_batch.to_array(["-1", "4", ""])})
+    assert math.isnan(result[0])  # inf + nan
+    assert result[1] == 2.5
+    assert math.isnan(result[2])
+
+
+def test_process_csv_streams_chunks_and_pads_short_rows():
+    source = io.StringIO("a,b,note\n1,2,x\n3\n\n5,6,y\n7,8\n")
+    target = io.StringIO()
+    rows, _ = calc_batch.process_csv(source, target, "a + b", chunk_size=2)
+    assert rows == 5
+    assert target.getvalue().splitlines() == [
+        "a,b,note,result", "1,2,x,3.0", "3,,,nan", ",,,nan", "5,6,y,11.0", "7,8,,15.0"]
+
+
+def test_process_csv_bindings_and_missing_columns():
+    source = io.StringIO("unit price,qty\n2,3\n")
+    target = io.StringIO()
+    calc_batch.process_csv(source, target, "p * qty", bindings={"p": "unit price"})
+    assert target.getvalue().splitlines()[1] == "2,3,6.0"
+    with pytest.raises(ValueError):
+        calc_batch.process_csv(io.StringIO("a\n1\n"), io.StringIO(), "b + 1")
+
+
+def test_parse_bindings():
+    assert calc_batch.parse_bindings(["p=unit price"]) == {"p": "unit price"}
+    with pytest.raises(ValueError):
+        calc_batch.parse_bindings(["p"])
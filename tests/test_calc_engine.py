@@ -0,0 +1,188 @@
+import random
+import time
+
+import pytest
+
+from calc_engine import (EvaluationWorker, ExpressionError, IncrementalEvaluator,
+                         compile_expression, evaluate, format_result, plan)
+
+
+@pytest.mark.parametrize("text, value", [
+    ("1+2*3", 7), ("(1+2)*3", 9), ("2^3^2", 512), ("2**10", 1024), ("-3^2", -9),
+    ("7//2", 3), ("7/2", 3.5), ("sqrt(16)", 4.0), ("1e3+1", 1001.0), ("2.5e-1", 0.25),
+    ("10-2-3", 5), ("64/4/2", 8.0), ("-(-2)", 2),
+])
+def test_evaluate(text, value):
+    result = evaluate(text)
+    assert result == value and type(result) is type(value)
+
+
+@pytest.mark.parametrize("text", ["1+", "2*(3", "1 2", "$", "()", '__import__("os")'])
+def test_invalid_expressions_raise(text):
+    with pytest.raises(ExpressionError):
+        evaluate(text)
+
+
+def test_unknown_names_raise_name_error():
+    with pytest.raises(NameError):
+        evaluate("foo(1)")
+    with pytest.raises(NameError):
+        evaluate("x+1")
+
+
+def test_division_by_zero_raises():
+    with pytest.raises(ZeroDivisionError):
+        evaluate("1/(2-2)")
+
+
+def test_compiled_expressions_are_cached_by_normal_form():
+    assert compile_expression("2**3") is compile_expression("2^3")
+    assert compile_expression(" 1 +  2 ") is compile_expression("1 + 2")
+
+
+def test_variables():
+    expression = compile_expression("x*y+x")
+    assert expression.variables == {"x", "y"}
+    assert expression.evaluate(x=2, y=3) == 8
+    assert expression({"x": 1, "y": 1}) == 2
+
+
+def test_long_chains_do_not_recurse():
+    terms = range(20000)
+    assert evaluate("+".join(map(str, terms))) == sum(terms)
+    assert evaluate("*".join(["1"] * 20000)) == 1
+
+
+@pytest.mark.parametrize("text, mode", [
+    ("2^10", "inline"), ("x^100000", "inline"), ("2^200000", "worker"), ("2^(2^25)", "worker"),
+    ("2^(2^40)", "float"), ("2^(2^40)/3", "float"),
+])
+def test_plan(text, mode):
+    assert plan(compile_expression(text)) == mode
+
+
+def test_float_backend_overflows_instead_of_growing():
+    with pytest.raises(OverflowError):
+        compile_expression("2^(2^40)", backend="float").evaluate()
+
+
+@pytest.mark.parametrize("expression, text", [
+    ("12345", "12345"), ("0.1", "0.1"), ("10^5000", "1.0000000e+5000"),
+    ("-(10^5000)", "-1.0000000e+5000"), ("2^100000", "9.9900209e+30102"),
+    ("10^5000-1", "1.0000000e+5000"),
+])
+def test_format_result(expression, text):
+    # Past the int -> str limit, integers are shown in scientific notation
+    assert format_result(evaluate(expression)) == text
+
+
+def wait_for(worker, limit=30):
+    deadline = time.monotonic() + limit
+    while time.monotonic() < deadline:
+        result = worker.poll()
+        if result is not None:
+            return result
+        time.sleep(0.01)
+    raise AssertionError("worker did not answer")
+
+
+def test_worker_returns_formatted_results_and_errors():
+    worker = EvaluationWorker()
+    try:
+        worker.submit("2^200000")
+        assert worker.busy
+        assert wait_for(worker) == format_result(2 ** 200000)
+        assert not worker.busy
+        worker.submit("1/0")
+        with pytest.raises(ZeroDivisionError):
+            wait_for(worker)
+        # The same process serves the next request
+        worker.submit("6*7")
+        assert wait_for(worker) == "42"
+    finally:
+        worker.close()
+    assert worker.process is None
+
+
+def test_worker_times_out_and_can_be_cancelled():
+    worker = EvaluationWorker(timeout=0.2)
+    try:
+        worker.submit("3^60000000")
+        with pytest.raises(TimeoutError):
+            wait_for(worker)
+        assert not worker.busy and worker.process is None
+        worker.submit("3^60000000")
+        worker.cancel()
+        assert not worker.busy
+        worker.submit("1")
+        with pytest.raises(RuntimeError):
+            worker.submit("2")  # busy
+        assert wait_for(worker) == "1"
+    finally:
+        worker.close()
+
+
+def random_expression(rng, depth=0):
+    # Small operands and single-digit exponents keep every value cheap
+    choice = rng.random()
+    if depth > 3 or choice < 0.3:
+        return rng.choice(["0", "1", "2", "3", "7", "12", "0.5", "2.25", "1e2", "3e-1"])
+    if choice < 0.4:
+        return "-" + random_expression(rng, depth + 1)
+    if choice < 0.5:
+        return f"sqrt({random_expression(rng, depth + 1)})"
+    if choice < 0.6:
+        return f"({random_expression(rng, depth + 1)})"
+    if choice < 0.7:
+        return f"{random_expression(rng, depth + 1)}^{rng.randrange(4)}"
+    op = rng.choice(["+", "-", "*", "/", "//"])
+    return f"{random_expression(rng, depth + 1)}{op}{random_expression(rng, depth + 1)}"
+
+
+def expected(text):
+    try:
+        return evaluate(text)
+    except (ZeroDivisionError, ValueError, OverflowError):
+        return None
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_preview_matches_evaluate(seed):
+    rng = random.Random(seed)
+    for _ in range(300):
+        text = random_expression(rng)
+        assert IncrementalEvaluator(text).preview() == expected(text), text
+
+
+@pytest.mark.parametrize("text", ["1+2*3", "2^3^2", "-2^2", "(1+2)*(3+4)", "1e5+2.5e-3*4",
+                                  "+".join(map(str, range(3000)))])
+def test_preview_of_known_expressions(text):
+    assert IncrementalEvaluator(text).preview() == evaluate(text)
+
+
+def test_preview_closes_parentheses_and_ignores_trailing_operator():
+    assert IncrementalEvaluator("2*(3+4").preview() == 14
+    assert IncrementalEvaluator("2*(3+4)+").preview() == 14
+    assert IncrementalEvaluator("1e").preview() is None
+    assert IncrementalEvaluator("").preview() is None
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_backspace_matches_reparse(seed):
+    rng = random.Random(seed)
+    for _ in range(100):
+        text = random_expression(rng)
+        live = IncrementalEvaluator(text)
+        while live.text:
+            live.backspace(rng.randint(1, 3))
+            assert live.preview() == IncrementalEvaluator(live.text).preview(), live.text
+
+
+def test_set_text_matches_reparse():
+    rng = random.Random(0)
+    live = IncrementalEvaluator()
+    for _ in range(200):
+        text = random_expression(rng)
+        live.set_text(text)
+        assert live.text == text
+        assert live.preview() == IncrementalEvaluator(text).preview(), text
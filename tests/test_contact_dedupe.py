@@ -0,0 +1,55 @@
+from contact_dedupe import canonical_email, canonical_phone, find_duplicates, merge_contacts
+
+
+def test_canonical_keys():
+    assert canonical_phone("+1 (555) 010-2030") == canonical_phone("555.010.2030") == "5550102030"
+    assert canonical_phone("12-34") is None
+    assert canonical_email(" Ada@Example.COM ") == "ada@example.com"
+    assert canonical_email("not an email") is None
+
+
+def test_formatting_and_case_differences_are_grouped():
+    rows = [
+        (1, "Ada Lovelace", "+1 (555) 010-2030", ""),
+        (2, "ada lovelace", "555.010.2030", "ada@example.com"),
+        (3, "Lovelace, Ada", "", "ADA@example.com"),
+        (4, "Grace Hopper", "555-999-0000", ""),
+        (5, "grace hopper", "", ""),
+        (6, "Grace  Hopper!", "", ""),
+    ]
+    assert find_duplicates(rows) == [[1, 2, 3], [5, 6]]
+
+
+def test_shared_phone_or_email_needs_matching_names():
+    # An office phone and a family email shared by different people
+    rows = [
+        (1, "Ada Lovelace", "555-010-2030", "family@example.com"),
+        (2, "Charles Babbage", "555-010-2030", ""),
+        (3, "Byron Lovelace", "", "family@example.com"),
+    ]
+    assert find_duplicates(rows) == []
+
+
+def test_no_transitive_chains_across_names():
+    # 1 and 3 are the same person; 2 shares a key with each of them
+    rows = [
+        (1, "Ada Lovelace", "555-010-2030", ""),
+        (2, "Front Desk", "555-010-2030", "office@example.com"),
+        (3, "Ada Lovelace", "", "office@example.com"),
+        (4, "Ada Lovelace", "555-010-2030", ""),
+    ]
+    assert find_duplicates(rows) == [[1, 4]]
+
+
+def test_nameless_contacts_are_never_grouped():
+    assert find_duplicates([(1, "", "555-010-2030", ""), (2, "", "555-010-2030", "")]) == []
+
+
+def test_merge_keeps_the_fullest_value_of_each_field():
+    merged = merge_contacts([
+        {"name": "Ada", "phone": "555-010-2030", "email": "", "address": ""},
+        {"name": "Ada Lovelace", "phone": "5550102030", "email": "ada@example.com",
+         "address": ""},
+    ])
+    assert merged == {"name": "Ada Lovelace", "phone": "555-010-2030",
+                      "email": "ada@example.com", "address": ""}
@@ -0,0 +1,120 @@
+import random
+
+import pytest
+
+from contact_index import ContactIndex, normalize, substring_distance
+
+NAMES = ["ann", "anna", "bob", "bobby", "carla", "dave", "eve", "Émile"]
+QUERIES = ["an", "ann", "bob", "55", "555-1", "5551", "x.io", "eve@", "carla d", "émi", "zzz"]
+
+
+def random_contact(rng):
+    return {"name": f"{rng.choice(NAMES)} {rng.choice(NAMES)}",
+            "phone": f"555-{rng.randrange(10000):04d}",
+            "email": f"{rng.choice(NAMES).lower()}@x.io"}
+
+
+def brute_force(model, query):
+    query = query.strip().casefold()
+    return sorted(contact_id for contact_id, text in model.items() if query in text)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_search_matches_brute_force(seed):
+    # Random adds, updates and removes, checked against a plain dict of
+    # normalized texts
+    rng = random.Random(seed)
+    index = ContactIndex()
+    model = {}
+    for step in range(8000):
+        contact_id = rng.randrange(3000)
+        if rng.random() < 0.6:
+            contact = random_contact(rng)
+            index.add(contact_id, contact)
+            model[contact_id] = normalize(contact)
+        else:
+            index.remove(contact_id)
+            model.pop(contact_id, None)
+        assert len(index) == len(model)
+        if step % 50 == 0:
+            query = rng.choice(QUERIES)
+            assert index.search(query) == brute_force(model, query), query
+            # Typing on narrows the previous result
+            for more in ("a", "b"):
+                assert index.search(query + more) == brute_force(model, query + more)
+
+
+def test_short_queries_scan_and_phone_digits_match():
+    index = ContactIndex()
+    index.add(1, {"name": "Ada", "phone": "555-1234", "email": "ada@x.io"})
+    index.add(2, {"name": "Bo", "phone": "", "email": ""})
+    assert index.search("a") == [1]
+    assert index.search("5551234") == [1]
+    assert index.search("  ") is None
+    index.update(1, {"name": "Ada", "phone": "", "email": ""})
+    assert index.search("5551234") == []
+    assert 1 in index and 3 not in index
+
+
+def test_compact_keeps_results():
+    rng = random.Random(0)
+    index = ContactIndex()
+    model = {}
+    for contact_id in range(3000):
+        contact = random_contact(rng)
+        index.add(contact_id, contact)
+        model[contact_id] = normalize(contact)
+    for contact_id in range(0, 3000, 3):
+        index.remove(contact_id)
+        del model[contact_id]
+    before = {query: index.search(query) for query in QUERIES}
+    index.compact()
+    assert index.dead == 0 and len(index) == len(model)
+    for query in QUERIES:
+        assert index.search(query) == before[query] == brute_force(model, query)
+
+
+def test_search_after_compact_does_not_reuse_old_rows():
+    rng = random.Random(0)
+    index = ContactIndex()
+    model = {}
+    for contact_id in range(300):
+        contact = random_contact(rng)
+        index.add(contact_id, contact)
+        model[contact_id] = normalize(contact)
+    for contact_id in range(0, 300, 2):
+        index.remove(contact_id)
+        del model[contact_id]
+    index.search("an")
+    index.compact()
+    assert index.search("ann") == brute_force(model, "ann")
+
+
+def test_fuzzy_tolerates_typos():
+    index = ContactIndex()
+    index.add(1, {"name": "Margaret Hamilton", "phone": "", "email": ""})
+    index.add(2, {"name": "Grace Hopper", "phone": "", "email": ""})
+    assert index.search("hamliton") == []
+    assert index.fuzzy("hamliton") == [1]
+    assert index.fuzzy("grce hopper") == [2]
+    index.remove(1)
+    assert index.fuzzy("hamliton") == []
+
+
+def test_fuzzy_only_returns_live_contacts():
+    rng = random.Random(1)
+    index = ContactIndex()
+    for contact_id in range(2000):
+        index.add(contact_id, random_contact(rng))
+    for contact_id in range(0, 2000, 2):
+        index.remove(contact_id)
+    for query in QUERIES:
+        assert all(contact_id % 2 for contact_id in index.fuzzy(query))
+
+
+@pytest.mark.parametrize("pattern, text, distance", [
+    ("abc", "xxabcxx", 0), ("abd", "xxabcxx", 1), ("acb", "xxabcxx", 1),
+    ("abc", "", 3), ("", "abc", 0), ("kitten", "sitting", 2),
+])
+def test_substring_distance(pattern, text, distance):
+    assert substring_distance(pattern, text) == distance
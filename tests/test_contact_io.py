@@ -0,0 +1,74 @@
+import io
+
+import contact_io
+from contact_io import TransferWorker, iter_csv, iter_vcard, write_csv, write_vcard
+from contact_store import ContactStore
+
+CONTACTS = [
+    {"name": "Ada Lovelace", "phone": "555-0100", "email": "ada@example.com", "address": ""},
+    {"name": "Grace; Hopper, Jr", "phone": "", "email": "", "address": "1 Navy Way\nArlington"},
+]
+
+
+def run(worker):
+    # Wait for the worker thread, then return its messages
+    worker.thread.join(30)
+    assert not worker.busy
+    return worker.poll()
+
+
+def test_csv_and_vcard_round_trip():
+    for write, read in ((write_csv, iter_csv), (write_vcard, iter_vcard)):
+        f = io.StringIO()
+        write(f, CONTACTS)
+        f.seek(0)
+        assert list(read(f)) == CONTACTS
+
+
+def test_csv_headers_are_matched_loosely():
+    f = io.StringIO("E-Mail,Full Name,Notes\nada@example.com,Ada,x\n,,no name\n")
+    assert list(iter_csv(f)) == [
+        {"name": "Ada", "phone": "", "email": "ada@example.com", "address": ""}]
+
+
+def test_import_then_export(tmp_path):
+    source = tmp_path / "in.vcf"
+    with open(source, "w", encoding="utf-8", newline="") as f:
+        write_vcard(f, CONTACTS * 3)
+    db = str(tmp_path / "contacts.db")
+    worker = TransferWorker(db, batch_size=2)
+    worker.start_import(str(source))
+    messages = run(worker)
+    assert messages[-1] == ("done", 6)
+    assert [message[0] for message in messages[:-1]] == ["progress"] * 3
+
+    target = tmp_path / "out.csv"
+    worker.start_export(str(target))
+    assert run(worker)[-1] == ("done", 6)
+    with open(target, encoding="utf-8", newline="") as f:
+        assert list(iter_csv(f)) == CONTACTS * 3
+    store = ContactStore(db)
+    assert store.count() == 6
+    store.close()
+
+
+def test_store_errors_are_reported(tmp_path):
+    # sqlite3 cannot open a database in a missing directory
+    source = tmp_path / "in.csv"
+    source.write_text("name\nAda\n")
+    worker = TransferWorker(str(tmp_path / "missing" / "contacts.db"))
+    worker.start_import(str(source))
+    [(kind, message)] = run(worker)
+    assert kind == "error" and message
+
+
+def test_failed_export_leaves_no_files(tmp_path, monkeypatch):
+    def broken_write(f, contacts):
+        f.write("name,phone\n")
+        raise RuntimeError("disk on fire")
+
+    monkeypatch.setattr(contact_io, "write_csv", broken_write)
+    worker = TransferWorker(str(tmp_path / "contacts.db"))
+    worker.start_export(str(tmp_path / "out.csv"))
+    assert run(worker) == [("error", "disk on fire")]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["contacts.db"]
@@ -0,0 +1,105 @@
+import io
+import os
+from collections import Counter
+
+import pytest
+
+from passphrase_engine import (PassphraseEngine, PassphrasePolicy, WordList, compile_wordlist,
+                               compiled_path)
+from password_engine import generate_to
+
+WORDS = ["apple", "banana", "cherry", "dátil"]
+
+
+@pytest.fixture
+def wordlist(tmp_path, monkeypatch):
+    # Compiled copies go to a cache under tmp_path, never ~/.cache
+    monkeypatch.setattr("passphrase_engine.CACHE_DIR", str(tmp_path / "cache"))
+    path = tmp_path / "words.txt"
+    path.write_text("".join(f"1111{i}\t{word}\n" for i, word in enumerate(WORDS))
+                    + "\n11115\tapple\n", encoding="utf-8")
+    return str(path)
+
+
+def test_compile_and_read(wordlist, tmp_path):
+    target = str(tmp_path / "words.idx")
+    assert compile_wordlist(wordlist, target) == len(WORDS)  # duplicate dropped
+    words = WordList(target)
+    try:
+        assert words.path == target  # compiled lists are used as they are
+        assert [words.word(i) for i in range(len(words))] == WORDS
+    finally:
+        words.close()
+
+
+def test_plain_word_lines(tmp_path):
+    source = tmp_path / "plain.txt"
+    source.write_text("one\ntwo\n\nthree\n", encoding="utf-8")
+    target = str(tmp_path / "plain.idx")
+    assert compile_wordlist(str(source), target) == 3
+
+
+@pytest.mark.parametrize("content", [b"only\nonly\n", b"", b"ok\nbad\xff\n"])
+def test_compile_rejects_bad_lists(tmp_path, content):
+    source = tmp_path / "words.txt"
+    source.write_bytes(content)
+    with pytest.raises(ValueError):
+        compile_wordlist(str(source), str(tmp_path / "words.idx"))
+    assert os.listdir(tmp_path) == ["words.txt"]
+
+
+def test_cache_is_keyed_on_mtime(wordlist, tmp_path):
+    first = compiled_path(wordlist)
+    assert os.path.dirname(first) == str(tmp_path / "cache")
+    assert compiled_path(wordlist) == first
+    with open(wordlist, "a", encoding="utf-8") as f:
+        f.write("11116\telderberry\n")
+    os.utime(wordlist, ns=(0, os.stat(wordlist).st_mtime_ns + 10 ** 9))
+    second = compiled_path(wordlist)
+    assert second != first
+    words = WordList(wordlist)
+    try:
+        assert len(words) == len(WORDS) + 1
+    finally:
+        words.close()
+
+
+def test_engine(wordlist):
+    engine = PassphraseEngine(WordList(wordlist), words=4, separator="-", capitalize=True)
+    try:
+        assert engine.entropy_bits == 8.0
+        capitalized = {word.capitalize() for word in WORDS}
+        counts = Counter()
+        for phrase in engine.generate(2000):
+            words = phrase.split("-")
+            assert len(words) == 4 and set(words) <= capitalized
+            counts.update(words)
+        for count in counts.values():
+            assert abs(count - 2000) < 5 * 2000 ** 0.5
+        lines = engine.generate_bytes(3).split(b"\n")
+        assert lines[-1] == b"" and len(lines) == 4
+        assert engine.generate_bytes(0) == b""
+    finally:
+        engine.wordlist.close()
+    with pytest.raises(ValueError):
+        PassphraseEngine(engine.wordlist, words=0)
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_generate_to(wordlist, processes):
+    compiled = compiled_path(wordlist)  # workers map the compiled copy
+    out = io.BytesIO()
+    count, _ = generate_to(out, PassphrasePolicy(compiled, 3), 500, processes, batch=100)
+    phrases = out.getvalue().decode("utf-8").splitlines()
+    assert count == len(phrases) == 500
+    assert all(len(p.split(" ")) == 3 and set(p.split(" ")) <= set(WORDS) for p in phrases)
+
+
+def test_failed_compile_leaves_no_tmp(wordlist, tmp_path, monkeypatch):
+    def failing_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr("passphrase_engine.os.replace", failing_replace)
+    with pytest.raises(OSError):
+        compile_wordlist(wordlist, str(tmp_path / "words.idx"))
+    assert sorted(os.listdir(tmp_path)) == ["words.txt"]
@@ -0,0 +1,102 @@
+import os
+
+import pytest
+
+from password_check import (BreachIndex, build_index, estimate_entropy, iter_digests, main,
+                            sha1, strength)
+
+PASSWORDS = [f"password{i}" for i in range(500)]
+
+
+def test_iter_digests():
+    digest = sha1("hunter2")
+    lines = [digest.hex().upper() + ":42\n", "junk\n", "zz" * 20 + "\n", digest.hex() + "\r\n"]
+    assert list(iter_digests(lines)) == [digest, digest]
+    assert list(iter_digests(["hunter2\n", "\n"], plain=True)) == [digest]
+
+
+@pytest.mark.parametrize("run_records", [7, 10000])
+@pytest.mark.parametrize("bloom", [0, 10])
+def test_build_and_query(tmp_path, run_records, bloom):
+    # Small runs spill to temporary files and are merged; duplicates go
+    path = str(tmp_path / "breached.idx")
+    digests = [sha1(p) for p in PASSWORDS * 2]
+    assert build_index(iter(digests), path, run_records, bloom) == len(PASSWORDS)
+    assert os.path.exists(path + ".bloom") == bool(bloom)
+    assert not os.path.exists(path + ".tmp")
+
+    index = BreachIndex(path)
+    try:
+        assert index.count == len(PASSWORDS)
+        assert all(index.is_breached(p) for p in PASSWORDS)
+        assert not any(index.is_breached(p + "!") for p in PASSWORDS)
+    finally:
+        index.close()
+
+
+def test_rebuild_without_bloom_drops_the_old_filter(tmp_path):
+    path = str(tmp_path / "breached.idx")
+    build_index(iter([sha1("a")]), path, bloom_bits_per_item=10)
+    build_index(iter([sha1("b")]), path)
+    assert not os.path.exists(path + ".bloom")
+    index = BreachIndex(path)
+    try:
+        assert index.is_breached("b") and not index.is_breached("a")
+    finally:
+        index.close()
+
+
+def test_empty_index(tmp_path):
+    path = str(tmp_path / "breached.idx")
+    assert build_index(iter([]), path) == 0
+    index = BreachIndex(path)
+    try:
+        assert not index.is_breached("anything")
+    finally:
+        index.close()
+
+
+def test_failed_build_keeps_the_old_index(tmp_path, monkeypatch):
+    path = str(tmp_path / "breached.idx")
+    build_index(iter([sha1("old")]), path)
+
+    def failing_merge(*sources):
+        yield sha1("new")
+        raise OSError("disk full")
+
+    monkeypatch.setattr("password_check.heapq.merge", failing_merge)
+    with pytest.raises(OSError):
+        build_index(iter([sha1("new")]), path)
+    assert sorted(os.listdir(tmp_path)) == ["breached.idx"]
+    index = BreachIndex(path)
+    try:
+        assert index.is_breached("old")
+    finally:
+        index.close()
+
+
+def test_plain_build_rejects_bad_utf8(tmp_path, capsys):
+    source = tmp_path / "passwords.txt"
+    source.write_bytes(b"hunter2\nsecr\xe9t\n")
+    path = str(tmp_path / "breached.idx")
+    with pytest.raises(SystemExit):
+        main(["build", "--plain", str(source), path])
+    assert "not valid UTF-8" in capsys.readouterr().err
+    assert not os.path.exists(path)
+
+    source.write_bytes("hunter2\nsecrét\n".encode("utf-8"))
+    main(["build", "--plain", str(source), path])
+    index = BreachIndex(path)
+    try:
+        assert index.is_breached("secrét") and index.is_breached("hunter2")
+    finally:
+        index.close()
+
+
+def test_entropy_and_strength():
+    assert estimate_entropy("") == 0.0
+    assert estimate_entropy("aaaaaaaa") < estimate_entropy("akxmqwpz")
+    assert estimate_entropy("abcdefgh") == estimate_entropy("aaaaaaaa")
+    assert estimate_entropy("aB3$") > estimate_entropy("abcd")
+    assert strength(estimate_entropy("123456")) == "Very weak"
+    assert strength(estimate_entropy("Tr0ub4dor&3xQ!zK9#vW2@pL7%")) == "Very strong"
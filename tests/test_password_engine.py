@@ -0,0 +1,139 @@
+import io
+from collections import Counter
+
+import pytest
+
+from password_engine import (AMBIGUOUS, DIGITS, LOWERCASE, SYMBOLS, UPPERCASE,
+                             PasswordEngine, PasswordPolicy, PolicySampler, RandomSource,
+                             build_pool, generate_to, open_private)
+
+
+def test_build_pool():
+    assert build_pool() == UPPERCASE + LOWERCASE + DIGITS + SYMBOLS
+    assert build_pool(upper=False, lower=False, symbols=False) == DIGITS
+    with pytest.raises(ValueError):
+        build_pool(False, False, False, False)
+
+
+@pytest.mark.parametrize("pool, length", [("", 12), ("aé", 12), ("ab", 0)])
+def test_engine_rejects_bad_arguments(pool, length):
+    with pytest.raises(ValueError):
+        PasswordEngine(pool, length)
+
+
+def test_generate_bytes_format():
+    engine = PasswordEngine("abc", length=7, block_size=16)
+    data = engine.generate_bytes(1000)
+    lines = data.split(b"\n")
+    assert lines[-1] == b"" and len(lines) == 1001
+    assert all(len(line) == 7 and set(line) <= set(b"abc") for line in lines[:-1])
+    assert engine.generate_bytes(0) == b""
+    assert [len(p) for p in engine.generate(3)] == [7, 7, 7]
+
+
+@pytest.mark.parametrize("pool", ["ab", "abc", build_pool(), "aab"])
+def test_characters_are_uniform(pool):
+    # 256 is not a multiple of most pool sizes, so plain modulo would favour
+    # the first characters
+    engine = PasswordEngine(pool, length=1)
+    distinct = "".join(dict.fromkeys(pool))
+    draws = 2000 * len(distinct)
+    counts = Counter(engine.random_chars(draws).decode("ascii"))
+    assert set(counts) == set(distinct)
+    expected = draws / len(distinct)
+    for count in counts.values():
+        assert abs(count - expected) < 5 * expected ** 0.5
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_generate_to(processes):
+    policy = PasswordPolicy(6, upper=False, lower=False, symbols=False)
+    out = io.BytesIO()
+    count, seconds = generate_to(out, policy, 2500, processes, batch=1000)
+    lines = out.getvalue().splitlines()
+    assert count == len(lines) == 2500 and seconds >= 0
+    assert all(len(line) == 6 and line.isdigit() for line in lines)
+
+
+def test_open_private(tmp_path):
+    path = tmp_path / "passwords.txt"
+    with open_private(str(path)) as out:
+        out.write(b"secret\n")
+    assert path.read_bytes() == b"secret\n"
+    assert path.stat().st_mode & 0o777 == 0o600
+
+
+def counts_by_class(password):
+    return [sum(ch in chars for ch in password)
+            for chars in (UPPERCASE, LOWERCASE, DIGITS, SYMBOLS)]
+
+
+def test_policy_minimums_are_always_met():
+    policy = PasswordPolicy(8, min_upper=2, min_lower=1, min_digits=3, min_symbols=2)
+    sampler = policy.compile()
+    assert isinstance(sampler, PolicySampler)
+    for password in sampler.generate(2000):
+        assert len(password) == 8
+        upper, lower, digits, symbols = counts_by_class(password)
+        assert upper >= 2 and lower >= 1 and digits >= 3 and symbols >= 2
+
+
+def test_policy_required_characters_land_anywhere():
+    # The shuffle moves the required digit away from the front
+    sampler = PasswordPolicy(4, upper=False, min_digits=1, symbols=False).compile()
+    positions = Counter(next(i for i, ch in enumerate(p) if ch.isdigit())
+                        for p in sampler.generate(2000) if sum(ch.isdigit() for ch in p) == 1)
+    assert set(positions) == {0, 1, 2, 3}
+
+
+def test_policy_length_range_and_no_repeats():
+    policy = PasswordPolicy(6, 10, upper=False, symbols=False, min_digits=4, no_repeats=True)
+    passwords = policy.compile().generate(2000)
+    assert {len(p) for p in passwords} == set(range(6, 11))
+    for password in passwords:
+        assert len(set(password)) == len(password)
+        assert counts_by_class(password)[2] >= 4
+
+
+def test_policy_exclusions():
+    policy = PasswordPolicy(20, exclude="abc", exclude_ambiguous=True, min_lower=5)
+    for password in policy.compile().generate(500):
+        assert not set(password) & set("abc" + AMBIGUOUS)
+
+
+def test_policy_without_rules_compiles_to_the_plain_engine():
+    engine = PasswordPolicy(16, symbols=False).compile()
+    assert isinstance(engine, PasswordEngine)
+    assert engine.pool == UPPERCASE + LOWERCASE + DIGITS
+
+
+def test_sampler_bytes_match_the_engine_format():
+    sampler = PasswordPolicy(5, min_upper=1).compile()
+    assert sampler.generate_bytes(0) == b""
+    lines = sampler.generate_bytes(3).split(b"\n")
+    assert lines[-1] == b"" and [len(line) for line in lines[:-1]] == [5, 5, 5]
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"upper": False, "lower": False, "digits": False, "symbols": False},
+    {"digits": False, "min_digits": 1},
+    {"exclude": DIGITS, "min_digits": 1},
+    {"min_upper": 7, "min_lower": 7},
+    {"length": 0},
+    {"length": 8, "max_length": 6},
+    {"upper": False, "lower": False, "symbols": False, "no_repeats": True},
+    {"min_digits": 11, "max_length": 30, "no_repeats": True},
+])
+def test_policy_rejects_impossible_rules(kwargs):
+    with pytest.raises(ValueError):
+        PasswordPolicy(**{"length": 12, **kwargs}).compile()
+
+
+def test_random_source_is_uniform_below_large_bounds():
+    source = RandomSource(block_size=64)
+    n = 3 * (1 << 20)
+    draws = [source.below(n) for _ in range(30000)]
+    assert all(0 <= d < n for d in draws)
+    thirds = Counter(d * 3 // n for d in draws)
+    for count in thirds.values():
+        assert abs(count - 10000) < 5 * 10000 ** 0.5
@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+from rps_ai import MarkovBot, MarkovPredictor
+from rps_engine import PAPER, ROCK, SCISSORS, play_match
+
+
+def test_no_prediction_before_data():
+    predictor = MarkovPredictor()
+    assert predictor.predict() is None
+    predictor.update(PAPER, ROCK)
+    assert predictor.predict() == PAPER
+
+
+def test_learns_a_cycle():
+    predictor = MarkovPredictor()
+    cycle = [ROCK, PAPER, SCISSORS]
+    for i in range(30):
+        predictor.update(cycle[i % 3], ROCK)
+    assert predictor.predict() == cycle[30 % 3]
+
+
+def test_adapts_when_the_player_changes_habits():
+    predictor = MarkovPredictor()
+    for _ in range(50):
+        predictor.update(ROCK, ROCK)
+    assert predictor.predict() == ROCK
+    for _ in range(10):
+        predictor.update(SCISSORS, ROCK)
+    assert predictor.predict() == SCISSORS
+
+
+def test_memory_does_not_grow():
+    predictor = MarkovPredictor(max_order=3)
+    size = len(predictor.counts)
+    assert size == 3 * (1 + 9 + 81 + 729)
+    rng = random.Random(0)
+    for _ in range(5000):
+        predictor.update(rng.randrange(3), rng.randrange(3))
+    assert len(predictor.counts) == size
+
+
+@pytest.mark.parametrize("opponent", ["rock", "cycle", "copy", "beat_last", "win_stay"])
+def test_beats_predictable_bots(opponent):
+    ties, wins, losses = play_match("markov", opponent, 5000, seed=11)
+    assert wins > 2 * losses
+
+
+def test_no_edge_against_random():
+    ties, wins, losses = play_match("markov", "random", 30000, seed=4)
+    assert abs(wins - losses) < 1000
+
+
+def test_bot_moves_are_valid():
+    bot = MarkovBot(random.Random(1))
+    for _ in range(100):
+        move = bot.move()
+        assert move in (ROCK, PAPER, SCISSORS)
+        bot.observe(move, ROCK)
+    assert bot.move() == PAPER  # beats the rock it keeps seeing
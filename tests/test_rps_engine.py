@@ -0,0 +1,64 @@
+import multiprocessing
+
+import pytest
+
+import rps_engine
+from rps_engine import (BEATS, LOSS, OUTCOMES, PAPER, ROCK, SCISSORS, STRATEGIES, TIE, WIN,
+                        load_numpy, main, play_match, simulate, tournament)
+
+
+def test_outcome_table():
+    assert OUTCOMES[PAPER][ROCK] == OUTCOMES[SCISSORS][PAPER] == OUTCOMES[ROCK][SCISSORS] == WIN
+    assert OUTCOMES[ROCK][PAPER] == OUTCOMES[PAPER][SCISSORS] == OUTCOMES[SCISSORS][ROCK] == LOSS
+    assert all(OUTCOMES[move][move] == TIE for move in range(3))
+    assert all(OUTCOMES[BEATS[move]][move] == WIN for move in range(3))
+
+
+@pytest.mark.parametrize("a, b", [("random", "random"), ("cycle", "copy"),
+                                  ("markov", "rock"), ("frequency", "win_stay")])
+def test_play_match(a, b):
+    counts = play_match(a, b, 3000, seed=7)
+    assert sum(counts) == 3000
+    assert play_match(a, b, 3000, seed=7) == counts
+
+
+def test_known_matchups():
+    assert play_match("beat_last", "rock", 1000, seed=1)[WIN] >= 999
+    assert play_match("rock", "rock", 1000, seed=1) == [1000, 0, 0]
+
+
+def test_tournament_is_symmetric():
+    names = ["rock", "cycle", "markov"]
+    win_rates, _ = tournament(names, 2000, seed=3)
+    for a in names:
+        for b in names:
+            assert 0 <= win_rates[a][b] + win_rates[b][a] <= 1
+    assert win_rates["markov"]["rock"] > 0.9
+
+
+def test_tournament_in_spawned_workers(monkeypatch):
+    # Workers started with spawn only import rps_engine, and must still
+    # find every strategy, including markov
+    monkeypatch.setattr(rps_engine.multiprocessing, "Pool",
+                        multiprocessing.get_context("spawn").Pool)
+    names = ["rock", "markov"]
+    assert tournament(names, 500, 2, seed=5)[0] == tournament(names, 500, 1, seed=5)[0]
+
+
+def test_cli_lists_every_strategy(capsys):
+    main(["-r", "300", "--seed", "1", "markov", "cycle"])
+    matrix = capsys.readouterr().out
+    assert "markov" in matrix and "cycle" in matrix
+    assert "markov" in STRATEGIES
+    with pytest.raises(SystemExit):
+        main(["nobody"])
+
+
+@pytest.mark.skipif(load_numpy() is None, reason="needs NumPy")
+def test_simulate():
+    counts = simulate(30000, seed=1, chunk_size=7000)
+    assert sum(counts) == 30000
+    assert all(abs(count - 10000) < 500 for count in counts)
+    assert simulate(1000, (1, 0, 0), (0, 1, 0), seed=1) == [0, 0, 1000]
+    # Two fixed mixes are played vectorized
+    assert play_match("rock", "random", 3000, seed=2)[TIE] == pytest.approx(1000, abs=150)
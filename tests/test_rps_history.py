@@ -0,0 +1,107 @@
+import json
+import random
+
+import pytest
+
+import rps_history
+from rps_engine import OUTCOMES, WIN
+from rps_history import GameHistory, GameStats, encode, summary
+
+
+def rounds(count, seed=0):
+    rng = random.Random(seed)
+    return [(rng.randrange(3), rng.randrange(3), rng.randrange(2)) for _ in range(count)]
+
+
+def expected_stats(played):
+    stats = GameStats()
+    stats.add(bytes(encode(*r) for r in played))
+    return stats
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "rps_history.bin")
+
+
+def test_encode_keeps_both_moves_and_the_opponent():
+    assert {encode(p, c, o) for p in range(3) for c in range(3) for o in range(2)} == \
+        set(range(9)) | set(range(16, 25))
+
+
+def test_stats_fold_one_round_at_a_time():
+    played = rounds(500)
+    whole = expected_stats(played)
+    single = GameStats()
+    for r in played:
+        single.add(bytes((encode(*r),)))
+    assert single.to_dict() == whole.to_dict()
+    assert whole.rounds == whole.offset == 500
+    assert sum(whole.results) == 500
+    assert whole.results[WIN] == sum(OUTCOMES[p][c] == WIN for p, c, _ in played)
+
+
+def test_streaks():
+    stats = GameStats()
+    # win, win, win, tie, loss, loss
+    stats.add(bytes(encode(p, c) for p, c in [(1, 0), (2, 1), (0, 2), (0, 0), (0, 1), (0, 1)]))
+    assert (stats.best_streak, stats.worst_streak, stats.streak) == (3, -2, -2)
+    assert stats.results == [1, 3, 2]
+
+
+def test_history_persists_and_reopens(path):
+    played = rounds(2500)
+    history = GameHistory(path)
+    for r in played:
+        history.record(*r)
+    history.close()
+    reopened = GameHistory(path)
+    try:
+        assert reopened.stats.to_dict() == expected_stats(played).to_dict()
+    finally:
+        reopened.close()
+
+
+def test_unsaved_rounds_are_recovered_from_the_log(path, monkeypatch):
+    # The sidecar is only saved every SAVE_EVERY rounds; a crash in between
+    # leaves it behind the log, and opening catches up
+    monkeypatch.setattr(rps_history, "SAVE_EVERY", 100)
+    played = rounds(250)
+    history = GameHistory(path)
+    for r in played:
+        history.record(*r)
+    history.log.close()  # no close(): the last 50 rounds are not in the sidecar
+    with open(path + ".stats") as f:
+        assert json.load(f)["offset"] == 200
+    reopened = GameHistory(path)
+    try:
+        assert reopened.stats.to_dict() == expected_stats(played).to_dict()
+    finally:
+        reopened.close()
+
+
+@pytest.mark.parametrize("sidecar", ["not json", '{"offset": 99999}', None])
+def test_bad_or_stale_sidecar_is_rebuilt(path, sidecar):
+    played = rounds(300)
+    history = GameHistory(path)
+    for r in played:
+        history.record(*r)
+    history.close()
+    if sidecar is None:
+        with open(path, "wb"):
+            pass  # log lost, sidecar ahead of it
+        played = []
+    else:
+        with open(path + ".stats", "w") as f:
+            f.write(sidecar)
+    reopened = GameHistory(path)
+    try:
+        assert reopened.stats.to_dict() == expected_stats(played).to_dict()
+    finally:
+        reopened.close()
+
+
+def test_summary():
+    assert summary(GameStats()) == "Lifetime: no rounds yet"
+    text = summary(expected_stats([(1, 0, 0), (0, 0, 0)]))
+    assert "2 rounds" in text and "50% won" in text and "R 50%  P 50%  S 0%" in text
@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from todo_index import InvertedIndex, tokenize
+from todo_store import open_store
+
+WORDS = ["buy", "milk", "bread", "call", "mum", "Mumbai", "trip", "tax", "taxes", "résumé"]
+
+
+def brute_force(tasks, query):
+    terms = tokenize(query)
+    return {todo_id for todo_id, text in tasks.items()
+            if all(any(token.startswith(term) for token in tokenize(text)) for term in terms)}
+
+
+def test_tokenize():
+    assert tokenize("Buy MILK, buy bread!") == {"buy", "milk", "bread"}
+
+
+def test_empty_query_means_no_filter():
+    assert InvertedIndex().search("  ,, ") is None
+
+
+def test_search_matches_brute_force():
+    rng = random.Random(0)
+    index = InvertedIndex()
+    tasks = {}
+    for step in range(3000):
+        todo_id = rng.randrange(300)
+        text = " ".join(rng.sample(WORDS, 3))
+        if todo_id in tasks and rng.random() < 0.3:
+            index.remove(todo_id, tasks.pop(todo_id))
+        elif todo_id in tasks:
+            index.update(todo_id, tasks[todo_id], text)
+            tasks[todo_id] = text
+        else:
+            index.add(todo_id, text)
+            tasks[todo_id] = text
+        if step % 30 == 0:
+            query = " ".join(rng.sample(["b", "mu", "MUM", "tax", "trip", "rés", "zz"], 2))
+            assert set(index.search(query)) == brute_force(tasks, query), query
+    # Words nobody uses any more leave the vocabulary
+    assert index.vocabulary == sorted(index.postings)
+
+
+@pytest.mark.parametrize("data_file", ["todos.json", "todos.db"])
+def test_store_views_combine_search_and_status(tmp_path, data_file):
+    store = open_store(str(tmp_path / data_file))
+    store.load()
+    store.add("Buy milk")
+    done = store.add("buy bread")
+    store.add("Call mum")
+    store.update(done, completed=True)
+    assert [todo["task"] for todo in store.view(None, "bu")] == ["Buy milk", "buy bread"]
+    assert [todo["task"] for todo in store.view("active", "bu")] == ["Buy milk"]
+    assert [todo["task"] for todo in store.view("completed", "bread")] == ["buy bread"]
+    assert len(store.view(None, "nothing")) == 0
+    # Edits are searchable straight away
+    store.update(store.view(None, "mum")[0], task="Call dad")
+    assert len(store.view(None, "mum")) == 0
+    assert [todo["task"] for todo in store.view(None, "dad")] == ["Call dad"]
+    store.close()
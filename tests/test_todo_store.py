@@ -0,0 +1,202 @@
+import io
+import json
+import random
+import time
+
+import pytest
+
+import todo_store
+from todo_store import (JournalStore, PersistenceWorker, SqliteTodoStore, iter_json_array,
+                        open_store, write_snapshot)
+
+
+def open_journal(path, **kwargs):
+    store = JournalStore(str(path), delay=0, **kwargs)
+    store.load()
+    return store
+
+
+def reopen(store):
+    store.close()
+    return open_journal(store.path)
+
+
+def random_edits(store, rng, steps):
+    # Applies random edits to store and returns the expected todo list
+    model = list(store.todos)
+    for step in range(steps):
+        choice = rng.random()
+        if choice < 0.5 or not model:
+            model.append(store.add(f"task {step}"))
+        elif choice < 0.8:
+            i = rng.randrange(len(model))
+            model[i] = store.update(model[i], completed=not model[i]["completed"])
+        elif choice < 0.97:
+            store.delete(model.pop(rng.randrange(len(model))))
+        else:
+            store.clear_completed()
+            model = [todo for todo in model if not todo["completed"]]
+        assert store.todos == model
+    return model
+
+
+@pytest.mark.parametrize("compact_bytes", [1 << 20, 2000])
+def test_reload_replays_journal(tmp_path, compact_bytes):
+    # With a small compact_bytes most changes end up in snapshots
+    store = open_journal(tmp_path / "todos.json", compact_bytes=compact_bytes)
+    model = random_edits(store, random.Random(0), 3000)
+    store = reopen(store)
+    assert store.todos == model
+    assert [store.get(todo["id"]) for todo in model] == model
+    # Ids keep growing after a reload
+    assert store.add("new")["id"] > max(todo["id"] for todo in model)
+    store.close()
+
+
+def test_replay_over_newer_snapshot(tmp_path):
+    # A crash after the snapshot is written but before the journal is
+    # truncated replays records already in it; they must be no-ops
+    path = tmp_path / "todos.json"
+    store = open_journal(path)
+    model = random_edits(store, random.Random(1), 500)
+    store.sync()
+    journal = (tmp_path / "todos.json.journal").read_bytes()
+    store.compact()
+    store.close()
+    (tmp_path / "todos.json.journal").write_bytes(journal)
+    store = open_journal(path)
+    assert store.todos == model
+    store.close()
+
+
+def test_torn_journal_tail_is_dropped(tmp_path):
+    path = tmp_path / "todos.json"
+    store = open_journal(path)
+    model = random_edits(store, random.Random(2), 200)
+    store.close()
+    journal = tmp_path / "todos.json.journal"
+    intact = journal.stat().st_size
+    with open(journal, "a") as f:
+        f.write('{"op":"add","id":99999,"task":"half wr')
+
+    store = open_journal(path)
+    assert store.todos == model
+    assert journal.stat().st_size == intact
+    # New records start on a clean line and survive the next reload
+    model.append(store.add("after the tear"))
+    store = reopen(store)
+    assert store.todos == model
+    store.close()
+
+
+def test_loads_files_without_ids(tmp_path):
+    path = tmp_path / "todos.json"
+    write_snapshot(str(path), [{"task": "a", "completed": False}, {"task": "b", "completed": True},
+                               {"id": 1, "task": "c", "completed": False}])
+    store = open_journal(path)
+    assert [todo["id"] for todo in store.todos] == [1, 2, 3]
+    assert [todo["task"] for todo in store.todos] == ["a", "b", "c"]
+    store.close()
+
+
+def test_snapshot_keeps_original_format(tmp_path):
+    path = tmp_path / "todos.json"
+    store = open_journal(path)
+    store.add("write tests")
+    store.compact()
+    store.close()
+    with open(path) as f:
+        assert json.load(f) == [{"id": 1, "task": "write tests", "completed": False}]
+
+
+def test_open_store_picks_backend_by_extension(tmp_path):
+    assert isinstance(open_store(str(tmp_path / "todos.json")), JournalStore)
+    assert isinstance(open_store(str(tmp_path / "todos.db")), SqliteTodoStore)
+
+
+def test_sqlite_store_filters_and_pages(tmp_path):
+    store = open_store(str(tmp_path / "todos.db"))
+    store.PAGE_SIZE = 8  # several pages with few rows
+    store.load()
+    todos = [store.add(f"task {n}") for n in range(30)]
+    for todo in todos[::3]:
+        store.update(todo, completed=True)
+    assert len(store.view()) == 30
+    assert len(store.view("completed")) == 10
+    assert [todo["task"] for todo in store.view("active")[:3]] == ["task 1", "task 2", "task 4"]
+    assert store.view()[-1]["task"] == "task 29"
+    assert [todo["id"] for todo in store.view()] == [todo["id"] for todo in todos]
+
+    store.delete(store.get(todos[1]["id"]))
+    assert store.get(todos[1]["id"]) is None
+    assert len(store.view("active")) == 19
+    assert store.clear_completed() == 10
+    assert len(store.view()) == len(store.view("active")) == 19
+    store.close()
+
+    store = open_store(str(tmp_path / "todos.db"))
+    store.load()
+    assert [todo["task"] for todo in store.view()[:2]] == ["task 2", "task 4"]
+    store.close()
+
+
+def test_sqlite_view_rejects_out_of_range_rows(tmp_path):
+    store = open_store(str(tmp_path / "todos.db"))
+    store.load()
+    store.add("only")
+    rows = store.view()
+    assert rows[-1] == rows[0]
+    with pytest.raises(IndexError):
+        rows[1]
+    store.close()
+
+
+def test_worker_writes_a_steady_stream_of_edits(tmp_path):
+    # Records arriving faster than delay must not be held back forever
+    journal = tmp_path / "todos.json.journal"
+    worker = PersistenceWorker(str(tmp_path / "todos.json"), str(journal),
+                               delay=0.2, max_wait=0.3)
+    try:
+        deadline = time.monotonic() + 1.5
+        written = 0
+        while time.monotonic() < deadline and not written:
+            worker.append('{"op":"del","ids":[]}\n')
+            time.sleep(0.05)
+            written = journal.stat().st_size
+        assert written
+    finally:
+        worker.close()
+
+
+def test_worker_survives_unexpected_errors(tmp_path, monkeypatch):
+    journal = tmp_path / "todos.json.journal"
+    worker = PersistenceWorker(str(tmp_path / "todos.json"), str(journal), delay=0)
+
+    def broken_snapshot(path, todos):
+        raise TypeError("not serializable")
+
+    monkeypatch.setattr(todo_store, "write_snapshot", broken_snapshot)
+    worker.snapshot([])
+    worker.flush()  # returns instead of waiting on a dead thread
+    assert isinstance(worker.error, TypeError)
+    worker.append("still written\n")
+    worker.close()
+    assert journal.read_text() == "still written\n"
+
+
+ARRAY = '[1.5, 2e3 ,-7, true, null, "a,]b", {"x": [1, 2]}, [3], 12345678901234567890]'
+
+
+@pytest.mark.parametrize("block_size", [1, 2, 3, 7, 1 << 16])
+def test_iter_json_array_across_block_boundaries(block_size):
+    items = list(iter_json_array(io.StringIO(ARRAY), block_size))
+    assert items == json.loads(ARRAY)
+    assert list(iter_json_array(io.StringIO(" [ ] "), block_size)) == []
+    assert list(iter_json_array(io.StringIO(""), block_size)) == []
+
+
+@pytest.mark.parametrize("text", ["[1 2]", "[1,,2]", "[1,]", "[,1]", "[1", "[1,2", "1", "{}"])
+@pytest.mark.parametrize("block_size", [1, 3, 1 << 16])
+def test_iter_json_array_rejects_malformed_input(text, block_size):
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO(text), block_size))
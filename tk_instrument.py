@@ -0,0 +1,205 @@
+import atexit
+import functools
+import json
+import os
+import sys
+import time
+import tkinter
+
+# Opt-in event-loop instrumentation for the Tk apps. With TK_INSTRUMENT set
+# (to an output path, or to 1 for tk_trace.json), every Tk callback --
+# button commands, event bindings, after() jobs, variable traces -- is
+# timed and the Tk calls it makes are counted; a heartbeat after() probe
+# records mainloop stalls. At exit everything is written as Chrome trace
+# event JSON (open it in Perfetto, chrome://tracing or speedscope): slow
+# calls and stalls as trace events, per-handler histograms under
+# "otherData". Must be installed before the Tk root is created.
+
+DEFAULT_PATH = "tk_trace.json"
+BUCKETS_MS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)  # histogram upper bounds
+MAX_EVENTS = 100000  # trace events kept, oldest first
+
+_original_register = tkinter.Misc._register
+_original_variable_register = tkinter.Variable._register
+_original_tk_init = tkinter.Tk.__init__
+_recorder = None
+
+
+class TkProxy:
+    # Stands in for a Tk interpreter (widget.tk) and counts call(), which is
+    # how tkinter issues every Tcl command; everything else is passed through
+    def __init__(self, tkapp, recorder):
+        self._tkapp = tkapp
+        self._recorder = recorder
+
+    def call(self, *args):
+        self._recorder.tk_calls += 1
+        return self._tkapp.call(*args)
+
+    def __getattr__(self, name):
+        value = getattr(self._tkapp, name)
+        setattr(self, name, value)  # later lookups skip __getattr__
+        return value
+
+
+class Recorder:
+    def __init__(self, path, slow_ms=16.0, stall_ms=100.0, heartbeat_ms=50):
+        self.path = path
+        self.slow = slow_ms / 1000
+        self.stall = stall_ms / 1000
+        self.heartbeat = heartbeat_ms
+        self.start = time.perf_counter()
+        self.handlers = {}  # name -> [calls, seconds, max seconds, tk calls, buckets]
+        self.events = []
+        self.stalls = 0
+        self.tk_calls = 0
+        self.depth = 0  # nested handlers (e.g. update() inside a handler)
+        self.longest = (None, 0.0)  # longest handler since the last probe
+
+    def wrap(self, func, name):
+        @functools.wraps(func)
+        def timed(*args):
+            start = time.perf_counter()
+            calls = self.tk_calls
+            self.depth += 1
+            try:
+                return func(*args)
+            finally:
+                self.depth -= 1
+                self.record(name, start, time.perf_counter() - start, self.tk_calls - calls)
+        return timed
+
+    def record(self, name, start, seconds, tk_calls):
+        stats = self.handlers.get(name)
+        if stats is None:
+            stats = self.handlers[name] = [0, 0.0, 0.0, 0, [0] * (len(BUCKETS_MS) + 1)]
+        stats[0] += 1
+        stats[1] += seconds
+        stats[2] = max(stats[2], seconds)
+        stats[3] += tk_calls
+        ms = seconds * 1000
+        bucket = 0
+        while bucket < len(BUCKETS_MS) and ms > BUCKETS_MS[bucket]:
+            bucket += 1
+        stats[4][bucket] += 1
+
+        if self.depth == 0 and seconds > self.longest[1]:
+            self.longest = (name, seconds)
+        if seconds >= self.slow:
+            self.event(name, "handler", start, seconds, {"tk_calls": tk_calls})
+
+    def event(self, name, category, start, seconds, args):
+        if len(self.events) < MAX_EVENTS:
+            self.events.append({
+                "name": name, "cat": category, "ph": "X", "pid": os.getpid(), "tid": 1,
+                "ts": round((start - self.start) * 1e6), "dur": round(seconds * 1e6),
+                "args": args,
+            })
+
+    def start_heartbeat(self, root):
+        # One Tcl command re-armed with a raw "after", so the probe is
+        # neither timed as a handler nor counted as Tk calls
+        tkapp = root.tk._tkapp
+        name = _original_register(root, lambda: self.probe(tkapp, name))
+        self.expected = time.perf_counter() + self.heartbeat / 1000
+        tkapp.call("after", self.heartbeat, name)
+
+    def probe(self, tkapp, name):
+        now = time.perf_counter()
+        late = now - self.expected
+        if late >= self.stall:
+            self.stalls += 1
+            handler, seconds = self.longest
+            self.event("stall", "stall", self.expected, late,
+                       {"longest_handler": handler, "handler_ms": round(seconds * 1000, 1)})
+        self.longest = (None, 0.0)
+        self.expected = now + self.heartbeat / 1000
+        tkapp.call("after", self.heartbeat, name)
+
+    def histograms(self):
+        labels = [f"<={ms}ms" for ms in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"]
+        return {
+            name: {
+                "calls": calls, "total_ms": round(seconds * 1000, 3),
+                "max_ms": round(longest * 1000, 3), "tk_calls": tk_calls,
+                "histogram": dict(zip(labels, buckets)),
+            }
+            for name, (calls, seconds, longest, tk_calls, buckets) in self.handlers.items()
+        }
+
+    def export(self, path=None):
+        trace = {
+            "traceEvents": [{"name": "process_name", "ph": "M", "pid": os.getpid(),
+                             "args": {"name": os.path.basename(sys.argv[0])}}] + self.events,
+            "displayTimeUnit": "ms",
+            "otherData": {"handlers": self.histograms(), "stalls": self.stalls},
+        }
+        with open(path or self.path, "w") as f:
+            json.dump(trace, f)
+
+    def summary(self, limit=15):
+        rows = sorted(self.handlers.items(), key=lambda item: item[1][1], reverse=True)
+        lines = [f"{'handler':<48} {'calls':>7} {'total ms':>9} {'max ms':>8} {'tk/call':>8}"]
+        for name, (calls, seconds, longest, tk_calls, _) in rows[:limit]:
+            lines.append(f"{name[-48:]:<48} {calls:>7} {seconds * 1000:>9.1f} "
+                         f"{longest * 1000:>8.1f} {tk_calls / calls:>8.1f}")
+        lines.append(f"{self.stalls} mainloop stalls over {self.stall * 1000:.0f} ms")
+        return "\n".join(lines)
+
+
+def handler_name(func):
+    # "Class.method" or "module.function", with the line for lambdas; after()
+    # jobs are named after the function they run, not tkinter's wrapper
+    func = getattr(func, "__func__", func)
+    code = getattr(func, "__code__", None)
+    if code is not None and code.co_name == "callit" and "func" in code.co_freevars:
+        return handler_name(func.__closure__[code.co_freevars.index("func")].cell_contents)
+    qualname = getattr(func, "__qualname__", None) or type(func).__qualname__
+    name = f"{getattr(func, '__module__', None) or '?'}.{qualname}"
+    if "<lambda>" in qualname and code is not None:
+        name += f":{code.co_firstlineno}"
+    return name
+
+
+def _register(self, func, subst=None, needcleanup=1):
+    return _original_register(self, _recorder.wrap(func, handler_name(func)), subst, needcleanup)
+
+
+def _variable_register(self, callback):
+    # Variable traces are registered separately from widget callbacks
+    return _original_variable_register(self, _recorder.wrap(callback, handler_name(callback)))
+
+
+def _tk_init(self, *args, **kwargs):
+    _original_tk_init(self, *args, **kwargs)
+    self.tk = TkProxy(self.tk, _recorder)
+    _recorder.start_heartbeat(self)
+
+
+def install(path=DEFAULT_PATH, slow_ms=16.0, stall_ms=100.0, heartbeat_ms=50):
+    # Patch tkinter for this process and export the trace at exit
+    global _recorder
+    if _recorder is None:
+        _recorder = Recorder(path, slow_ms, stall_ms, heartbeat_ms)
+        tkinter.Misc._register = _register
+        tkinter.Variable._register = _variable_register
+        tkinter.Tk.__init__ = _tk_init
+        atexit.register(_finish)
+    return _recorder
+
+
+def install_from_env():
+    # Installs only if TK_INSTRUMENT is set; thresholds from
+    # TK_INSTRUMENT_SLOW_MS and TK_INSTRUMENT_STALL_MS
+    path = os.environ.get("TK_INSTRUMENT")
+    if not path:
+        return None
+    return install(DEFAULT_PATH if path == "1" else path,
+                   float(os.environ.get("TK_INSTRUMENT_SLOW_MS", 16)),
+                   float(os.environ.get("TK_INSTRUMENT_STALL_MS", 100)))
+
+
+def _finish():
+    _recorder.export()
+    print(_recorder.summary(), file=sys.stderr)
+    print(f"trace written to {_recorder.path}", file=sys.stderr)
@@ -0,0 +1,23 @@
+from tkinter import font as tkfont
+from tkinter import ttk
+
+# Fonts and ttk styles are per Tk interpreter, and every app window in the
+# launcher shares one, so each is created the first time it is asked for
+# and reused by every later window (and every reopen of the same app)
+_fonts = {}
+_styles = set()
+
+
+def font(size, weight="normal"):
+    key = (size, weight)
+    if key not in _fonts:
+        _fonts[key] = tkfont.Font(size=size, weight=weight)
+    return _fonts[key]
+
+
+def style(name, configure):
+    # configure(ttk.Style()) sets up the named style, once per process
+    if name not in _styles:
+        configure(ttk.Style())
+        _styles.add(name)
+    return name
@@ -0,0 +1,69 @@
+import re
+from bisect import bisect_left, insort
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return set(TOKEN_RE.findall(text.casefold()))
+
+
+class InvertedIndex:
+    # Maps each word to the set of task ids containing it. The vocabulary is
+    # also kept sorted so a query word matches every token it is a prefix
+    # of with two bisections. Updates touch only the words of one task.
+    def __init__(self):
+        self.postings = {}
+        self.vocabulary = []
+
+    def add(self, todo_id, text):
+        for token in tokenize(text):
+            ids = self.postings.get(token)
+            if ids is None:
+                ids = self.postings[token] = set()
+                insort(self.vocabulary, token)
+            ids.add(todo_id)
+
+    def remove(self, todo_id, text):
+        for token in tokenize(text):
+            ids = self.postings.get(token)
+            if ids is None:
+                continue
+            ids.discard(todo_id)
+            if not ids:
+                del self.postings[token]
+                del self.vocabulary[bisect_left(self.vocabulary, token)]
+
+    def update(self, todo_id, old_text, new_text):
+        old, new = tokenize(old_text), tokenize(new_text)
+        if old != new:
+            self.remove(todo_id, " ".join(old - new))
+            self.add(todo_id, " ".join(new - old))
+
+    def prefix_matches(self, prefix):
+        # Union of the postings of every token starting with prefix
+        start = bisect_left(self.vocabulary, prefix)
+        stop = bisect_left(self.vocabulary, prefix + "\U0010ffff", start)
+        if stop - start == 1:
+            return self.postings[self.vocabulary[start]]
+        ids = set()
+        for token in self.vocabulary[start:stop]:
+            ids |= self.postings[token]
+        return ids
+
+    def search(self, query):
+        # Ids of tasks containing a word starting with every query word, or
+        # None for an empty query (no filtering). The result may be a live
+        # posting set and must not be modified.
+        terms = TOKEN_RE.findall(query.casefold())
+        if not terms:
+            return None
+        # Longest terms first: they tend to be the most selective
+        terms.sort(key=len, reverse=True)
+        result = None
+        for term in terms:
+            ids = self.prefix_matches(term)
+            result = ids if result is None else result & ids
+            if not result:
+                break
+        return result
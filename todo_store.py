@@ -0,0 +1,596 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import traceback
+
+from todo_index import InvertedIndex, tokenize
+
+# Filters understood by store.view(): None (all), "active" or "completed"
+STATUS_COMPLETED = {"active": False, "completed": True}
+
+
+def open_store(path):
+    # SQLite for .db files, the JSON snapshot + journal format otherwise
+    if path.endswith((".db", ".sqlite", ".sqlite3")):
+        return SqliteTodoStore(path)
+    return JournalStore(path)
+
+
+class JournalStore:
+    # Keeps todos in memory and persists them as a JSON snapshot (the
+    # original todos.json format, plus an "id" per task) followed by an
+    # append-only journal of mutations. Each click appends one small line
+    # instead of rewriting the whole file; once the journal grows past
+    # compact_bytes it is folded into a fresh snapshot. All file I/O runs on
+    # a PersistenceWorker thread, never in the Tk callback.
+    #
+    # Journal records are idempotent ("add" and "set" overwrite, "del"
+    # removes), so replaying a journal that is already part of the snapshot
+    # is harmless. This is what makes compaction crash-safe.
+
+    # Single deletes between full position rebuilds
+    MAX_SHIFTED = 128
+
+    def __init__(self, path, delay=0.25, compact_bytes=1 << 20):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.delay = delay
+        self.compact_bytes = compact_bytes
+
+        # Todos in display order. Dicts are replaced, never mutated, so a
+        # shallow copy of the list is a consistent snapshot.
+        self.todos = []
+        self.by_id = {}
+        # id -> index in todos. Deleting shifts everything after the hole,
+        # so instead of renumbering on every delete a stored index may run
+        # up to self._shifted entries ahead; see _locate.
+        self.positions = {}
+        self._shifted = 0
+        self.next_id = 1
+        self._version = 0  # bumped on every change, invalidates filtered views
+        self._views = {}
+        self.index = InvertedIndex()  # task words -> ids, for search
+
+        self._worker = None
+        self._journal_bytes = 0
+
+    # Loading
+
+    def load(self):
+        for _ in self.iter_load():
+            pass
+        return self.todos
+
+    def iter_load(self, chunk_size=2000):
+        # Stream the snapshot, yielding after every chunk_size tasks so a UI
+        # can show the first rows long before a big file is fully parsed.
+        # The store must not be modified until the generator is exhausted.
+        self.todos.clear()
+        self.by_id.clear()
+        self.positions.clear()
+        self._shifted = 0
+        self.index = InvertedIndex()
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, "r") as f:
+                    for position, todo in enumerate(iter_json_array(f)):
+                        self._load_todo(todo, position)
+                        if (position + 1) % chunk_size == 0:
+                            yield len(self.todos)
+            except (OSError, ValueError):
+                pass  # keep whatever was read before the damage
+        self._replay(self.journal_path)
+        self._journal_bytes = os.path.getsize(self.journal_path) if os.path.exists(
+            self.journal_path) else 0
+        self._worker = PersistenceWorker(self.path, self.journal_path, self.delay)
+        yield len(self.todos)
+
+    def _load_todo(self, todo, position):
+        # Files written before ids existed get position-based ids
+        todo_id = todo.get("id")
+        if not isinstance(todo_id, int) or todo_id in self.by_id:
+            todo_id = position + 1
+            while todo_id in self.by_id:
+                todo_id += 1
+        todo = {"id": todo_id, "task": todo.get("task", ""),
+                "completed": bool(todo.get("completed", False))}
+        self._put(todo)
+
+    def _replay(self, path):
+        if not os.path.exists(path):
+            return False
+        valid_bytes = 0
+        with open(path, "rb+") as f:
+            for line in f:
+                try:
+                    record = json.loads(line) if line.endswith(b"\n") else None
+                except ValueError:
+                    record = None
+                if record is None:
+                    break  # torn write at the end of the journal
+                self._apply(record)
+                valid_bytes += len(line)
+            # Drop the torn tail so new records start on a clean line
+            f.truncate(valid_bytes)
+        return True
+
+    def _apply(self, record):
+        op = record.get("op")
+        if op == "add":
+            self._put({"id": record["id"], "task": record["task"],
+                       "completed": record["completed"]})
+        elif op == "set":
+            todo = self.by_id.get(record["id"])
+            if todo is not None:
+                fields = {k: v for k, v in record.items() if k in ("task", "completed")}
+                self._replace(todo, dict(todo, **fields))
+        elif op == "del":
+            self._discard(set(record["ids"]))
+
+    def get(self, todo_id):
+        return self.by_id.get(todo_id)
+
+    def view(self, status=None, query=""):
+        # Rows matching a status filter and search query, in display order
+        ids = self.index.search(query) if query else None
+        if status is None and ids is None:
+            return self.todos
+        key = (status, query)
+        cached = self._views.get(key)
+        if cached is None or cached[0] != self._version:
+            rows = self.view(status) if ids is not None else self.todos
+            if ids is None:
+                completed = STATUS_COMPLETED[status]
+                rows = [todo for todo in rows if todo["completed"] == completed]
+            elif len(ids) * 8 > len(rows):
+                rows = [todo for todo in rows if todo["id"] in ids]
+            else:
+                # Few hits: ids grow with insertion, so id order is display order
+                rows = [self.by_id[todo_id] for todo_id in sorted(ids)]
+                if status is not None:
+                    completed = STATUS_COMPLETED[status]
+                    rows = [todo for todo in rows if todo["completed"] == completed]
+            if len(self._views) > 16:
+                self._views.clear()
+            cached = self._views[key] = (self._version, rows)
+        return cached[1]
+
+    def _put(self, todo):
+        self._version += 1
+        existing = self.by_id.get(todo["id"])
+        if existing is not None:
+            self._replace(existing, todo)
+        else:
+            self.positions[todo["id"]] = len(self.todos)
+            self.todos.append(todo)
+            self.by_id[todo["id"]] = todo
+            self.index.add(todo["id"], todo["task"])
+        self.next_id = max(self.next_id, todo["id"] + 1)
+
+    def _locate(self, todo_id):
+        # Index of a stored todo: at or at most self._shifted entries before
+        # its recorded position
+        todos = self.todos
+        position = self.positions[todo_id]
+        for i in range(min(position, len(todos) - 1), max(position - self._shifted, 0) - 1, -1):
+            if todos[i]["id"] == todo_id:
+                self.positions[todo_id] = i
+                return i
+        self._reindex()
+        return self.positions[todo_id]
+
+    def _reindex(self):
+        self.positions = {todo["id"]: i for i, todo in enumerate(self.todos)}
+        self._shifted = 0
+
+    def _replace(self, old, new):
+        self._version += 1
+        self.todos[self._locate(old["id"])] = new
+        self.by_id[new["id"]] = new
+        if old["task"] != new["task"]:
+            self.index.update(new["id"], old["task"], new["task"])
+
+    def _discard(self, ids):
+        ids = {todo_id for todo_id in ids if todo_id in self.by_id}
+        if len(ids) == 1:
+            (todo_id,) = ids
+            del self.todos[self._locate(todo_id)]
+            del self.positions[todo_id]
+            self._shifted += 1
+            if self._shifted > self.MAX_SHIFTED:
+                self._reindex()
+        elif ids:
+            self.todos[:] = [todo for todo in self.todos if todo["id"] not in ids]
+            self._reindex()
+        if ids:
+            self._version += 1
+            for todo_id in ids:
+                self.index.remove(todo_id, self.by_id.pop(todo_id)["task"])
+        return ids
+
+    # Mutations
+
+    def add(self, task):
+        todo = {"id": self.next_id, "task": task, "completed": False}
+        self._put(todo)
+        self._append(dict(todo, op="add"))
+        return todo
+
+    def update(self, todo, **fields):
+        new = dict(todo, **fields)
+        self._replace(todo, new)
+        self._append(dict(fields, op="set", id=todo["id"]))
+        return new
+
+    def delete(self, todo):
+        self._discard({todo["id"]})
+        self._append({"op": "del", "ids": [todo["id"]]})
+
+    def clear_completed(self):
+        ids = self._discard({todo["id"] for todo in self.todos if todo["completed"]})
+        if ids:
+            self._append({"op": "del", "ids": sorted(ids)})
+        return len(ids)
+
+    # Persistence
+
+    def _append(self, record):
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        self._worker.append(line)
+        self._journal_bytes += len(line)
+        if self._journal_bytes >= self.compact_bytes:
+            self.compact()
+
+    def compact(self):
+        # The worker writes the snapshot after every record queued before it
+        self._worker.snapshot(list(self.todos))
+        self._journal_bytes = 0
+
+    def sync(self):
+        # Block until everything queued so far is on disk
+        self._worker.flush()
+
+    def close(self):
+        if self._worker is not None:
+            self._worker.close()
+            self._worker = None
+
+
+class PersistenceWorker:
+    # Background writer for JournalStore. Journal lines queued within `delay`
+    # seconds of each other are coalesced into one write and one fsync, and
+    # snapshots are serialized here from the list handed over by the caller.
+    # A steady stream of edits is still written at least every max_wait
+    # seconds.
+    def __init__(self, path, journal_path, delay=0.25, max_wait=2.0):
+        self.path = path
+        self.journal_path = journal_path
+        self.delay = delay
+        self.max_wait = max_wait
+        self.error = None  # last write error, if any
+        self.queue = queue.Queue()
+        self.journal = open(journal_path, "a")
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def append(self, line):
+        self.queue.put(("line", line))
+
+    def snapshot(self, todos):
+        self.queue.put(("snapshot", todos))
+
+    def flush(self):
+        done = threading.Event()
+        self.queue.put(("flush", done))
+        while not done.wait(0.5):
+            if not self.thread.is_alive():
+                break  # nobody left to signal us
+
+    def close(self):
+        self.queue.put(("stop", None))
+        self.thread.join()
+        self.journal.close()
+
+    def run(self):
+        while True:
+            batch = [self.queue.get()]
+            # Debounce: keep collecting until the queue stays quiet for
+            # `delay` seconds, unless someone is waiting on us or the first
+            # record has waited max_wait seconds
+            deadline = time.monotonic() + self.max_wait
+            while batch[-1][0] in ("line", "snapshot"):
+                timeout = min(self.delay, deadline - time.monotonic())
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            try:
+                if not self.process(batch):
+                    return
+            except Exception as e:
+                # Any error, not just OSError: the thread must survive it
+                traceback.print_exc()
+                self.error = e
+                # Never leave a flush() or close() caller waiting
+                kind, payload = batch[-1]
+                if kind == "flush":
+                    payload.set()
+                elif kind == "stop":
+                    return
+
+    def process(self, batch):
+        lines = []
+        for kind, payload in batch:
+            if kind == "line":
+                lines.append(payload)
+                continue
+            self.write_lines(lines)
+            lines = []
+            if kind == "snapshot":
+                write_snapshot(self.path, payload)
+                # Everything journaled so far is now in the snapshot
+                self.journal.truncate(0)
+            elif kind == "flush":
+                payload.set()
+            elif kind == "stop":
+                return False
+        self.write_lines(lines)
+        return True
+
+    def write_lines(self, lines):
+        if lines:
+            self.journal.write("".join(lines))
+            self.journal.flush()
+            os.fsync(self.journal.fileno())
+
+
+def iter_json_array(f, block_size=1 << 16):
+    # Incrementally parse a top-level JSON array, yielding one element at a
+    # time while holding only a block or so of text in memory
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+    expect = None  # "[" at the start, then "first", "item" (after a comma) or "comma"
+    while True:
+        while pos < len(buf) and buf[pos].isspace():
+            pos += 1
+        if pos >= len(buf) - 1 and not eof:
+            # Need more text (an element may also end exactly here)
+            block = f.read(block_size)
+            eof = not block
+            buf = buf[pos:] + block
+            pos = 0
+            continue
+        if pos >= len(buf):
+            if expect is not None:
+                raise ValueError("unterminated JSON array")
+            return  # empty file
+        char = buf[pos]
+        if expect is None:
+            if char != "[":
+                raise ValueError("expected a JSON array")
+            expect = "first"
+            pos += 1
+            continue
+        if expect == "comma" or (expect == "first" and char == "]"):
+            if char == "]":
+                return
+            if char != ",":
+                raise ValueError(f"expected ',' or ']' at {char!r}")
+            expect = "item"
+            pos += 1
+            continue
+        try:
+            item, end = decoder.raw_decode(buf, pos)
+        except ValueError:
+            if eof:
+                raise
+            end = len(buf)
+        # Only accept an element once the delimiter after it has been read:
+        # a number cut off at the block boundary ("1." of "1.5") decodes too
+        after = end
+        while after < len(buf) and buf[after].isspace():
+            after += 1
+        if not eof and (after >= len(buf) or buf[after] not in ",]"):
+            block = f.read(block_size)
+            eof = not block
+            buf = buf[pos:] + block
+            pos = 0
+            continue
+        yield item
+        pos = end
+        expect = "comma"
+
+
+def write_snapshot(path, todos):
+    # Write to a temp file and atomically swap it in, so a crash leaves
+    # either the old or the new snapshot, never a truncated one
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(todos, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class SqliteTodoStore:
+    # Same interface as JournalStore, backed by SQLite with stable primary
+    # keys. Nothing is loaded up front: views are lazy sequences that fetch
+    # pages of rows on demand through the (completed, created) indexes, so
+    # the window opens immediately even on a million-task database.
+    PAGE_SIZE = 256
+    MAX_CACHED_PAGES = 64
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = None
+        self._counts = {}
+        self._pages = {}
+
+    def iter_load(self, chunk_size=None):
+        # Nothing to stream: rows are paged in on demand
+        self.load()
+        yield self.count()
+
+    def load(self):
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS todos (
+                id INTEGER PRIMARY KEY,
+                task TEXT NOT NULL,
+                completed INTEGER NOT NULL DEFAULT 0,
+                created REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_todos_created ON todos (created, id);
+            CREATE INDEX IF NOT EXISTS idx_todos_completed ON todos (completed, created, id);
+            CREATE TABLE IF NOT EXISTS todo_tokens (
+                token TEXT NOT NULL,
+                todo_id INTEGER NOT NULL,
+                PRIMARY KEY (token, todo_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_todo_tokens_id ON todo_tokens (todo_id);
+        """)
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] < 1:
+            # Databases from before search: build the token index once
+            rows = self.conn.execute("SELECT id, task FROM todos").fetchall()
+            for todo_id, task in rows:
+                self._index(todo_id, task)
+            self.conn.execute("PRAGMA user_version = 1")
+            self.conn.commit()
+        return self.view()
+
+    def get(self, todo_id):
+        row = self.conn.execute(
+            "SELECT id, task, completed FROM todos WHERE id = ?", (todo_id,)).fetchone()
+        return self._todo(row) if row else None
+
+    def view(self, status=None, query=""):
+        terms = sorted(tokenize(query)) if query else []
+        return _QueryRows(self, (status, " ".join(terms)))
+
+    def _todo(self, row):
+        return {"id": row[0], "task": row[1], "completed": bool(row[2])}
+
+    def _where(self, key):
+        # key is (status, space-separated search terms)
+        status, query = key
+        conditions, params = [], []
+        if status is not None:
+            conditions.append("completed = ?")
+            params.append(int(STATUS_COMPLETED[status]))
+        for term in query.split():
+            # Prefix match through the (token, todo_id) primary key
+            conditions.append("id IN (SELECT todo_id FROM todo_tokens "
+                              "WHERE token >= ? AND token < ?)")
+            params += [term, term + "\U0010ffff"]
+        if not conditions:
+            return "", ()
+        return "WHERE " + " AND ".join(conditions), tuple(params)
+
+    def _index(self, todo_id, task):
+        self.conn.executemany("INSERT OR IGNORE INTO todo_tokens (token, todo_id) VALUES (?, ?)",
+                              [(token, todo_id) for token in tokenize(task)])
+
+    def count(self, key=(None, "")):
+        if key not in self._counts:
+            where, params = self._where(key)
+            self._counts[key] = self.conn.execute(
+                f"SELECT COUNT(*) FROM todos {where}", params).fetchone()[0]
+        return self._counts[key]
+
+    def page(self, key, number):
+        page_key = (key, number)
+        if page_key not in self._pages:
+            if len(self._pages) >= self.MAX_CACHED_PAGES:
+                del self._pages[next(iter(self._pages))]
+            where, params = self._where(key)
+            rows = self.conn.execute(
+                f"SELECT id, task, completed FROM todos {where} "
+                "ORDER BY created, id LIMIT ? OFFSET ?",
+                params + (self.PAGE_SIZE, number * self.PAGE_SIZE)).fetchall()
+            self._pages[page_key] = [self._todo(row) for row in rows]
+        return self._pages[page_key]
+
+    def _changed(self, counts=()):
+        # Cached pages may have shifted; cached status counts are adjusted in
+        # place rather than recounted, search counts are dropped
+        self._pages.clear()
+        self._counts = {key: n for key, n in self._counts.items() if not key[1]}
+        for status, delta in counts:
+            if (status, "") in self._counts:
+                self._counts[status, ""] += delta
+
+    def _status(self, completed):
+        return "completed" if completed else "active"
+
+    def add(self, task):
+        cursor = self.conn.execute(
+            "INSERT INTO todos (task, completed, created) VALUES (?, 0, ?)",
+            (task, time.time()))
+        self._index(cursor.lastrowid, task)
+        self.conn.commit()
+        self._changed([(None, 1), ("active", 1)])
+        return {"id": cursor.lastrowid, "task": task, "completed": False}
+
+    def update(self, todo, **fields):
+        new = dict(todo, **fields)
+        self.conn.execute("UPDATE todos SET task = ?, completed = ? WHERE id = ?",
+                          (new["task"], int(new["completed"]), todo["id"]))
+        if new["task"] != todo["task"]:
+            self.conn.execute("DELETE FROM todo_tokens WHERE todo_id = ?", (todo["id"],))
+            self._index(todo["id"], new["task"])
+        self.conn.commit()
+        if new["completed"] != todo["completed"]:
+            self._changed([(self._status(todo["completed"]), -1),
+                           (self._status(new["completed"]), 1)])
+        else:
+            self._changed()
+        return new
+
+    def delete(self, todo):
+        self.conn.execute("DELETE FROM todos WHERE id = ?", (todo["id"],))
+        self.conn.execute("DELETE FROM todo_tokens WHERE todo_id = ?", (todo["id"],))
+        self.conn.commit()
+        self._changed([(None, -1), (self._status(todo["completed"]), -1)])
+
+    def clear_completed(self):
+        self.conn.execute("DELETE FROM todo_tokens WHERE todo_id IN "
+                          "(SELECT id FROM todos WHERE completed = 1)")
+        cursor = self.conn.execute("DELETE FROM todos WHERE completed = 1")
+        self.conn.commit()
+        self._changed([(None, -cursor.rowcount), ("completed", -cursor.rowcount)])
+        return cursor.rowcount
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+class _QueryRows:
+    # Read-only sequence over a filtered SQLite view, paged on demand
+    def __init__(self, store, key):
+        self.store = store
+        self.key = key
+
+    def __len__(self):
+        return self.store.count(self.key)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            return [self[i] for i in range(start, stop, step)]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        size = self.store.PAGE_SIZE
+        return self.store.page(self.key, index // size)[index % size]
@@ -0,0 +1,122 @@
+class VirtualTreeView:
+    # Shows a window of a (possibly huge) sequence of rows in a ttk.Treeview.
+    # Only the rows that fit on screen are materialized as Treeview items,
+    # and render() diffs the wanted window against what is already shown,
+    # so a change costs a handful of Tk calls instead of a full rebuild.
+    #
+    # rows is any sequence supporting len() and slicing; key(row) gives the
+    # stable id used as the Treeview iid, and format_row(position, row)
+    # returns (values, tags). Serial numbers and other position-dependent
+    # values are therefore only computed for visible rows.
+    def __init__(self, tree, scrollbar, rows, key, format_row, row_height=45):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.rows = rows
+        self.key = key
+        self.format_row = format_row
+        self.row_height = row_height
+
+        self.offset = 0
+        self.page_size = 20
+        self.shown = []  # iids currently in the tree, in display order
+        self.rendered = {}  # iid -> (values, tags) last sent to Tk
+
+        self.scrollbar.configure(command=self.yview)
+        self.tree.bind("<Configure>", self.on_resize)
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", self.on_mousewheel)  # X11 wheel up
+        self.tree.bind("<Button-5>", self.on_mousewheel)
+        self.tree.bind("<Up>", lambda e: self.step_selection(-1))
+        self.tree.bind("<Down>", lambda e: self.step_selection(1))
+
+    def set_rows(self, rows):
+        self.rows = rows
+        self.render()
+
+    def render(self):
+        total = len(self.rows)
+        self.offset = max(0, min(self.offset, total - self.page_size))
+        window = self.rows[self.offset:self.offset + self.page_size]
+        wanted = [str(self.key(row)) for row in window]
+
+        # Drop rows that scrolled out or were deleted
+        keep = set(wanted)
+        stale = [iid for iid in self.shown if iid not in keep]
+        if stale:
+            self.tree.delete(*stale)
+            for iid in stale:
+                del self.rendered[iid]
+            self.shown = [iid for iid in self.shown if iid in keep]
+
+        for position, (iid, row) in enumerate(zip(wanted, window)):
+            values, tags = self.format_row(self.offset + position, row)
+            if iid not in self.rendered:
+                self.tree.insert("", position, iid=iid, values=values, tags=tags)
+                self.shown.insert(position, iid)
+            else:
+                if self.rendered[iid] != (values, tags):
+                    self.tree.item(iid, values=values, tags=tags)
+                if self.shown[position] != iid:
+                    self.tree.move(iid, "", position)
+                    self.shown.remove(iid)
+                    self.shown.insert(position, iid)
+            self.rendered[iid] = (values, tags)
+
+        if total:
+            self.scrollbar.set(self.offset / total, (self.offset + len(window)) / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def reveal(self, position):
+        # Scroll so the row at position is visible
+        if position < self.offset:
+            self.offset = position
+        elif position >= self.offset + self.page_size:
+            self.offset = position - self.page_size + 1
+        self.render()
+
+    def scroll(self, rows):
+        self.offset += rows
+        self.render()
+
+    def yview(self, *args):
+        # Scrollbar protocol: ("moveto", fraction) or ("scroll", n, units|pages)
+        if args[0] == "moveto":
+            self.offset = int(float(args[1]) * len(self.rows))
+            self.render()
+        elif args[0] == "scroll":
+            step = self.page_size if args[2] == "pages" else 1
+            self.scroll(int(args[1]) * step)
+
+    def on_mousewheel(self, event):
+        up = event.num == 4 if event.num in (4, 5) else event.delta > 0
+        self.scroll(-3 if up else 3)
+        # The Treeview's own wheel binding would scroll a second time
+        return "break"
+
+    def on_resize(self, event):
+        # Header height is the y of the first row, when there is one
+        header = 30
+        if self.shown:
+            bbox = self.tree.bbox(self.shown[0])
+            if bbox:
+                header = bbox[1]
+        page_size = max(1, (event.height - header) // self.row_height + 1)
+        if page_size != self.page_size:
+            self.page_size = page_size
+            self.render()
+
+    def step_selection(self, delta):
+        # Arrow keys at the edge of the window scroll instead of stopping
+        selection = self.tree.selection()
+        if not selection or selection[0] not in self.shown:
+            return None
+        position = self.shown.index(selection[0]) + delta
+        if 0 <= position < len(self.shown):
+            return None  # let the Treeview move within the window
+        self.scroll(delta)
+        if self.shown:
+            iid = self.shown[0 if delta < 0 else -1]
+            self.tree.selection_set(iid)
+            self.tree.focus(iid)
+        return "break"
@@ -1,21 +1,27 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
-import json
-import os
+import sys
+import time
+from todo_store import open_store
+from todo_view import VirtualTreeView
+from tk_shared import style
+import tk_instrument
 
 class UltimateTodoApp:
-    def __init__(self, root):
+    def __init__(self, root, data_file="todos.json"):
+        self.started = time.perf_counter()
         self.root = root
         self.root.title("✅ Ultimate To-Do List")
         self.root.geometry("650x750")
         self.root.configure(bg="#f8f9fa")
         
-        # Data file
-        self.data_file = "todos.json"
+        # Data file: a JSON snapshot plus an append-only journal of changes,
+        # or a SQLite database for .db files
+        self.data_file = data_file
+        self.store = open_store(self.data_file)
         self.todos = []
-        
-        # Load existing todos
-        self.load_todos()
+        self.loading = True
+        self.startup_metrics = {}
         
         # Custom fonts
         self.title_font = ("Segoe UI", 20, "bold")
@@ -24,6 +30,12 @@ class UltimateTodoApp:
         
         # Create UI
         self.setup_ui()
+        
+        # Pending writes are flushed before the window goes away
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
+        # Load existing todos once the window is up
+        self.load_todos()
     
     def setup_ui(self):
         # Header with gradient
@@ -47,21 +59,31 @@ class UltimateTodoApp:
                           relief="flat", padx=15)
         add_btn.pack(side="right")
         
+        # Filter: all, active or completed tasks
+        filter_frame = tk.Frame(self.root, bg="#f8f9fa")
+        filter_frame.pack(fill="x", padx=20)
+        self.filter_var = tk.StringVar(value="all")
+        for text, value in (("All", "all"), ("Active", "active"), ("Completed", "completed")):
+            tk.Radiobutton(filter_frame, text=text, value=value, variable=self.filter_var,
+                           command=self.refresh_list, bg="#f8f9fa",
+                           font=self.text_font).pack(side="left", padx=(0, 10))
+        
+        # Live search, served from the store's inverted word index
+        self.search_var = tk.StringVar()
+        search_entry = tk.Entry(filter_frame, textvariable=self.search_var, font=self.text_font,
+                                bg="white", relief="flat", highlightthickness=1,
+                                highlightbackground="#ddd", highlightcolor="#6a11cb")
+        search_entry.pack(side="right", ipady=4)
+        search_entry.bind("<KeyRelease>", self.search_tasks)
+        tk.Label(filter_frame, text="🔍", bg="#f8f9fa", font=self.text_font).pack(side="right")
+        
         # Task list with serial numbers
         self.list_frame = tk.Frame(self.root, bg="#f8f9fa")
         self.list_frame.pack(fill="both", expand=True, padx=20, pady=10)
         
-        # Create treeview with custom style
-        style = ttk.Style()
-        style.theme_use("clam")
-        style.configure("Ultimate.Treeview", font=self.text_font, rowheight=45, 
-                       background="#ffffff", fieldbackground="#ffffff")
-        style.configure("Ultimate.Treeview.Heading", font=("Segoe UI", 12, "bold"),
-                       background="#e9ecef", foreground="#495057")
-        style.map("Ultimate.Treeview", background=[("selected", "#e2e2e2")])
-        
+        # Create treeview with custom style (set up once per process)
         self.tree = ttk.Treeview(self.list_frame, columns=("serial", "status", "task"), 
-                               show="headings", style="Ultimate.Treeview")
+                               show="headings", style=style("Ultimate.Treeview", self.configure_style))
         
         # Configure columns
         self.tree.heading("serial", text="#")
@@ -72,12 +94,19 @@ class UltimateTodoApp:
         self.tree.column("status", width=50, anchor="center")
         self.tree.column("task", width=400, anchor="w")
         
-        # Add scrollbar
-        scrollbar = ttk.Scrollbar(self.list_frame, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
+        # Add scrollbar; the view drives it, since only visible rows exist
+        scrollbar = ttk.Scrollbar(self.list_frame, orient="vertical")
         scrollbar.pack(side="right", fill="y")
         self.tree.pack(fill="both", expand=True)
         
+        # Style completed tasks
+        self.tree.tag_configure("completed", foreground="#adb5bd")
+        
+        # Rows are keyed by task id and only the visible window is materialized
+        self.view = VirtualTreeView(self.tree, scrollbar, self.todos,
+                                    key=lambda todo: todo["id"],
+                                    format_row=self.format_row)
+        
         # Bind events
         self.tree.bind("<Double-1>", self.toggle_complete)
         self.task_entry.bind("<Return>", lambda e: self.add_task())
@@ -103,34 +132,43 @@ class UltimateTodoApp:
         tk.Button(action_frame, text="Delete Task", command=self.delete_task,
                 bg="#dc3545", fg="white", font=self.text_font).pack(side="left", padx=5)
         
-        # Load existing tasks
-        self.refresh_list()
+        # Status bar for loading progress and startup metrics
+        self.status_var = tk.StringVar(value="Loading tasks…")
+        tk.Label(self.root, textvariable=self.status_var, bg="#f8f9fa", fg="#6c757d",
+                font=("Segoe UI", 9), anchor="w").pack(fill="x", padx=20, pady=(0, 5))
     
     def add_task(self):
+        if self.loading:
+            return
         task = self.task_entry.get().strip()
         if task:
-            self.todos.append({"task": task, "completed": False})
+            self.store.add(task)
             self.task_entry.delete(0, tk.END)
-            self.save_todos()
             self.refresh_list()
+            self.view.reveal(len(self.view.rows) - 1)
     
-    def toggle_complete(self, event=None):
+    def selected_todo(self):
+        if self.loading:
+            messagebox.showinfo("Loading", "Please wait until all tasks are loaded.")
+            return None
         if not self.tree.selection():
             messagebox.showwarning("Warning", "Please select a task first!")
+            return None
+        # Treeview item ids are task ids
+        return self.store.get(int(self.tree.selection()[0]))
+    
+    def toggle_complete(self, event=None):
+        todo = self.selected_todo()
+        if todo is None:
             return
-        item = self.tree.selection()[0]
-        index = int(self.tree.item(item, "values")[0]) - 1
-        self.todos[index]["completed"] = not self.todos[index]["completed"]
-        self.save_todos()
+        self.store.update(todo, completed=not todo["completed"])
         self.refresh_list()
     
     def update_task_dialog(self):
-        if not self.tree.selection():
-            messagebox.showwarning("Warning", "Please select a task first!")
+        todo = self.selected_todo()
+        if todo is None:
             return
-        item = self.tree.selection()[0]
-        index = int(self.tree.item(item, "values")[0]) - 1
-        current_task = self.todos[index]["task"]
+        current_task = todo["task"]
         
         # Create update dialog
         new_task = simpledialog.askstring("Update Task", "Edit your task:", 
@@ -138,25 +176,22 @@ class UltimateTodoApp:
                                         parent=self.root)
         
         if new_task and new_task.strip():
-            self.todos[index]["task"] = new_task.strip()
-            self.save_todos()
+            self.store.update(todo, task=new_task.strip())
             self.refresh_list()
     
     def delete_task(self):
-        if not self.tree.selection():
-            messagebox.showwarning("Warning", "Please select a task first!")
+        todo = self.selected_todo()
+        if todo is None:
             return
         if messagebox.askyesno("Confirm", "Delete this task permanently?"):
-            item = self.tree.selection()[0]
-            index = int(self.tree.item(item, "values")[0]) - 1
-            del self.todos[index]
-            self.save_todos()
+            self.store.delete(todo)
             self.refresh_list()
     
     def clear_completed(self):
+        if self.loading:
+            return
         if messagebox.askyesno("Confirm", "Clear all completed tasks?"):
-            self.todos = [todo for todo in self.todos if not todo["completed"]]
-            self.save_todos()
+            self.store.clear_completed()
             self.refresh_list()
     
     def show_menu(self, event):
@@ -165,30 +200,78 @@ class UltimateTodoApp:
             self.tree.selection_set(item)
             self.menu.post(event.x_root, event.y_root)
     
+    def search_tasks(self, event=None):
+        # Start each new search from the top of the results
+        self.view.offset = 0
+        self.refresh_list()
+    
     def refresh_list(self):
-        self.tree.delete(*self.tree.get_children())
-        for i, todo in enumerate(self.todos, 1):
-            serial = str(i).zfill(2)  # 01, 02, etc.
-            status = "✓" if todo["completed"] else ""
-            tags = ("completed",) if todo["completed"] else ()
-            self.tree.insert("", "end", values=(serial, status, todo["task"]), tags=tags)
-        
-        # Style completed tasks
-        self.tree.tag_configure("completed", foreground="#adb5bd")
+        # Diffs the visible window against the tree; unchanged rows cost nothing
+        status = self.filter_var.get()
+        self.view.set_rows(self.store.view(None if status == "all" else status,
+                                           self.search_var.get()))
+    
+    def format_row(self, position, todo):
+        serial = str(position + 1).zfill(2)  # 01, 02, etc.
+        status = "✓" if todo["completed"] else ""
+        tags = ("completed",) if todo["completed"] else ()
+        return (serial, status, todo["task"]), tags
+    
+    def configure_style(self, style):
+        # The theme is shared by every window of the Tk interpreter, so it
+        # is only switched when this app owns the root (not in the launcher)
+        if isinstance(self.root, tk.Tk):
+            style.theme_use("clam")
+        style.configure("Ultimate.Treeview", font=self.text_font, rowheight=45, 
+                       background="#ffffff", fieldbackground="#ffffff")
+        style.configure("Ultimate.Treeview.Heading", font=("Segoe UI", 12, "bold"),
+                       background="#e9ecef", foreground="#495057")
+        style.map("Ultimate.Treeview", background=[("selected", "#e2e2e2")])
+    
+    def on_close(self):
+        self.store.close()
+        self.root.destroy()
     
     def load_todos(self):
-        if os.path.exists(self.data_file):
-            try:
-                with open(self.data_file, "r") as f:
-                    self.todos = json.load(f)
-            except:
-                self.todos = []
+        # Stream tasks in after the window has painted: each after() tick
+        # parses for up to load_budget seconds, then hands control back to Tk
+        self.load_budget = 0.02
+        self.loader = self.store.iter_load()
+        self.root.after(1, self.load_next_chunk)
     
-    def save_todos(self):
-        with open(self.data_file, "w") as f:
-            json.dump(self.todos, f)
+    def load_next_chunk(self):
+        if not self.root.winfo_exists():
+            return  # closed while loading: don't start the store's writer
+        deadline = time.perf_counter() + self.load_budget
+        done = False
+        try:
+            count = next(self.loader)
+            # The first tick stops after one chunk to get rows on screen fast
+            while self.startup_metrics and time.perf_counter() < deadline:
+                count = next(self.loader)
+        except StopIteration:
+            done = True
+        self.refresh_list()
+        
+        if not self.startup_metrics:
+            self.root.update_idletasks()
+            self.startup_metrics["first_paint_ms"] = (time.perf_counter() - self.started) * 1000
+        if not done:
+            self.status_var.set(f"Loading tasks… {count:,}")
+            self.root.after(1, self.load_next_chunk)
+            return
+        
+        self.loading = False
+        self.todos = self.store.view()
+        self.startup_metrics["load_ms"] = (time.perf_counter() - self.started) * 1000
+        self.startup_metrics["tasks"] = len(self.todos)
+        summary = ("{tasks:,} tasks · first paint {first_paint_ms:.0f} ms · "
+                   "loaded in {load_ms:.0f} ms".format(**self.startup_metrics))
+        self.status_var.set(summary)
+        print(f"startup: {summary}", file=sys.stderr)
 
 if __name__ == "__main__":
+    tk_instrument.install_from_env()  # opt-in, via TK_INSTRUMENT
     root = tk.Tk()
-    app = UltimateTodoApp(root)
+    app = UltimateTodoApp(root, *sys.argv[1:2])
     root.mainloop()
\ No newline at end of file